@@ -0,0 +1,83 @@
+"""Add movie catalog
+
+Revision ID: 3c9a1f0d2b7e
+Revises: 82f11e5847fb
+Create Date: 2026-10-18 14:12:31.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9a1f0d2b7e'
+down_revision: Union[str, Sequence[str], None] = '82f11e5847fb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('genres', 'directors', 'stars', 'certifications'):
+        op.create_table(table,
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+        op.create_index(op.f(f'ix_{table}_id'), table, ['id'], unique=False)
+
+    op.create_table('movies',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('uuid', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('time', sa.Integer(), nullable=False),
+    sa.Column('imdb', sa.Float(), nullable=False),
+    sa.Column('votes', sa.Integer(), nullable=False),
+    sa.Column('meta_score', sa.Float(), nullable=True),
+    sa.Column('gross', sa.Float(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('certification_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['certification_id'], ['certifications.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name', 'year', 'time', name='uq_movies_name_year_time'),
+    sa.UniqueConstraint('uuid')
+    )
+    op.create_index(op.f('ix_movies_id'), 'movies', ['id'], unique=False)
+    for column in ('year', 'imdb', 'votes', 'price', 'name'):
+        op.create_index(f'ix_movies_{column}_id', 'movies', [column, 'id'], unique=False)
+
+    for table, column, target in (
+        ('movie_genres', 'genre_id', 'genres'),
+        ('movie_directors', 'director_id', 'directors'),
+        ('movie_stars', 'star_id', 'stars'),
+    ):
+        op.create_table(table,
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column(column, sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint([column], [f'{target}.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('movie_id', column)
+        )
+        op.create_index(f'ix_{table}_{column}_movie_id', table, [column, 'movie_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    associations = (('movie_stars', 'star_id'), ('movie_directors', 'director_id'), ('movie_genres', 'genre_id'))
+    for table, column in associations:
+        op.drop_index(f'ix_{table}_{column}_movie_id', table_name=table)
+        op.drop_table(table)
+
+    for column in ('name', 'price', 'votes', 'imdb', 'year'):
+        op.drop_index(f'ix_movies_{column}_id', table_name='movies')
+    op.drop_index(op.f('ix_movies_id'), table_name='movies')
+    op.drop_table('movies')
+
+    for table in ('certifications', 'stars', 'directors', 'genres'):
+        op.drop_index(op.f(f'ix_{table}_id'), table_name=table)
+        op.drop_table(table)
@@ -0,0 +1,37 @@
+"""Add refresh token families
+
+Revision ID: 42906e31908b
+Revises: d15bd990ec0b
+Create Date: 2026-10-18 13:05:22.671093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '42906e31908b'
+down_revision: Union[str, Sequence[str], None] = 'd15bd990ec0b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('refresh_tokens', sa.Column('family_id', sa.String(), nullable=True))
+    op.add_column('refresh_tokens', sa.Column('rotated_at', sa.DateTime(), nullable=True))
+    # existing tokens each start their own family
+    op.execute("UPDATE refresh_tokens SET family_id = token")
+    with op.batch_alter_table('refresh_tokens') as batch_op:
+        batch_op.alter_column('family_id', existing_type=sa.String(), nullable=False)
+        batch_op.create_index(batch_op.f('ix_refresh_tokens_family_id'), ['family_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('refresh_tokens') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_refresh_tokens_family_id'))
+        batch_op.drop_column('rotated_at')
+        batch_op.drop_column('family_id')
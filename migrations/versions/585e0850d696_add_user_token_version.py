@@ -0,0 +1,29 @@
+"""Add user token version
+
+Revision ID: 585e0850d696
+Revises: b778fa72227e
+Create Date: 2026-10-18 09:12:41.302117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '585e0850d696'
+down_revision: Union[str, Sequence[str], None] = 'b778fa72227e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('token_version')
@@ -0,0 +1,63 @@
+"""Add video ingests and HLS renditions
+
+Revision ID: 5b2e9d7c3f18
+Revises: c41d8e6f0a27
+Create Date: 2026-10-18 20:14:09.512377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e9d7c3f18'
+down_revision: Union[str, Sequence[str], None] = 'c41d8e6f0a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('video_ingests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('source_path', sa.String(), nullable=False),
+    sa.Column('source_sha256', sa.String(), nullable=True),
+    sa.Column('duration', sa.Float(), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='ingeststatusenum'), nullable=False),
+    sa.Column('progress', sa.Float(), nullable=False),
+    sa.Column('master_manifest', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['movie_id'], ['movies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_video_ingests_id'), 'video_ingests', ['id'], unique=False)
+    op.create_index('ix_video_ingests_movie_id_status_id', 'video_ingests', ['movie_id', 'status', 'id'], unique=False)
+    op.create_table('video_renditions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ingest_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('width', sa.Integer(), nullable=False),
+    sa.Column('height', sa.Integer(), nullable=False),
+    sa.Column('bandwidth', sa.Integer(), nullable=False),
+    sa.Column('segment_count', sa.Integer(), nullable=False),
+    sa.Column('manifest', sa.Text(), nullable=False),
+    sa.ForeignKeyConstraint(['ingest_id'], ['video_ingests.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('ingest_id', 'name', name='uq_video_renditions_ingest_id_name')
+    )
+    op.create_index(op.f('ix_video_renditions_id'), 'video_renditions', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_video_renditions_id'), table_name='video_renditions')
+    op.drop_table('video_renditions')
+    op.drop_index('ix_video_ingests_movie_id_status_id', table_name='video_ingests')
+    op.drop_index(op.f('ix_video_ingests_id'), table_name='video_ingests')
+    op.drop_table('video_ingests')
@@ -0,0 +1,32 @@
+"""Add campaign leases
+
+Revision ID: 7a3f61c9e0b4
+Revises: 5b2e9d7c3f18
+Create Date: 2026-10-19 10:02:17.483920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3f61c9e0b4'
+down_revision: Union[str, Sequence[str], None] = '5b2e9d7c3f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('email_campaigns') as batch_op:
+        batch_op.add_column(sa.Column('lease_token', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('lease_expires_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('email_campaigns') as batch_op:
+        batch_op.drop_column('lease_expires_at')
+        batch_op.drop_column('lease_token')
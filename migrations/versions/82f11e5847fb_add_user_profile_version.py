@@ -0,0 +1,31 @@
+"""Add user profile version
+
+Revision ID: 82f11e5847fb
+Revises: 58f5b161ef84
+Create Date: 2026-10-18 03:57:39.626227
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '82f11e5847fb'
+down_revision: Union[str, Sequence[str], None] = '58f5b161ef84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('user_profiles', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('user_profiles', sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('user_profiles') as batch_op:
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('version')
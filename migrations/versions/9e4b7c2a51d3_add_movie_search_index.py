@@ -0,0 +1,104 @@
+"""Add movie full-text search index
+
+Revision ID: 9e4b7c2a51d3
+Revises: 3c9a1f0d2b7e
+Create Date: 2026-10-18 16:40:08.215377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4b7c2a51d3'
+down_revision: Union[str, Sequence[str], None] = '3c9a1f0d2b7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# FTS5 table and sync triggers, as defined in database/search.py at this revision
+DIRECTOR_NAMES = (
+    "(SELECT group_concat(directors.name, ' ') FROM movie_directors "
+    "JOIN directors ON directors.id = movie_directors.director_id WHERE movie_directors.movie_id = {movie_id})"
+)
+STAR_NAMES = (
+    "(SELECT group_concat(stars.name, ' ') FROM movie_stars "
+    "JOIN stars ON stars.id = movie_stars.star_id WHERE movie_stars.movie_id = {movie_id})"
+)
+
+SEARCH_DDL = [
+    # porter stems English words ("running" finds "run"); prefix='2 3' indexes short prefixes for typeahead
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS movie_search USING fts5(
+        name, description, directors, stars,
+        tokenize = 'porter unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_search_insert AFTER INSERT ON movies BEGIN
+        INSERT INTO movie_search (rowid, name, description, directors, stars)
+        VALUES (new.id, new.name, new.description,
+                {DIRECTOR_NAMES.format(movie_id="new.id")}, {STAR_NAMES.format(movie_id="new.id")});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_search_update AFTER UPDATE OF name, description ON movies BEGIN
+        UPDATE movie_search SET name = new.name, description = new.description WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_search_delete AFTER DELETE ON movies BEGIN
+        DELETE FROM movie_search WHERE rowid = old.id;
+    END
+    """,
+]
+for table, column, names in (
+        ("directors", "director_id", DIRECTOR_NAMES),
+        ("stars", "star_id", STAR_NAMES),
+):
+    SEARCH_DDL += [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS movie_{table}_search_insert AFTER INSERT ON movie_{table} BEGIN
+            UPDATE movie_search SET {table} = {names.format(movie_id="new.movie_id")} WHERE rowid = new.movie_id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS movie_{table}_search_delete AFTER DELETE ON movie_{table} BEGIN
+            UPDATE movie_search SET {table} = {names.format(movie_id="old.movie_id")} WHERE rowid = old.movie_id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF name ON {table} BEGIN
+            UPDATE movie_search SET {table} = {names.format(movie_id="movie_search.rowid")}
+            WHERE rowid IN (SELECT movie_id FROM movie_{table} WHERE {column} = new.id);
+        END
+        """,
+    ]
+
+TRIGGERS = [
+    'movies_search_insert', 'movies_search_update', 'movies_search_delete',
+    'movie_directors_search_insert', 'movie_directors_search_delete', 'directors_search_update',
+    'movie_stars_search_insert', 'movie_stars_search_delete', 'stars_search_update',
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in SEARCH_DDL:
+        op.execute(statement)
+    op.execute(
+        f"""
+        INSERT INTO movie_search (rowid, name, description, directors, stars)
+        SELECT id, name, description, {DIRECTOR_NAMES.format(movie_id="movies.id")},
+               {STAR_NAMES.format(movie_id="movies.id")}
+        FROM movies
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for trigger in TRIGGERS:
+        op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    op.execute('DROP TABLE IF EXISTS movie_search')
@@ -0,0 +1,29 @@
+"""Add movie video path
+
+Revision ID: c41d8e6f0a27
+Revises: 9e4b7c2a51d3
+Create Date: 2026-10-18 19:05:44.730161
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d8e6f0a27'
+down_revision: Union[str, Sequence[str], None] = '9e4b7c2a51d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('movies', sa.Column('video_path', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # not batch mode: recreating the table would drop the movie_search triggers defined on it
+    op.execute('ALTER TABLE movies DROP COLUMN video_path')
@@ -0,0 +1,278 @@
+"""Load test for the auth and profile endpoints.
+
+Seeds ``--users`` active accounts, then runs a mixed workload (login, refresh,
+profile read, profile update) from ``--concurrency`` clients and reports
+p50/p95/p99 latency and req/s per operation. By default the app is driven
+in-process through ``httpx.ASGITransport`` against a throwaway SQLite database;
+``--workers N`` starts a real ``uvicorn`` server with N worker processes instead,
+and ``--url`` targets a server that is already running (seeding then goes to
+``--database-url``, which must be the database that server uses). Run from the
+``src`` directory::
+
+    python -m benchmarks.api --users 200 --requests 5000 --concurrency 32
+    python -m benchmarks.api --workers 4 --save-baseline baseline.json
+    python -m benchmarks.api --workers 4 --baseline baseline.json --max-regression 20
+    python -m benchmarks.api --mix profile_read=1
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+PASSWORD = "StrongPass123!"
+OPERATIONS = {"login": 1, "refresh": 2, "profile_read": 6, "profile_update": 1}
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for item in value.split(","):
+        operation, _, weight = item.partition("=")
+        if operation not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {operation!r}, choose from {', '.join(OPERATIONS)}")
+        mix[operation] = int(weight or 1)
+    return mix
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=100, help="accounts to seed")
+    parser.add_argument("--requests", type=int, default=2000, help="total requests in the measured run")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--workers", type=int, default=0, help="uvicorn workers to start (0 = in-process)")
+    parser.add_argument("--url", help="benchmark a server that is already running")
+    parser.add_argument("--database-url", help="database to seed (defaults to a temporary SQLite file)")
+    parser.add_argument(
+        "--mix", type=parse_mix, default=OPERATIONS,
+        help="operation weights, e.g. profile_read=6,refresh=2 (default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save-baseline", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare the results with this JSON file")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="allowed p95 slowdown in percent")
+    args = parser.parse_args()
+    if args.users < args.concurrency:
+        parser.error("--users must be at least --concurrency, so that clients don't share accounts")
+    return args
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    if not args.database_url:
+        args.database_url = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='online_cinema_bench_')}/bench.db"
+    # settings are read on import, so this has to happen before any app module is loaded
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["LOGIN_RATE_LIMIT_PER_IP"] = os.environ["LOGIN_RATE_LIMIT_PER_EMAIL"] = str(10 ** 9)
+
+
+async def seed_users(count: int) -> list[str]:
+    from sqlalchemy import select
+
+    from database.db import Base, SessionLocal, engine
+    from database.enums import UserGroupEnum
+    from database.models import campaigns, movies, videos  # noqa: F401 -- the app queries their tables on startup
+    from database.models.accounts import User, UserGroup, UserProfile
+    from security.hashing import hash_password
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    emails = [f"bench-{index}@example.com" for index in range(count)]
+    async with SessionLocal() as db:
+        existing_groups = set((await db.execute(select(UserGroup.name))).scalars())
+        db.add_all(UserGroup(name=group) for group in UserGroupEnum if group not in existing_groups)
+        await db.flush()
+
+        group_id = (await db.execute(select(UserGroup.id).where(UserGroup.name == UserGroupEnum.USER))).scalar_one()
+        existing_users = set((await db.execute(select(User.email).where(User.email.in_(emails)))).scalars())
+        hashed_password = hash_password(PASSWORD)
+        db.add_all(
+            User(email=email, hashed_password=hashed_password, is_active=True, group_id=group_id,
+                 profile=UserProfile())
+            for email in emails if email not in existing_users
+        )
+        await db.commit()
+    await engine.dispose()
+    return emails
+
+
+class Client:
+    """One virtual user session; each client owns its accounts so refresh rotations never collide."""
+
+    def __init__(self, http: httpx.AsyncClient, emails: list[str], rng: random.Random) -> None:
+        self.http = http
+        self.emails = emails
+        self.rng = rng
+        self.tokens: dict[str, dict[str, str]] = {}
+
+    async def login(self, email: str) -> httpx.Response:
+        response = await self.http.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+        if response.status_code == 200:
+            self.tokens[email] = response.json()
+        return response
+
+    async def run(self, operation: str) -> httpx.Response:
+        email = self.rng.choice(self.emails)
+        if operation == "login" or email not in self.tokens:
+            return await self.login(email)
+
+        tokens = self.tokens[email]
+        if operation == "refresh":
+            response = await self.http.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+            if response.status_code == 200:
+                self.tokens[email] = response.json()
+            return response
+
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        if operation == "profile_read":
+            return await self.http.get("/api/v1/users/me", headers=headers)
+        return await self.http.put(
+            "/api/v1/users/me/update", json={"first_name": f"Bench{self.rng.randint(0, 999)}"}, headers=headers
+        )
+
+
+async def run_workload(
+        http: httpx.AsyncClient, emails: list[str], mix: dict[str, int], requests: int, concurrency: int, seed: int
+) -> tuple[dict[str, list[float]], dict[str, int], float]:
+    rng = random.Random(seed)
+    clients = [
+        Client(http, emails[index::concurrency], random.Random(seed + index)) for index in range(concurrency)
+    ]
+    # warm up: every client logs in once with each of its accounts before the measured run
+    for client in clients:
+        await asyncio.gather(*(client.login(email) for email in client.emails))
+
+    operations, weights = zip(*mix.items())
+    plan = rng.choices(operations, weights=weights, k=requests)
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+
+    async def worker(client: Client, index: int) -> None:
+        for operation in plan[index::concurrency]:
+            started = time.perf_counter()
+            response = await client.run(operation)
+            latencies[operation].append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors[operation] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(client, index) for index, client in enumerate(clients)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def summarize(latencies: dict[str, list[float]], errors: dict[str, int], elapsed: float) -> dict[str, dict[str, Any]]:
+    results = {}
+    for operation, samples in sorted(latencies.items()):
+        cuts = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+        results[operation] = {
+            "requests": len(samples),
+            "errors": errors[operation],
+            "rps": round(len(samples) / elapsed, 1),
+            "p50_ms": round(cuts[49] * 1000, 2),
+            "p95_ms": round(cuts[94] * 1000, 2),
+            "p99_ms": round(cuts[98] * 1000, 2),
+        }
+    total = sum(len(samples) for samples in latencies.values())
+    results["total"] = {"requests": total, "errors": sum(errors.values()), "rps": round(total / elapsed, 1)}
+    return results
+
+
+def report(results: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]], max_regression: float) -> bool:
+    print(f"{'operation':<16}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    regressed = False
+    for operation, row in results.items():
+        line = f"{operation:<16}{row['requests']:>10}{row['errors']:>8}{row['rps']:>10}"
+        if "p50_ms" in row:
+            line += f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}"
+
+        previous = baseline.get(operation, {})
+        if "p95_ms" in row and previous.get("p95_ms"):
+            change = (row["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+            line += f"   p95 {change:+.1f}% vs baseline"
+            if change > max_regression:
+                line += "  ❌"
+                regressed = True
+        print(line)
+    return not regressed
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as http:
+        while True:
+            try:
+                await http.get("/metrics")
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.2)
+
+
+async def main() -> int:
+    args = parse_args()
+    configure_environment(args)
+    emails = await seed_users(args.users)
+
+    server = None
+    hasher = None
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        if args.url:
+            http = httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60)
+        elif args.workers:
+            port = free_port()
+            server = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(args.workers),
+                 "--log-level", "warning"],
+                env=os.environ.copy(),
+            )
+            await wait_until_ready(f"http://127.0.0.1:{port}")
+            http = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60)
+        else:
+            from main import app
+            from security.hashing import password_hasher
+
+            hasher = password_hasher
+            hasher.start()
+            http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+        async with http:
+            latencies, errors, elapsed = await run_workload(
+                http, emails, args.mix, args.requests, args.concurrency, args.seed
+            )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        if hasher is not None:
+            hasher.shutdown()
+
+    results = summarize(latencies, errors, elapsed)
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else {}
+    passed = report(results, baseline, args.max_regression)
+
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2))
+        print(f"\n💾 Baseline saved to {args.save_baseline}")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,65 @@
+"""Login throughput benchmark for the password hashing pool.
+
+Runs a burst of concurrent bcrypt verifications (the CPU part of ``/auth/login``)
+first inline on the event loop, then through ``PasswordHasher`` with a growing
+number of worker processes. Run from the ``src`` directory::
+
+    python -m benchmarks.hashing --requests 64
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from security.hashing import PasswordHasher, hash_password, verify_password
+
+PASSWORD = "StrongPass123!"
+
+
+async def run_inline(hashed: str, requests: int) -> float:
+    async def login() -> bool:
+        return verify_password(PASSWORD, hashed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+async def run_pool(hashed: str, requests: int, workers: int) -> float:
+    hasher = PasswordHasher(max_workers=workers, max_queue_size=requests)
+    hasher.start()
+    try:
+        await hasher.verify(PASSWORD, hashed)  # warm up worker processes
+        started = time.perf_counter()
+        await asyncio.gather(*(hasher.verify(PASSWORD, hashed) for _ in range(requests)))
+        return requests / (time.perf_counter() - started)
+    finally:
+        hasher.shutdown()
+
+
+def worker_counts(max_workers: int) -> list[int]:
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=64, help="concurrent logins per run")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    hashed = hash_password(PASSWORD)
+
+    print(f"{'mode':<16}{'logins/sec':>12}")
+    print(f"{'inline':<16}{await run_inline(hashed, args.requests):>12.1f}")
+    for workers in worker_counts(args.max_workers):
+        rate = await run_pool(hashed, args.requests, workers)
+        print(f"{f'pool x{workers}':<16}{rate:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""Access token verification benchmark.
+
+Compares the old ``decode_token`` path (``jose.jwt.decode`` with the raw secret on
+every call) with pre-built key objects and with the decoded-token cache, for
+HS256 and for an ES256/RS256 key pair generated on the fly. Run from the ``src``
+directory::
+
+    python -m benchmarks.jwt --iterations 20000
+"""
+import argparse
+import time
+from typing import Any, Callable
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwt
+
+from core.cache import TTLCache
+from security.jwt_keys import JWTKeys, build_jwt_keys
+
+SECRET = "benchmark-secret"
+CLAIMS = {"sub": "42", "group": "user", "ver": 0, "exp": int(time.time()) + 3600}
+
+
+def generate_pems(algorithm: str) -> tuple[str, str]:
+    if algorithm.startswith("ES"):
+        key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+
+def measure(func: Callable[[], Any], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (time.perf_counter() - started)
+
+
+def run(algorithm: str, signing_pem: str, verifying_pem: str, keys: JWTKeys, iterations: int) -> None:
+    token = jwt.encode(CLAIMS, keys.signing_key, algorithm=algorithm)
+    cache = TTLCache(maxsize=1024, ttl=3600)
+
+    def cached() -> dict:
+        payload = cache.get(token)
+        if payload is None:
+            payload = jwt.decode(token, keys.verification_key, algorithms=[algorithm])
+            cache.set(token, payload)
+        return payload
+
+    rows = {
+        "sign (raw key)": lambda: jwt.encode(CLAIMS, signing_pem, algorithm=algorithm),
+        "sign (key object)": lambda: jwt.encode(CLAIMS, keys.signing_key, algorithm=algorithm),
+        "verify (raw key)": lambda: jwt.decode(token, verifying_pem, algorithms=[algorithm]),
+        "verify (key object)": lambda: jwt.decode(token, keys.verification_key, algorithms=[algorithm]),
+        "verify (cached)": cached,
+    }
+    for name, func in rows.items():
+        print(f"{algorithm:<8}{name:<22}{measure(func, iterations):>14.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'alg':<8}{'path':<22}{'ops/sec':>14}")
+    run("HS256", SECRET, SECRET, build_jwt_keys("HS256", SECRET), args.iterations)
+    for algorithm in ("ES256", "RS256"):
+        private_pem, public_pem = generate_pems(algorithm)
+        keys = build_jwt_keys(algorithm, SECRET, private_key_pem=private_pem)
+        run(algorithm, private_pem, public_pem, keys, args.iterations // 10)
+
+
+if __name__ == "__main__":
+    main()
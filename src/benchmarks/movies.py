@@ -0,0 +1,205 @@
+"""Movie catalog pagination benchmark.
+
+Seeds ``--movies`` titles (with genres, directors and stars) into a throwaway
+SQLite database or ``--database-url``, then times ``GET /api/v1/movies`` on page
+one and on a page ``--depth`` rows deep using the keyset cursor, next to the
+same query written with OFFSET. Keyset pages should cost the same at any depth;
+OFFSET pages grow with it. Run from the ``src`` directory::
+
+    python -m benchmarks.movies --movies 100000 --depth 90000
+    python -m benchmarks.movies --sort-by imdb --order asc --explain
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+GENRES = [
+    "Action", "Adventure", "Animation", "Biography", "Comedy", "Crime", "Documentary", "Drama", "Family", "Fantasy",
+    "History", "Horror", "Music", "Mystery", "Romance", "Sci-Fi", "Sport", "Thriller", "War", "Western",
+]
+CERTIFICATIONS = ["G", "PG", "PG-13", "R", "NC-17"]
+WORDS = [
+    "night", "city", "dark", "love", "last", "return", "star", "river", "king", "shadow", "road", "storm", "secret",
+    "winter", "blood", "dream", "ghost", "empire", "silent", "golden", "lost", "wild", "iron", "midnight", "ocean",
+]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=100_000, help="titles to seed")
+    parser.add_argument("--depth", type=int, default=90_000, help="row offset of the deep page")
+    parser.add_argument("--limit", type=int, default=20, help="page size")
+    parser.add_argument("--sort-by", default="year", choices=["year", "imdb", "votes", "price", "name"])
+    parser.add_argument("--order", default="desc", choices=["asc", "desc"])
+    parser.add_argument("--iterations", type=int, default=50, help="timed requests per case")
+    parser.add_argument("--database-url", help="database to seed (defaults to a temporary SQLite file)")
+    parser.add_argument("--explain", action="store_true", help="print the SQLite query plans")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if args.depth >= args.movies:
+        parser.error("--depth must be smaller than --movies")
+    return args
+
+
+def configure_environment(database_url: str | None) -> str:
+    if not database_url:
+        database_url = f"sqlite+aiosqlite:///{tempfile.mkdtemp(prefix='online_cinema_bench_')}/bench.db"
+    # settings are read on import, so this has to happen before any app module is loaded
+    os.environ["DATABASE_URL"] = database_url
+    # seeding runs multi-second bulk inserts, which would otherwise all be logged as slow queries
+    os.environ["DB_SLOW_QUERY_MS"] = str(10 ** 6)
+    return database_url
+
+
+def movie_title(rng: random.Random, index: int) -> str:
+    return f"{' '.join(rng.choices(WORDS, k=rng.randint(1, 3))).title()} {index}"
+
+
+async def seed_movies(count: int, seed: int = 42, batch_size: int = 5000) -> None:
+    """Fills an empty catalog with ``count`` synthetic titles; reused by the other catalog benchmarks."""
+    from sqlalchemy import func, insert, select
+
+    from database.db import Base, SessionLocal, engine
+    from database.models.movies import (
+        Certification, Director, Genre, Movie, Star, movie_directors, movie_genres, movie_stars
+    )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(seed)
+    directors = max(count // 20, 1)
+    stars = max(count // 5, 1)
+    async with SessionLocal() as db:
+        if (await db.execute(select(func.count(Movie.id)))).scalar_one():
+            print("🎬 Catalog already seeded, skipping")
+            return
+
+        await db.execute(insert(Genre), [{"id": i + 1, "name": name} for i, name in enumerate(GENRES)])
+        await db.execute(insert(Certification), [{"id": i + 1, "name": name} for i, name in enumerate(CERTIFICATIONS)])
+        await db.execute(insert(Director), [{"id": i, "name": f"Director {i}"} for i in range(1, directors + 1)])
+        await db.execute(insert(Star), [{"id": i, "name": f"Star {i}"} for i in range(1, stars + 1)])
+
+        for start in range(1, count + 1, batch_size):
+            ids = range(start, min(start + batch_size, count + 1))
+            await db.execute(insert(Movie), [
+                {
+                    "id": movie_id,
+                    "name": movie_title(rng, movie_id),
+                    "year": rng.randint(1950, 2025),
+                    "time": rng.randint(70, 200),
+                    "imdb": round(rng.uniform(1, 10), 1),
+                    "votes": rng.randint(10, 2_000_000),
+                    "meta_score": rng.randint(10, 100),
+                    "gross": round(rng.uniform(0, 500), 2),
+                    "description": "A synthetic title for benchmarking.",
+                    "price": Decimal(rng.randint(199, 1999)) / 100,
+                    "certification_id": rng.randint(1, len(CERTIFICATIONS)),
+                }
+                for movie_id in ids
+            ])
+            await db.execute(insert(movie_genres), [
+                {"movie_id": movie_id, "genre_id": genre_id}
+                for movie_id in ids for genre_id in rng.sample(range(1, len(GENRES) + 1), rng.randint(1, 3))
+            ])
+            await db.execute(insert(movie_directors), [
+                {"movie_id": movie_id, "director_id": rng.randint(1, directors)} for movie_id in ids
+            ])
+            await db.execute(insert(movie_stars), [
+                {"movie_id": movie_id, "star_id": star_id}
+                for movie_id in ids for star_id in rng.sample(range(1, stars + 1), min(3, stars))
+            ])
+        await db.commit()
+    await engine.dispose()
+
+
+async def measure(call: Callable[[], Awaitable[Any]], iterations: int) -> dict[str, float]:
+    await call()
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - started) * 1000)
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94]}
+
+
+async def main() -> int:
+    args = parse_args()
+    configure_environment(args.database_url)
+
+    started = time.perf_counter()
+    await seed_movies(args.movies, args.seed)
+    print(f"🌱 Seeded {args.movies} movies in {time.perf_counter() - started:.1f} s")
+
+    from sqlalchemy import select, text, tuple_
+
+    from database.db import SessionLocal, engine
+    from database.models.movies import Movie
+    from main import app
+    from routes.movies import SORT_COLUMNS, encode_cursor
+    from schemas.movies import MovieSortField
+
+    sort_by = MovieSortField(args.sort_by)
+    column = SORT_COLUMNS[sort_by]
+    ordering = (column.desc(), Movie.id.desc()) if args.order == "desc" else (column.asc(), Movie.id.asc())
+    offset_query = select(Movie).order_by(*ordering).limit(args.limit + 1)
+
+    async with SessionLocal() as db:
+        # cursor of the row just before the deep page, as a client walking the pages would hold it
+        boundary = (await db.execute(offset_query.offset(args.depth - 1).limit(1))).scalar_one()
+        deep_cursor = encode_cursor(getattr(boundary, sort_by.value), boundary.id)
+
+    key, value = tuple_(column, Movie.id), tuple_(getattr(boundary, sort_by.value), boundary.id)
+    keyset_query = offset_query.where(key < value if args.order == "desc" else key > value)
+
+    if args.explain:
+        async with SessionLocal() as db:
+            params = f"sort_by={args.sort_by}&order={args.order}&limit={args.limit}"
+            for label, query in (
+                ("keyset", keyset_query),
+                ("offset", offset_query.offset(args.depth)),
+            ):
+                compiled = query.compile(engine.sync_engine, compile_kwargs={"literal_binds": True})
+                plan = (await db.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))).all()
+                print(f"\n🔎 {label} ({params}):")
+                for row in plan:
+                    print(f"   {row[-1]}")
+
+    params = {"sort_by": args.sort_by, "order": args.order, "limit": args.limit}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as http:
+        async def keyset_page(cursor: str | None) -> None:
+            response = await http.get("/api/v1/movies", params={**params, **({"cursor": cursor} if cursor else {})})
+            response.raise_for_status()
+
+        async def fetch(query: Any) -> None:
+            async with SessionLocal() as db:
+                (await db.execute(query)).scalars().all()
+
+        cases = {
+            "GET keyset page 1": lambda: keyset_page(None),
+            f"GET keyset row {args.depth}": lambda: keyset_page(deep_cursor),
+            "SQL page 1": lambda: fetch(offset_query),
+            f"SQL keyset row {args.depth}": lambda: fetch(keyset_query),
+            f"SQL offset row {args.depth}": lambda: fetch(offset_query.offset(args.depth)),
+        }
+        print(f"\n{'case':<24}{'p50 ms':>10}{'p95 ms':>10}")
+        for label, call in cases.items():
+            timings = await measure(call, args.iterations)
+            print(f"{label:<24}{timings['p50']:>10.2f}{timings['p95']:>10.2f}")
+
+    await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
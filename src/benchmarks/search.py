@@ -0,0 +1,87 @@
+"""Movie search benchmark.
+
+Seeds ``--movies`` titles with ``benchmarks.movies.seed_movies`` (the FTS5 index is
+filled by its triggers as rows go in), then times ``GET /api/v1/movies/search``
+for a set of queries next to the ``LIKE '%q%'`` scan it replaces. Run from the
+``src`` directory::
+
+    python -m benchmarks.search --movies 100000
+    python -m benchmarks.search --query "midnight ocean" --query "director 12"
+"""
+import argparse
+import asyncio
+import sys
+import time
+
+import httpx
+
+from benchmarks.movies import configure_environment, measure, seed_movies
+
+QUERIES = ["storm", "midnight ocean", "gho", "golden king 4", "star 123", "director 42", "benchmarking"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=100_000, help="titles to seed")
+    parser.add_argument("--query", action="append", help="search query to time (repeatable)")
+    parser.add_argument("--limit", type=int, default=20, help="results per query")
+    parser.add_argument("--iterations", type=int, default=50, help="timed requests per query")
+    parser.add_argument("--database-url", help="database to seed (defaults to a temporary SQLite file)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = parse_args()
+    configure_environment(args.database_url)
+
+    started = time.perf_counter()
+    await seed_movies(args.movies, args.seed)
+    print(f"🌱 Seeded {args.movies} movies (and their search index) in {time.perf_counter() - started:.1f} s")
+
+    from sqlalchemy import or_, select
+
+    from database.db import SessionLocal, engine
+    from database.models.movies import Director, Movie, Star, movie_directors, movie_stars
+    from main import app
+
+    def like_query(query: str) -> select:
+        pattern = f"%{query}%"
+        return (
+            select(Movie.id)
+            .where(or_(
+                Movie.name.ilike(pattern),
+                Movie.description.ilike(pattern),
+                Movie.id.in_(select(movie_directors.c.movie_id).join(Director).where(Director.name.ilike(pattern))),
+                Movie.id.in_(select(movie_stars.c.movie_id).join(Star).where(Star.name.ilike(pattern))),
+            ))
+            .order_by(Movie.votes.desc())
+            .limit(args.limit)
+        )
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as http:
+        async def fts(query: str) -> int:
+            response = await http.get("/api/v1/movies/search", params={"q": query, "limit": args.limit})
+            response.raise_for_status()
+            return len(response.json())
+
+        async def like(query: str) -> int:
+            async with SessionLocal() as db:
+                return len((await db.execute(like_query(query))).all())
+
+        print(f"\n{'query':<18}{'hits':>6}{'FTS p50':>10}{'FTS p95':>10}{'LIKE p50':>10}{'LIKE p95':>10}")
+        for query in args.query or QUERIES:
+            hits = await fts(query)
+            fts_timings = await measure(lambda: fts(query), args.iterations)
+            like_timings = await measure(lambda: like(query), max(args.iterations // 10, 2))
+            print(
+                f"{query:<18}{hits:>6}{fts_timings['p50']:>10.2f}{fts_timings['p95']:>10.2f}"
+                f"{like_timings['p50']:>10.2f}{like_timings['p95']:>10.2f}"
+            )
+
+    await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,71 @@
+"""SMTP delivery benchmark: one connection per message vs ``SMTPConnectionPool``.
+
+Starts a local ``aiosmtpd`` server that accepts and discards every message, so the
+numbers show handshake overhead rather than a real provider's latency. Run from the
+``src`` directory::
+
+    python -m benchmarks.smtp --messages 500 --connections 5
+"""
+import argparse
+import asyncio
+import time
+
+import aiosmtplib
+from aiosmtpd.controller import Controller
+
+from services.email import SMTPConnectionPool, build_message
+
+HOST = "127.0.0.1"
+
+
+class DiscardHandler:
+    async def handle_DATA(self, server: object, session: object, envelope: object) -> str:  # noqa: N802
+        return "250 Message accepted for delivery"
+
+
+async def run_unpooled(port: int, messages: int, connections: int) -> float:
+    slots = asyncio.Semaphore(connections)
+
+    async def send(index: int) -> None:
+        async with slots:
+            msg = build_message(f"user{index}@example.com", "Benchmark", "Hello!")
+            await aiosmtplib.send(msg, hostname=HOST, port=port, start_tls=False)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(send(i) for i in range(messages)))
+    return messages / (time.perf_counter() - started)
+
+
+async def run_pooled(port: int, messages: int, connections: int) -> SMTPConnectionPool:
+    pool = SMTPConnectionPool(hostname=HOST, port=port, start_tls=False, max_connections=connections)
+    try:
+        await pool.send_many(
+            [build_message(f"user{i}@example.com", "Benchmark", "Hello!") for i in range(messages)]
+        )
+    finally:
+        await pool.close()
+    return pool
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--connections", type=int, default=5, help="concurrency cap for both modes")
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+
+    controller = Controller(DiscardHandler(), hostname=HOST, port=args.port)
+    controller.start()
+    try:
+        unpooled = await run_unpooled(args.port, args.messages, args.connections)
+        pool = await run_pooled(args.port, args.messages, args.connections)
+    finally:
+        controller.stop()
+
+    print(f"{'mode':<12}{'msg/sec':>10}{'connections':>14}")
+    print(f"{'unpooled':<12}{unpooled:>10.1f}{args.messages:>14}")
+    print(f"{'pooled':<12}{pool.messages_per_second:>10.1f}{pool.connections_opened:>14}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+"""Title autocomplete benchmark.
+
+Seeds ``--movies`` titles with ``benchmarks.movies.seed_movies``, builds the
+in-memory suggestion index and reports its build time and memory footprint,
+then replays keystrokes (every prefix of random titles) and reports p50/p99
+lookup latency by prefix length, both for the bare index and through
+``GET /api/v1/movies/suggest``, plus the cost of an incremental update. Run
+from the ``src`` directory::
+
+    python -m benchmarks.suggest --movies 100000 --titles 500
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+import httpx
+
+from benchmarks.movies import configure_environment, seed_movies
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movies", type=int, default=100_000, help="titles to seed")
+    parser.add_argument("--titles", type=int, default=500, help="random titles whose prefixes are typed")
+    parser.add_argument("--database-url", help="database to seed (defaults to a temporary SQLite file)")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def percentiles(samples: list[float]) -> tuple[float, float]:
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[98] * 1000
+
+
+async def main() -> int:
+    args = parse_args()
+    configure_environment(args.database_url)
+    await seed_movies(args.movies, args.seed)
+
+    from sqlalchemy import select
+
+    from database.db import SessionLocal, engine
+    from database.models.movies import Movie
+    from main import app
+    from services.suggestions import SuggestionIndex, suggestion_index
+
+    async with SessionLocal() as db:
+        rows = (await db.execute(select(Movie.id, Movie.name, Movie.year, Movie.votes))).tuples().all()
+
+    started = time.perf_counter()
+    SuggestionIndex.build(rows, suggestion_index.top_k)
+    elapsed = time.perf_counter() - started
+    # built a second time for the memory figure, as tracing slows allocations down several times
+    tracemalloc.start()
+    index = SuggestionIndex.build(rows, suggestion_index.top_k)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    suggestion_index.replace(index)
+    print(
+        f"🔤 Built index over {len(rows)} movies ({len(index)} keys, {len(index.top)} cached prefixes) "
+        f"in {elapsed:.2f} s\n"
+        f"   memory: {traced / 2 ** 20:.1f} MiB traced, {index.size_bytes / 2 ** 20:.1f} MiB by getsizeof"
+    )
+
+    rng = random.Random(args.seed)
+    keystrokes = [
+        name[:length] for _, name, _, _ in rng.sample(rows, args.titles) for length in range(1, len(name) + 1)
+    ]
+
+    direct: dict[int, list[float]] = defaultdict(list)
+    for prefix in keystrokes:
+        started = time.perf_counter()
+        index.lookup(prefix, 10)
+        direct[min(len(prefix), 6)].append(time.perf_counter() - started)
+
+    http_samples = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as http:
+        for prefix in keystrokes[:2000]:
+            started = time.perf_counter()
+            response = await http.get("/api/v1/movies/suggest", params={"q": prefix})
+            http_samples.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    print(f"\n{'prefix length':<16}{'lookups':>9}{'p50 µs':>10}{'p99 µs':>10}")
+    for length, samples in sorted(direct.items()):
+        p50, p99 = percentiles(samples)
+        label = f"{length}+" if length == 6 else str(length)
+        print(f"{label:<16}{len(samples):>9}{p50 * 1000:>10.1f}{p99 * 1000:>10.1f}")
+    p50, p99 = percentiles(http_samples)
+    print(f"\nGET /movies/suggest: p50 {p50:.2f} ms, p99 {p99:.2f} ms over {len(http_samples)} requests")
+
+    updates = []
+    for movie_id, name, year, votes in rng.sample(rows, 200):
+        started = time.perf_counter()
+        index.upsert(movie_id, f"{name} Redux", year, votes + 1)
+        updates.append(time.perf_counter() - started)
+    p50, p99 = percentiles(updates)
+    print(f"Incremental update: p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+
+    await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -15,7 +15,14 @@ celery_app = Celery(
     backend=settings.REDIS_URL,
 )
 
-celery_app.conf.imports = ("tasks.auth",)
+# campaigns and encodes are acks_late and can run for hours: Redis must not hand them to another
+# worker while they are still running (the default visibility timeout is one hour)
+celery_app.conf.broker_transport_options = {"visibility_timeout": settings.CELERY_VISIBILITY_TIMEOUT}
+
+celery_app.conf.imports = ("tasks.auth", "tasks.email", "tasks.campaigns", "tasks.videos")
+
+# packaging is CPU-bound and long: it gets its own queue, consumed by dedicated workers
+celery_app.conf.task_routes = {"tasks.videos.package_hls": {"queue": "video"}}
 
 celery_app.conf.beat_schedule = {
     "cleanup-expired-tokens": {
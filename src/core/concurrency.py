@@ -0,0 +1,90 @@
+import asyncio
+from typing import Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class ConcurrencyLimitExceeded(Exception):
+    pass
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight requests of one route, with a short bounded wait queue in front."""
+
+    def __init__(self, limit: int, max_waiting: int, wait_timeout: float) -> None:
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self.in_flight = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def acquire(self) -> None:
+        if self._semaphore.locked() and self.waiting >= self.max_waiting:
+            self.rejected += 1
+            raise ConcurrencyLimitExceeded
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.wait_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ConcurrencyLimitExceeded
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        self.admitted += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class ConcurrencyLimitMiddleware:
+    """Sheds load on expensive routes with 503 + Retry-After, leaving every other route untouched."""
+
+    def __init__(self, app: ASGIApp, limiters: dict[str, ConcurrencyLimiter], retry_after: int = 1) -> None:
+        self.app = app
+        self.limiters = limiters
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limiter: Optional[ConcurrencyLimiter] = None
+        if scope["type"] == "http":
+            limiter = self.limiters.get(scope["path"])
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except ConcurrencyLimitExceeded:
+            response = JSONResponse(
+                {"detail": "Server is busy, please try again later."},
+                status_code=503,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+
+def build_limiters(limits: dict[str, int], max_waiting: int, wait_timeout: float) -> dict[str, ConcurrencyLimiter]:
+    return {path: ConcurrencyLimiter(limit, max_waiting, wait_timeout) for path, limit in limits.items()}
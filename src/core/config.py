@@ -1,31 +1,117 @@
+import os
 from pathlib import Path
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings
-from pydantic import ConfigDict
+from pydantic import BaseModel, ConfigDict
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 ENV_PATH = BASE_DIR.parent / ".env"
 
 
+class HLSRendition(BaseModel):
+    name: str
+    height: int
+    video_bitrate: int  # kbit/s
+    audio_bitrate: int = 128  # kbit/s
+
+
 class Settings(BaseSettings):
     SECRET_KEY: str
     ALGORITHM: str
+    JWT_PRIVATE_KEY_FILE: Optional[str] = None
+    JWT_PUBLIC_KEY_FILE: Optional[str] = None
+    JWT_CACHE_SIZE: int = 10_000
 
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     VERIFY_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_HOURS: int
     PASSWORD_RESET_TOKEN_EXPIRE_HOURS: int
     TOKEN_CLEANUP_INTERVAL: int
+    TOKEN_CLEANUP_BATCH_SIZE: int = 1000
+    TOKEN_CLEANUP_BATCH_PAUSE: float = 0.05
+    TOKEN_STORE_BACKEND: Literal["sql", "redis", "memory"] = "sql"
+
+    DATABASE_URL: str = "sqlite+aiosqlite:///./online_cinema.db"
+    DB_ECHO: bool = False
+    DB_SLOW_QUERY_MS: int = 200
+    DB_N_PLUS_ONE_THRESHOLD: int = 10
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    SQLITE_BUSY_TIMEOUT: int = 5000
+    SQLITE_MMAP_SIZE: int = 268_435_456
+
+    PASSWORD_HASH_WORKERS: int = os.cpu_count() or 1
+    PASSWORD_HASH_QUEUE_SIZE: int = 64
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_TARGET_MS: int = 250
+
+    CONCURRENCY_LIMITS: dict[str, int] = {
+        "/api/v1/auth/login": 16,
+        "/api/v1/auth/register": 8,
+        "/api/v1/auth/change-password": 4,
+        "/api/v1/auth/reset-password": 4,
+    }
+    CONCURRENCY_QUEUE_SIZE: int = 32
+    CONCURRENCY_QUEUE_TIMEOUT: float = 2.0
+    CONCURRENCY_RETRY_AFTER: int = 1
+
+    LOGIN_THROTTLE_BACKEND: Literal["memory", "redis"] = "memory"
+    LOGIN_RATE_LIMIT_PER_IP: int = 20
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = 5
+    LOGIN_RATE_LIMIT_WINDOW: int = 60
+
+    CACHE_INVALIDATION_BACKEND: Literal["memory", "redis"] = "memory"
+    TOKEN_VERSION_CACHE_SIZE: int = 100_000
+    TOKEN_VERSION_CACHE_TTL: int = 5
+    PROFILE_VERSION_CACHE_SIZE: int = 100_000
+    PROFILE_VERSION_CACHE_TTL: int = 30
+    SUGGEST_TOP_K: int = 10
+    VIDEO_PATH_CACHE_SIZE: int = 10_000
+    VIDEO_PATH_CACHE_TTL: int = 60
+    SUGGEST_REFRESH_INTERVAL: int = 300
 
     EMAIL_HOST: str
     EMAIL_PORT: int
     EMAIL_HOST_USER: str
     EMAIL_HOST_PASSWORD: str
     EMAIL_USE_TLS: bool
+    EMAIL_TIMEOUT: int = 10
+    EMAIL_POOL_SIZE: int = 5
+    EMAIL_POOL_IDLE_TIMEOUT: int = 60
+    EMAIL_MAX_RETRIES: int = 5
+    EMAIL_RETRY_BACKOFF: int = 10
+    EMAIL_RETRY_BACKOFF_MAX: int = 600
+    EMAIL_DEAD_LETTER_QUEUE: str = "email_dead_letter"
+    CAMPAIGN_BATCH_SIZE: int = 500
+    CAMPAIGN_SEND_RETRIES: int = 3
+    CAMPAIGN_RETRY_BACKOFF: float = 2.0
+
+    MEDIA_ROOT: str = "media"
+    STREAM_CHUNK_SIZE: int = 262_144
+    MEDIA_ACCEL_REDIRECT_PREFIX: str = ""
+    FFMPEG_BINARY: str = "ffmpeg"
+    FFPROBE_BINARY: str = "ffprobe"
+    HLS_RENDITIONS: list[HLSRendition] = [
+        HLSRendition(name="1080p", height=1080, video_bitrate=5000, audio_bitrate=192),
+        HLSRendition(name="720p", height=720, video_bitrate=2800),
+        HLSRendition(name="480p", height=480, video_bitrate=1400),
+        HLSRendition(name="360p", height=360, video_bitrate=800, audio_bitrate=96),
+    ]
+    HLS_SEGMENT_SECONDS: int = 6
+    HLS_PARALLELISM_PER_TASK: int = 2
+    HLS_FFMPEG_THREADS: int = 0
+    HLS_SEGMENT_URL: str = "/media/hls"
 
     REDIS_URL: str
+    CELERY_VISIBILITY_TIMEOUT: int = 43_200
+    TASK_LEASE_SECONDS: int = 600
 
     FRONTEND_URL: str
 
+    DEBUG: bool = False
+
     model_config = ConfigDict(env_file=ENV_PATH)
 
 
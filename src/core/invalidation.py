@@ -0,0 +1,86 @@
+import json
+import asyncio
+from collections.abc import Hashable
+
+from core.cache import TTLCache
+from core.config import settings
+
+CHANNEL = "cache-invalidation"
+
+
+class CacheInvalidationBus:
+    """Evicts keys from named in-process caches. This base class only reaches the current process."""
+
+    shared = False
+
+    def __init__(self) -> None:
+        self.caches: dict[str, TTLCache] = {}
+
+    def register(self, name: str, cache: TTLCache) -> TTLCache:
+        self.caches[name] = cache
+        return cache
+
+    def evict(self, name: str, key: Hashable) -> None:
+        cache = self.caches.get(name)
+        if cache is not None:
+            cache.invalidate(key)
+
+    def clear(self) -> None:
+        for cache in self.caches.values():
+            cache.clear()
+
+    async def invalidate(self, name: str, key: Hashable) -> None:
+        self.evict(name, key)
+
+    async def listen(self) -> None:
+        return None
+
+
+class RedisCacheInvalidationBus(CacheInvalidationBus):
+    """Broadcasts evictions over Redis pub/sub, so a change made through one worker reaches all of them."""
+
+    shared = True
+
+    def __init__(self, url: str) -> None:
+        super().__init__()
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(url, decode_responses=True)
+
+    async def invalidate(self, name: str, key: Hashable) -> None:
+        self.evict(name, key)
+        try:
+            await self._redis.publish(CHANNEL, json.dumps([name, key]))
+        except Exception as exc:
+            # other workers then catch up when the entry expires, after at most the cache TTL
+            print(f"❌ Could not broadcast {name} eviction for {key!r}: {exc!r}")
+
+    async def listen(self) -> None:
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    # evictions published while unsubscribed are lost, so start over from empty caches
+                    self.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            name, key = json.loads(message["data"])
+                            self.evict(name, key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                print(f"❌ Cache invalidation listener disconnected: {exc!r}")
+            # nothing is trusted for longer than this while the listener is down
+            self.clear()
+            await asyncio.sleep(1)
+
+
+def build_cache_invalidation(backend: str) -> CacheInvalidationBus:
+    if backend == "memory":
+        return CacheInvalidationBus()
+    if backend == "redis":
+        return RedisCacheInvalidationBus(settings.REDIS_URL)
+    raise ValueError(f"Unknown CACHE_INVALIDATION_BACKEND: {backend!r}")
+
+
+cache_invalidation = build_cache_invalidation(settings.CACHE_INVALIDATION_BACKEND)
@@ -0,0 +1,82 @@
+import os
+import anyio
+from pathlib import Path
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.types import Receive, Scope, Send
+
+from core.config import settings
+
+ZERO_COPY_SEND = "http.response.zerocopysend"
+
+
+def resolve_media_path(relative_path: str) -> Optional[Path]:
+    """Returns the file under MEDIA_ROOT, or None if it is missing or the path escapes the root."""
+    root = Path(settings.MEDIA_ROOT).resolve()
+    path = (root / relative_path).resolve()
+    if not path.is_relative_to(root) or not path.is_file():
+        return None
+    return path
+
+
+def single_range(http_range: str, size: int) -> Optional[tuple[int, int]]:
+    """Parses ``bytes=a-b``, ``bytes=a-`` or ``bytes=-n`` into (start, end) with ``end`` exclusive.
+
+    Returns None for anything else: several ranges, bad syntax or a range past the end of the file.
+    """
+    unit, _, spec = http_range.partition("=")
+    first, dash, last = spec.strip().partition("-")
+    if unit.strip().lower() != "bytes" or not dash or not all(part.isdigit() for part in (first, last) if part):
+        return None
+    if not first:
+        suffix = int(last or 0)
+        return (max(size - suffix, 0), size) if suffix else None
+    start, end = int(first), min(int(last) + 1, size) if last else size
+    return (start, end) if start < end else None
+
+
+class MediaFileResponse(FileResponse):
+    """FileResponse that hands whole files and single ranges to the server's sendfile when it can.
+
+    Starlette already answers Range / If-Range with 206, 416 and multipart ranges, and uses
+    ``http.response.pathsend`` for whole files. On servers offering the ASGI zero-copy send
+    extension, whole files and single ranges are passed as (fd, offset, count) instead, so the
+    bytes never enter Python; every other request is left to FileResponse. Elsewhere the file is
+    read in ``STREAM_CHUNK_SIZE`` chunks after seeking to the range start, so a seek near the end
+    of a large file reads only what is sent.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.chunk_size = settings.STREAM_CHUNK_SIZE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if ZERO_COPY_SEND not in scope.get("extensions", {}) or scope["method"].upper() == "HEAD":
+            return await super().__call__(scope, receive, send)
+
+        if self.stat_result is None:
+            self.stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            self.set_stat_headers(self.stat_result)
+        size = self.stat_result.st_size
+        headers = Headers(scope=scope)
+        http_range, http_if_range = headers.get("range"), headers.get("if-range")
+
+        if http_range is None or http_if_range not in (None, self.headers["etag"], self.headers["last-modified"]):
+            status_code, (start, end) = self.status_code, (0, size)
+        else:
+            span = single_range(http_range, size)
+            if span is None:
+                return await super().__call__(scope, receive, send)
+            status_code, (start, end) = 206, span
+            self.headers["content-range"] = f"bytes {start}-{end - 1}/{size}"
+            self.headers["content-length"] = str(end - start)
+
+        await send({"type": "http.response.start", "status": status_code, "headers": self.raw_headers})
+        with open(self.path, "rb") as file:
+            await send(
+                {"type": ZERO_COPY_SEND, "file": file, "offset": start, "count": end - start, "more_body": False}
+            )
+        if self.background is not None:
+            await self.background()
@@ -1,12 +1,48 @@
 from collections.abc import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from typing import Any
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
 from sqlalchemy.orm import DeclarativeBase
 
-SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./online_cinema.db"
+from core.config import settings
+from database.instrumentation import instrument_engine
 
-engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL, echo=True, future=True, connect_args={"check_same_thread": False}
-)
+
+def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers proceed while a writer holds the lock
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.close()
+
+
+def build_engine(database_url: str) -> AsyncEngine:
+    url = make_url(database_url)
+    options: dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+    is_sqlite = url.get_backend_name() == "sqlite"
+    if is_sqlite:
+        options["connect_args"] = {"check_same_thread": False}
+    if not is_sqlite or url.database not in (None, "", ":memory:"):
+        # in-memory SQLite uses a single static connection, so there is no pool to size
+        options["pool_size"] = settings.DB_POOL_SIZE
+        options["max_overflow"] = settings.DB_MAX_OVERFLOW
+
+    new_engine = create_async_engine(url, **options)
+    if is_sqlite:
+        event.listen(new_engine.sync_engine, "connect", set_sqlite_pragmas)
+    instrument_engine(new_engine)
+    return new_engine
+
+
+engine = build_engine(settings.DATABASE_URL)
 
 SessionLocal = async_sessionmaker(
     engine,
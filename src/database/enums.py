@@ -10,3 +10,17 @@ class UserGroupEnum(str, Enum):
 class GenderEnum(str, Enum):
     MAN = "MAN"
     WOMAN = "WOMAN"
+
+
+class CampaignStatusEnum(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+
+class IngestStatusEnum(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
@@ -0,0 +1,86 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.config import settings
+from core.metrics import record_time
+
+logger = logging.getLogger("database.queries")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def before_cursor_execute(conn: Any, *args: Any) -> None:
+    conn.info["query_started_at"] = time.perf_counter()
+
+
+def after_cursor_execute(
+        conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    elapsed = time.perf_counter() - conn.info.pop("query_started_at")
+    record_time("db", elapsed)
+
+    if elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        logger.warning("🐢 Slow query (%.1f ms): %s | params=%r", elapsed * 1000, statement, parameters)
+
+    stats = query_stats.get()
+    if stats is None:
+        return
+    stats.count += 1
+    stats.duration += elapsed
+    # statements are already parameterized, so the SQL text is the query shape
+    stats.statements[statement] += 1
+    if stats.statements[statement] == settings.DB_N_PLUS_ONE_THRESHOLD + 1:
+        logger.warning(
+            "🔁 Possible N+1: statement ran more than %d times in one request: %s",
+            settings.DB_N_PLUS_ONE_THRESHOLD, statement,
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """Counts the queries of each request; in DEBUG mode reports them in X-Query-Count / X-Query-Time-Ms."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.DEBUG:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-query-count", str(stats.count).encode()),
+                    (b"x-query-time-ms", f"{stats.duration * 1000:.2f}".encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            query_stats.reset(token)
@@ -24,6 +24,7 @@ class User(Base):
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=False)
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, default=datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
 
@@ -44,6 +45,9 @@ class UserProfile(Base):
     gender = Column(SQLAEnum(GenderEnum), nullable=True)
     date_of_birth = Column(DateTime, nullable=True)
     info = Column(String, nullable=True)
+    # bumped on every change, used as the ETag of /users/me
+    version = Column(Integer, default=1, server_default="1", nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=True)
 
     user = relationship("User", back_populates="profile")
 
@@ -53,12 +57,16 @@ class BaseToken(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     token = Column(String, unique=True, nullable=False, index=True)
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
 
 
 class RefreshToken(BaseToken):
     __tablename__ = "refresh_tokens"
 
+    # every token issued by rotating the same login shares a family; reusing a rotated token revokes it
+    family_id = Column(String, nullable=False, index=True)
+    rotated_at = Column(DateTime, nullable=True)
+
     user = relationship("User", backref="refresh_tokens")
 
 
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum as SQLAEnum
+from datetime import datetime, timezone
+
+from database.db import Base
+from database.enums import CampaignStatusEnum
+
+
+class EmailCampaign(Base):
+    __tablename__ = "email_campaigns"
+
+    id = Column(Integer, primary_key=True, index=True)
+    subject = Column(String, nullable=False)
+    body_template = Column(Text, nullable=False)
+    status = Column(SQLAEnum(CampaignStatusEnum), default=CampaignStatusEnum.PENDING, nullable=False)
+
+    # checkpoint: recipients are streamed in users.id order, so a resumed run starts after this id
+    last_user_id = Column(Integer, default=0, nullable=False)
+    sent_count = Column(Integer, default=0, nullable=False)
+    failed_count = Column(Integer, default=0, nullable=False)
+    # held by the worker sending the campaign, see tasks/leases.py
+    lease_token = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,107 @@
+import uuid
+from sqlalchemy import (
+    Column, Integer, String, Float, Text, Numeric, ForeignKey, Table, Index, UniqueConstraint
+)
+from sqlalchemy.orm import relationship
+
+from database.db import Base
+from database.search import register_search_index
+
+movie_genres = Table(
+    "movie_genres",
+    Base.metadata,
+    Column("movie_id", Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True),
+    Column("genre_id", Integer, ForeignKey("genres.id", ondelete="CASCADE"), primary_key=True),
+    # the primary key serves movie -> genres, this one serves "movies of a genre" filters
+    Index("ix_movie_genres_genre_id_movie_id", "genre_id", "movie_id"),
+)
+
+movie_directors = Table(
+    "movie_directors",
+    Base.metadata,
+    Column("movie_id", Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True),
+    Column("director_id", Integer, ForeignKey("directors.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_movie_directors_director_id_movie_id", "director_id", "movie_id"),
+)
+
+movie_stars = Table(
+    "movie_stars",
+    Base.metadata,
+    Column("movie_id", Integer, ForeignKey("movies.id", ondelete="CASCADE"), primary_key=True),
+    Column("star_id", Integer, ForeignKey("stars.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_movie_stars_star_id_movie_id", "star_id", "movie_id"),
+)
+
+
+class Genre(Base):
+    __tablename__ = "genres"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+
+    movies = relationship("Movie", secondary=movie_genres, back_populates="genres")
+
+
+class Director(Base):
+    __tablename__ = "directors"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+
+    movies = relationship("Movie", secondary=movie_directors, back_populates="directors")
+
+
+class Star(Base):
+    __tablename__ = "stars"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+
+    movies = relationship("Movie", secondary=movie_stars, back_populates="stars")
+
+
+class Certification(Base):
+    __tablename__ = "certifications"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+
+    movies = relationship("Movie", back_populates="certification")
+
+
+class Movie(Base):
+    __tablename__ = "movies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    uuid = Column(String, unique=True, nullable=False, default=lambda: str(uuid.uuid4()))
+    name = Column(String, nullable=False)
+    year = Column(Integer, nullable=False)
+    time = Column(Integer, nullable=False)
+    imdb = Column(Float, nullable=False)
+    votes = Column(Integer, nullable=False)
+    meta_score = Column(Float, nullable=True)
+    gross = Column(Float, nullable=True)
+    description = Column(Text, nullable=False)
+    price = Column(Numeric(10, 2), nullable=False)
+    # relative to MEDIA_ROOT
+    video_path = Column(String, nullable=True)
+
+    certification_id = Column(Integer, ForeignKey("certifications.id"), nullable=False)
+
+    certification = relationship("Certification", back_populates="movies")
+    genres = relationship("Genre", secondary=movie_genres, back_populates="movies")
+    directors = relationship("Director", secondary=movie_directors, back_populates="movies")
+    stars = relationship("Star", secondary=movie_stars, back_populates="movies")
+
+    __table_args__ = (
+        UniqueConstraint("name", "year", "time", name="uq_movies_name_year_time"),
+        # one index per sortable column, with id as the tie-breaker, so keyset pages are index range scans
+        Index("ix_movies_year_id", "year", "id"),
+        Index("ix_movies_imdb_id", "imdb", "id"),
+        Index("ix_movies_votes_id", "votes", "id"),
+        Index("ix_movies_price_id", "price", "id"),
+        Index("ix_movies_name_id", "name", "id"),
+    )
+
+
+register_search_index(Base.metadata)
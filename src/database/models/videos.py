@@ -0,0 +1,60 @@
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime, ForeignKey, Index, UniqueConstraint
+from sqlalchemy import Enum as SQLAEnum
+from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
+
+from database.db import Base
+from database.enums import IngestStatusEnum
+
+
+class VideoIngest(Base):
+    __tablename__ = "video_ingests"
+
+    id = Column(Integer, primary_key=True, index=True)
+    movie_id = Column(Integer, ForeignKey("movies.id", ondelete="CASCADE"), nullable=False)
+    # relative to MEDIA_ROOT
+    source_path = Column(String, nullable=False)
+    source_sha256 = Column(String, nullable=True)
+    duration = Column(Float, nullable=True)
+    status = Column(SQLAEnum(IngestStatusEnum), default=IngestStatusEnum.PENDING, nullable=False)
+    progress = Column(Float, default=0.0, nullable=False)
+    master_manifest = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    # held by the worker packaging the ingest, see tasks/leases.py
+    lease_token = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    renditions = relationship(
+        "VideoRendition", back_populates="ingest", cascade="all, delete-orphan", order_by="VideoRendition.id"
+    )
+
+    __table_args__ = (
+        # "latest completed ingest of a movie" for playback
+        Index("ix_video_ingests_movie_id_status_id", "movie_id", "status", "id"),
+    )
+
+
+class VideoRendition(Base):
+    """One packaged bitrate ladder rung. Rows are written only once all segments are stored, so they
+    double as the checkpoint: a resumed ingest re-encodes just the renditions without a row."""
+    __tablename__ = "video_renditions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    ingest_id = Column(Integer, ForeignKey("video_ingests.id", ondelete="CASCADE"), nullable=False)
+    name = Column(String, nullable=False)
+    width = Column(Integer, nullable=False)
+    height = Column(Integer, nullable=False)
+    bandwidth = Column(Integer, nullable=False)
+    segment_count = Column(Integer, nullable=False)
+    # media playlist with segment URIs pointing into content-addressed storage
+    manifest = Column(Text, nullable=False)
+
+    ingest = relationship("VideoIngest", back_populates="renditions")
+
+    __table_args__ = (
+        UniqueConstraint("ingest_id", "name", name="uq_video_renditions_ingest_id_name"),
+    )
@@ -0,0 +1,97 @@
+import re
+from typing import Optional
+from sqlalchemy import DDL, MetaData, event
+
+# Movie full-text search lives in an FTS5 table kept in sync by triggers, so every writer
+# (ORM, bulk inserts, raw SQL) updates the index in the same transaction as the catalog.
+DIRECTOR_NAMES = (
+    "(SELECT group_concat(directors.name, ' ') FROM movie_directors "
+    "JOIN directors ON directors.id = movie_directors.director_id WHERE movie_directors.movie_id = {movie_id})"
+)
+STAR_NAMES = (
+    "(SELECT group_concat(stars.name, ' ') FROM movie_stars "
+    "JOIN stars ON stars.id = movie_stars.star_id WHERE movie_stars.movie_id = {movie_id})"
+)
+
+SEARCH_DDL = [
+    # porter stems English words ("running" finds "run"); prefix='2 3' indexes short prefixes for typeahead
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS movie_search USING fts5(
+        name, description, directors, stars,
+        tokenize = 'porter unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS movies_search_insert AFTER INSERT ON movies BEGIN
+        INSERT INTO movie_search (rowid, name, description, directors, stars)
+        VALUES (new.id, new.name, new.description,
+                {DIRECTOR_NAMES.format(movie_id="new.id")}, {STAR_NAMES.format(movie_id="new.id")});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_search_update AFTER UPDATE OF name, description ON movies BEGIN
+        UPDATE movie_search SET name = new.name, description = new.description WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS movies_search_delete AFTER DELETE ON movies BEGIN
+        DELETE FROM movie_search WHERE rowid = old.id;
+    END
+    """,
+]
+for table, column, names in (
+        ("directors", "director_id", DIRECTOR_NAMES),
+        ("stars", "star_id", STAR_NAMES),
+):
+    SEARCH_DDL += [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS movie_{table}_search_insert AFTER INSERT ON movie_{table} BEGIN
+            UPDATE movie_search SET {table} = {names.format(movie_id="new.movie_id")} WHERE rowid = new.movie_id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS movie_{table}_search_delete AFTER DELETE ON movie_{table} BEGIN
+            UPDATE movie_search SET {table} = {names.format(movie_id="old.movie_id")} WHERE rowid = old.movie_id;
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_search_update AFTER UPDATE OF name ON {table} BEGIN
+            UPDATE movie_search SET {table} = {names.format(movie_id="movie_search.rowid")}
+            WHERE rowid IN (SELECT movie_id FROM movie_{table} WHERE {column} = new.id);
+        END
+        """,
+    ]
+
+
+def register_search_index(metadata: MetaData) -> None:
+    """Lets ``metadata.create_all`` / ``drop_all`` build and remove the index (the tests rely on it)."""
+    for statement in SEARCH_DDL:
+        event.listen(metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(metadata, "before_drop", DDL("DROP TABLE IF EXISTS movie_search").execute_if(dialect="sqlite"))
+
+
+# bm25 column weights: a title hit outranks a cast/crew hit, which outranks a description hit
+SEARCH_SQL = """
+    SELECT rowid AS id, -bm25(movie_search, 10.0, 1.0, 4.0, 4.0) AS score
+    FROM movie_search
+    WHERE movie_search MATCH :match
+    ORDER BY score DESC
+    LIMIT :limit OFFSET :offset
+"""
+SEARCH_TERM = re.compile(r"\w+")
+MAX_SEARCH_TERMS = 8
+
+
+def match_expression(query: str) -> Optional[str]:
+    """Turns user input into an FTS5 query: every word must match, the last one also as a prefix.
+
+    Words are quoted, so FTS5 operators typed by the user are searched for literally.
+    The last word is matched both whole (stemmed) and as a raw prefix, because prefixes
+    are not stemmed: ``"running"*`` alone would miss the indexed stem ``run``.
+    """
+    terms = SEARCH_TERM.findall(query.lower())[:MAX_SEARCH_TERMS]
+    if not terms:
+        return None
+    *complete, last = terms
+    return " AND ".join([*(f'"{term}"' for term in complete), f'("{last}" OR "{last}"*)'])
@@ -1,19 +1,124 @@
+import asyncio
+from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator
 from fastapi import FastAPI
-from routes import auth, user
+from fastapi.staticfiles import StaticFiles
+
+from core.config import settings
+from core.invalidation import cache_invalidation
+from core.concurrency import ConcurrencyLimitMiddleware, build_limiters
+from core.metrics import CallbackMetric, MetricsMiddleware, registry
+from database.db import SessionLocal
+from database.instrumentation import QueryStatsMiddleware
+from routes import auth, user, campaigns, metrics, movies, videos
+from security.auth import decoded_tokens, token_versions
+from security.hashing import get_dummy_hash, password_hasher
+from security.jwt_keys import get_jwt_keys
+from security.throttle import login_throttle
+from services.groups import get_default_group_id
+from services.hls import objects_dir
+from services.suggestions import (
+    rebuild_suggestion_index, refresh_suggestion_index_periodically, suggestion_index
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    password_hasher.start()
+    get_jwt_keys()
+    get_dummy_hash()
+    async with SessionLocal() as db:
+        await get_default_group_id(db)
+        try:
+            await rebuild_suggestion_index(db)
+        except Exception as exc:
+            # suggestions stay empty until the periodic refresh manages to build the index
+            print(f"❌ Suggestion index build failed, retrying in {settings.SUGGEST_REFRESH_INTERVAL} s: {exc}")
+    background = [
+        asyncio.create_task(refresh_suggestion_index_periodically(SessionLocal)),
+        asyncio.create_task(cache_invalidation.listen()),
+    ]
+    try:
+        yield
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        password_hasher.shutdown()
+
 
 app = FastAPI(
     title="Online Cinema API",
     version="1.0.0",
     description=(
-        "Online Cinema API provides authentication, user management, and profile operations.\n\n"
+        "Online Cinema API provides authentication, user management, profile operations, and the movie catalog.\n\n"
         "Use this documentation to explore available endpoints for registration, login, password recovery, "
         "and profile management."
     ),
     openapi_tags=[
         {"name": "Auth", "description": "Endpoints for authentication, registration, and password management."},
-        {"name": "User", "description": "Endpoints for viewing and updating user profiles."}
+        {"name": "User", "description": "Endpoints for viewing and updating user profiles."},
+        {"name": "Campaigns", "description": "Admin endpoints for bulk email campaigns."},
+        {"name": "Movies", "description": "Endpoints for browsing the movie catalog."},
+        {"name": "Videos", "description": "HLS packaging of uploaded videos and adaptive streaming playlists."}
     ],
+    lifespan=lifespan,
+)
+
+concurrency_limiters = build_limiters(
+    settings.CONCURRENCY_LIMITS, settings.CONCURRENCY_QUEUE_SIZE, settings.CONCURRENCY_QUEUE_TIMEOUT
+)
+app.add_middleware(
+    ConcurrencyLimitMiddleware, limiters=concurrency_limiters, retry_after=settings.CONCURRENCY_RETRY_AFTER
 )
+app.add_middleware(QueryStatsMiddleware)
+# added last so it is the outermost middleware and also sees requests shed by the limiter
+app.add_middleware(MetricsMiddleware)
+
+
+def register_metrics() -> None:
+    caches = {
+        "token_version": token_versions, "jwt": decoded_tokens,
+        "profile_version": user.profile_versions, "video_path": movies.video_paths,
+    }
+
+    def limiter_stats(key: str) -> dict[tuple[str, ...], float]:
+        return {(path,): limiter.stats()[key] for path, limiter in concurrency_limiters.items()}
+
+    for metric in (
+        CallbackMetric("concurrency_limiter_in_flight", "Requests holding a slot.", ("route",),
+                       lambda: limiter_stats("in_flight")),
+        CallbackMetric("concurrency_limiter_waiting", "Requests queued for a slot.", ("route",),
+                       lambda: limiter_stats("waiting")),
+        CallbackMetric("concurrency_limiter_rejected_total", "Requests shed with 503.", ("route",),
+                       lambda: limiter_stats("rejected"), kind="counter"),
+        CallbackMetric("password_hash_in_flight", "bcrypt jobs running or queued.", (),
+                       lambda: {(): password_hasher.in_flight}),
+        CallbackMetric("password_hash_rejected_total", "bcrypt jobs rejected with 503.", (),
+                       lambda: {(): password_hasher.rejected}, kind="counter"),
+        CallbackMetric("login_throttle_rejected_total", "Login attempts rejected with 429.", (),
+                       lambda: {(): login_throttle.rejected}, kind="counter"),
+        CallbackMetric("suggestion_index_keys", "Title keys in the autocomplete index.", (),
+                       lambda: {(): suggestion_index.stats()["keys"]}),
+        CallbackMetric("suggestion_index_bytes", "Approximate memory held by the autocomplete index.", (),
+                       lambda: {(): suggestion_index.stats()["bytes"]}),
+        CallbackMetric("cache_hits_total", "In-process cache hits.", ("cache",),
+                       lambda: {(name,): cache.hits for name, cache in caches.items()}, kind="counter"),
+        CallbackMetric("cache_misses_total", "In-process cache misses.", ("cache",),
+                       lambda: {(name,): cache.misses for name, cache in caches.items()}, kind="counter"),
+    ):
+        registry.register(metric)
+
+
+register_metrics()
 
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(user.router, prefix="/api/v1")
+app.include_router(campaigns.router, prefix="/api/v1")
+app.include_router(movies.router, prefix="/api/v1")
+app.include_router(videos.router, prefix="/api/v1")
+app.include_router(metrics.router)
+
+if settings.HLS_SEGMENT_URL.startswith("/"):
+    # development fallback; in production nginx or a CDN serves the immutable segment objects
+    app.mount(settings.HLS_SEGMENT_URL, StaticFiles(directory=objects_dir(), check_dir=False), name="hls-segments")
@@ -1,23 +1,36 @@
 from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import IntegrityError
 from datetime import timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 
 from database.db import get_db
 from core.config import settings
-from services.email import send_activation_email, send_password_reset_email
+from services.groups import forget_default_group_id, get_default_group_id
+from tasks.email import queue_email, send_activation_email_task, send_password_reset_email_task
 from database.models.accounts import User, UserGroup, UserProfile, RefreshToken, PasswordResetToken
 from schemas.common import MessageResponse
 from schemas.auth import UserCreate, UserLogin, TokenPair, RefreshTokenRequest, PasswordResetRequest, \
     PasswordResetConfirm, ChangePasswordRequest
+from security.jwt_keys import get_jwt_keys
+from security.hashing import get_dummy_hash
+from security.throttle import login_throttle
 from security.auth import (
-    hash_password, verify_password, create_access_token, decode_token, create_token_pair,
-    delete_token, verify_token, create_token, get_current_user
+    password_hasher, create_access_token, decode_token, create_token_pair,
+    delete_token, verify_token, create_token, get_access_claims, AccessClaims,
+    rotate_refresh_token, revoke_token_family, revoke_user_sessions, token_versions
 )
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
+def is_duplicate_email(error: IntegrityError) -> bool:
+    # SQLite: "UNIQUE constraint failed: users.email", PostgreSQL: '... unique constraint "ix_users_email"'
+    message = str(error.orig)
+    return "users.email" in message or "ix_users_email" in message
+
+
 @router.post(
     "/register",
     summary="Register a new user",
@@ -26,17 +39,8 @@ router = APIRouter(prefix="/auth", tags=["Auth"])
     response_model=MessageResponse,
 )
 async def register(user: UserCreate, db: AsyncSession = Depends(get_db)) -> MessageResponse:
-    result = await db.execute(select(User).where(User.email == user.email))
-    existing_user = result.scalar_one_or_none()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-
-    group_result = await db.execute(select(UserGroup).where(UserGroup.name == "USER"))
-    group = group_result.scalar_one_or_none()
-    if not group:
+    group_id = await get_default_group_id(db)
+    if not group_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Default group 'USER' not found. Please initialize user groups."
@@ -44,22 +48,29 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)) -> Mess
 
     new_user = User(
         email=user.email,
-        hashed_password=hash_password(user.password),
-        group_id=group.id
+        hashed_password=await password_hasher.hash(user.password),
+        group_id=group_id,
+        profile=UserProfile(),
     )
     db.add(new_user)
-    await db.commit()
-    await db.refresh(new_user)
-
-    user_profile = UserProfile(user_id=new_user.id)
-    db.add(user_profile)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        if not is_duplicate_email(exc):
+            # e.g. the default group was reseeded under a new id: reload it on the next request
+            forget_default_group_id()
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
 
     token = create_access_token(
         {"sub": user.email},
         expires_delta=timedelta(minutes=settings.VERIFY_TOKEN_EXPIRE_MINUTES)
     )
-    await send_activation_email(user.email, token)
+    await queue_email(send_activation_email_task, user.email, token)
 
     return MessageResponse(
         message=(
@@ -75,11 +86,24 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)) -> Mess
     description="Authenticates a user and returns an access and refresh token pair. Requires an activated account.",
     response_model=TokenPair,
 )
-async def login(user: UserLogin, db: AsyncSession = Depends(get_db)) -> TokenPair:
-    result = await db.execute(select(User).where(User.email == user.email))
+async def login(user: UserLogin, request: Request, db: AsyncSession = Depends(get_db)) -> TokenPair:
+    # throttled before any DB or bcrypt work, so rejected attempts stay cheap for us
+    await login_throttle.check(request.client.host if request.client else "unknown", user.email)
+
+    result = await db.execute(
+        select(User).options(joinedload(User.group)).where(User.email == user.email)
+    )
     db_user = result.scalar_one_or_none()
 
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+    if not db_user:
+        await password_hasher.verify(user.password, get_dummy_hash())
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid credentials"
+        )
+
+    is_valid, new_hash = await password_hasher.verify_and_update(user.password, db_user.hashed_password)
+    if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid credentials"
@@ -91,7 +115,12 @@ async def login(user: UserLogin, db: AsyncSession = Depends(get_db)) -> TokenPai
             detail="Account not activated. Check your email."
         )
 
-    token_pair = await create_token_pair(db_user.id, db)
+    if new_hash:
+        db_user.hashed_password = new_hash
+        await db.commit()
+
+    token_versions.set(db_user.id, db_user.token_version)
+    token_pair = await create_token_pair(db_user.id, db_user.group.name, db_user.token_version, db)
 
     return TokenPair(**token_pair)
 
@@ -99,29 +128,54 @@ async def login(user: UserLogin, db: AsyncSession = Depends(get_db)) -> TokenPai
 @router.post(
     "/refresh",
     summary="Refresh access token",
-    description="Uses a valid refresh token to issue a new access token. The old refresh token is invalidated.",
+    description="Uses a valid refresh token to issue a new access token. The old refresh token is invalidated; "
+                "presenting it again revokes every token issued from the same login.",
     response_model=TokenPair,
 )
 async def refresh_tokens(data: RefreshTokenRequest, db: AsyncSession = Depends(get_db)) -> dict:
-    token_obj = await verify_token(RefreshToken, data.refresh_token, db)
-    if not token_obj:
+    token_pair = await rotate_refresh_token(data.refresh_token, db)
+    if not token_pair:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired refresh token")
-
-    user_id = token_obj.user_id
-    await delete_token(RefreshToken, data.refresh_token, db)
-    return await create_token_pair(user_id, db)
+    return token_pair
 
 
 @router.post(
     "/logout",
     summary="Logout user",
-    description="Invalidates the current refresh token to prevent further use.",
+    description="Invalidates the current refresh token and every token rotated from the same login.",
 )
 async def logout(data: RefreshTokenRequest, db: AsyncSession = Depends(get_db)) -> MessageResponse:
-    await delete_token(RefreshToken, data.refresh_token, db)
+    await revoke_token_family(data.refresh_token, db)
     return MessageResponse(message="Successfully logged out")
 
 
+@router.post(
+    "/logout-all",
+    summary="Logout from all devices",
+    description="Invalidates every access and refresh token issued to the current user.",
+)
+async def logout_all(
+        claims: AccessClaims = Depends(get_access_claims),
+        db: AsyncSession = Depends(get_db)
+) -> MessageResponse:
+    user = await db.get(User, claims.id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+
+    await revoke_user_sessions(user, db)
+    return MessageResponse(message="Successfully logged out from all devices")
+
+
+@router.get(
+    "/jwks.json",
+    summary="Public signing keys",
+    description="Returns the public keys used to sign access tokens "
+                "(empty when tokens are signed with a shared secret).",
+)
+async def jwks() -> dict:
+    return get_jwt_keys().public_jwks()
+
+
 @router.get("/verify", include_in_schema=False)
 async def verify_email(
         token: str = Query(...), db: AsyncSession = Depends(get_db)
@@ -160,7 +214,7 @@ async def request_password_reset(data: PasswordResetRequest, db: AsyncSession =
         PasswordResetToken, user.id, settings.PASSWORD_RESET_TOKEN_EXPIRE_HOURS, db
     )
 
-    await send_password_reset_email(user.email, token_value)
+    await queue_email(send_password_reset_email_task, user.email, token_value)
 
     return MessageResponse(message=f"Password reset link sent to {user.email}")
 
@@ -176,8 +230,8 @@ async def reset_password(data: PasswordResetConfirm, db: AsyncSession = Depends(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    user.hashed_password = hash_password(data.new_password)
-    await db.commit()
+    user.hashed_password = await password_hasher.hash(data.new_password)
+    await revoke_user_sessions(user, db)
 
     await delete_token(PasswordResetToken, data.token, db)
 
@@ -187,17 +241,18 @@ async def reset_password(data: PasswordResetConfirm, db: AsyncSession = Depends(
 @router.post("/change-password")
 async def change_password(
         data: ChangePasswordRequest,
-        current_user: User = Depends(get_current_user),
+        claims: AccessClaims = Depends(get_access_claims),
         db: AsyncSession = Depends(get_db)
 ) -> MessageResponse:
-    if not verify_password(data.old_password, current_user.hashed_password):
+    user = await db.get(User, claims.id)
+    if not user or not await password_hasher.verify(data.old_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
 
-    current_user.hashed_password = hash_password(data.new_password)
-    await db.commit()
+    user.hashed_password = await password_hasher.hash(data.new_password)
+    await revoke_user_sessions(user, db)
 
     return MessageResponse(message="Password changed successfully.")
 
@@ -221,7 +276,7 @@ async def resend_verification_email(
         expires_delta=timedelta(minutes=settings.VERIFY_TOKEN_EXPIRE_MINUTES)
     )
 
-    await send_activation_email(user.email, token)
+    await queue_email(send_activation_email_task, user.email, token)
 
     return MessageResponse(message=f"A new activation email has been sent to {user.email}.")
 
@@ -244,6 +299,6 @@ async def resend_password_reset(
         PasswordResetToken, user.id, settings.PASSWORD_RESET_TOKEN_EXPIRE_HOURS, db
     )
 
-    await send_password_reset_email(user.email, token_value)
+    await queue_email(send_password_reset_email_task, user.email, token_value)
 
     return MessageResponse(message=f"A new password reset email has been sent to {user.email}.")
@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db import get_db
+from database.enums import CampaignStatusEnum
+from database.models.campaigns import EmailCampaign
+from schemas.campaigns import CampaignCreate, CampaignResponse
+from security.auth import require_admin, AccessClaims
+from tasks.campaigns import send_campaign
+from tasks.publish import queue_task
+
+router = APIRouter(prefix="/campaigns", tags=["Campaigns"])
+
+
+@router.post(
+    "",
+    summary="Start an email campaign",
+    description="Creates a campaign and queues it for delivery to every active user. "
+                "`$email` and `$first_name` placeholders in the body are filled per recipient.",
+    response_model=CampaignResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_campaign(
+        data: CampaignCreate,
+        admin: AccessClaims = Depends(require_admin),
+        db: AsyncSession = Depends(get_db)
+) -> EmailCampaign:
+    campaign = EmailCampaign(subject=data.subject, body_template=data.body_template)
+    db.add(campaign)
+    await db.commit()
+
+    if not await queue_task(send_campaign, campaign.id):
+        # no worker will ever see it: record the failure instead of leaving it PENDING forever
+        campaign.status = CampaignStatusEnum.FAILED
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Campaign {campaign.id} could not be queued, please try again later.",
+        )
+    return campaign
+
+
+@router.get(
+    "/{campaign_id}",
+    summary="Get campaign progress",
+    description="Returns the delivery status and counters of a campaign.",
+    response_model=CampaignResponse,
+)
+async def get_campaign(
+        campaign_id: int,
+        admin: AccessClaims = Depends(require_admin),
+        db: AsyncSession = Depends(get_db)
+) -> EmailCampaign:
+    campaign = await db.get(EmailCampaign, campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return campaign
@@ -0,0 +1,226 @@
+import json
+import base64
+import binascii
+from decimal import Decimal
+from mimetypes import guess_type
+from typing import Any, Optional
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import Float, Integer, select, text, tuple_
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import TTLCache
+from core.config import settings
+from core.media import MediaFileResponse, resolve_media_path
+from database.db import get_db
+from database.models.movies import Genre, Movie, movie_genres
+from database.search import SEARCH_SQL, match_expression
+from schemas.movies import (
+    MovieDetail, MovieListItem, MoviePage, MovieSearchHit, MovieSortField, MovieSuggestion, NamedItem, SortOrder
+)
+from security.auth import get_access_claims
+from services.suggestions import suggestion_index
+
+router = APIRouter(prefix="/movies", tags=["Movies"])
+
+SORT_COLUMNS = {
+    MovieSortField.YEAR: Movie.year,
+    MovieSortField.IMDB: Movie.imdb,
+    MovieSortField.VOTES: Movie.votes,
+    MovieSortField.PRICE: Movie.price,
+    MovieSortField.NAME: Movie.name,
+}
+
+# movie id -> video path, so the range requests a player sends while seeking skip the database
+video_paths = TTLCache(maxsize=settings.VIDEO_PATH_CACHE_SIZE, ttl=settings.VIDEO_PATH_CACHE_TTL)
+
+
+# KEYSET CURSORS
+def encode_cursor(sort_value: Any, movie_id: int) -> str:
+    payload = json.dumps([sort_value, movie_id], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor: str, sort_by: MovieSortField) -> tuple[Any, int]:
+    try:
+        sort_value, movie_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if sort_by == MovieSortField.PRICE:
+            sort_value = Decimal(sort_value)
+        return sort_value, int(movie_id)
+    except (binascii.Error, ValueError, TypeError, ArithmeticError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+@router.get(
+    "",
+    summary="Browse movies",
+    description="Lists movies filtered by genre, year and rating. Pages are fetched with `next_cursor` "
+                "instead of an offset, so every page costs the same however deep it is.",
+    response_model=MoviePage,
+)
+async def list_movies(
+        genre: Optional[str] = Query(None, description="Genre name"),
+        year: Optional[int] = Query(None),
+        year_from: Optional[int] = Query(None),
+        year_to: Optional[int] = Query(None),
+        min_rating: Optional[float] = Query(None, ge=0, le=10, description="Minimum IMDb rating"),
+        sort_by: MovieSortField = Query(MovieSortField.YEAR),
+        order: SortOrder = Query(SortOrder.DESC),
+        limit: int = Query(20, ge=1, le=100),
+        cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page"),
+        db: AsyncSession = Depends(get_db)
+) -> MoviePage:
+    sort_column = SORT_COLUMNS[sort_by]
+    query = select(Movie).options(selectinload(Movie.genres))
+
+    if genre:
+        query = query.where(
+            select(movie_genres.c.movie_id)
+            .join(Genre, Genre.id == movie_genres.c.genre_id)
+            .where(movie_genres.c.movie_id == Movie.id, Genre.name == genre)
+            .exists()
+        )
+    if year is not None:
+        query = query.where(Movie.year == year)
+    if year_from is not None:
+        query = query.where(Movie.year >= year_from)
+    if year_to is not None:
+        query = query.where(Movie.year <= year_to)
+    if min_rating is not None:
+        query = query.where(Movie.imdb >= min_rating)
+
+    key = tuple_(sort_column, Movie.id)
+    descending = order == SortOrder.DESC
+    if cursor:
+        # continue right after the last row of the previous page, using the (column, id) index
+        boundary = tuple_(*decode_cursor(cursor, sort_by))
+        query = query.where(key < boundary if descending else key > boundary)
+    if descending:
+        query = query.order_by(sort_column.desc(), Movie.id.desc())
+    else:
+        query = query.order_by(sort_column.asc(), Movie.id.asc())
+
+    result = await db.execute(query.limit(limit + 1))
+    movies = result.scalars().all()
+
+    next_cursor = None
+    if len(movies) > limit:
+        last = movies[limit - 1]
+        next_cursor = encode_cursor(getattr(last, sort_by.value), last.id)
+
+    return MoviePage(items=movies[:limit], next_cursor=next_cursor)
+
+
+@router.get(
+    "/search",
+    summary="Search movies",
+    description="Full-text search over titles, descriptions, directors and stars, best matches first. "
+                "The last word also matches as a prefix, so partially typed words find results.",
+    response_model=list[MovieSearchHit],
+)
+async def search(
+        q: str = Query(..., min_length=1, max_length=200),
+        limit: int = Query(20, ge=1, le=50),
+        offset: int = Query(0, ge=0, le=500),
+        db: AsyncSession = Depends(get_db)
+) -> list[MovieSearchHit]:
+    match = match_expression(q)
+    if match is None:
+        return []
+
+    hits = (
+        text(SEARCH_SQL)
+        .bindparams(match=match, limit=limit, offset=offset)
+        .columns(id=Integer, score=Float)
+        .subquery("hits")
+    )
+    result = await db.execute(
+        select(Movie, hits.c.score)
+        .join(hits, hits.c.id == Movie.id)
+        .options(selectinload(Movie.genres))
+        .order_by(hits.c.score.desc(), Movie.id)
+    )
+    return [
+        MovieSearchHit(**MovieListItem.model_validate(movie).model_dump(), score=score)
+        for movie, score in result.tuples()
+    ]
+
+
+@router.get(
+    "/suggest",
+    summary="Autocomplete movie titles",
+    description="Most voted titles with a word starting with `q`, served from an in-memory index "
+                "without a database round-trip. Meant to be called on every keystroke.",
+    response_model=list[MovieSuggestion],
+)
+async def suggest(
+        q: str = Query(..., min_length=1, max_length=100),
+        limit: int = Query(10, ge=1, le=settings.SUGGEST_TOP_K),
+) -> list[MovieSuggestion]:
+    return [
+        MovieSuggestion(id=movie_id, name=name, year=year)
+        for movie_id, name, year in suggestion_index.lookup(q, limit)
+    ]
+
+
+@router.get(
+    "/genres",
+    summary="List genres",
+    response_model=list[NamedItem],
+)
+async def list_genres(db: AsyncSession = Depends(get_db)) -> list[Genre]:
+    result = await db.execute(select(Genre).order_by(Genre.name))
+    return list(result.scalars().all())
+
+
+@router.get(
+    "/{movie_id}",
+    summary="Get movie details",
+    description="Returns a movie with its certification, genres, directors and stars.",
+    response_model=MovieDetail,
+)
+async def get_movie(movie_id: int, db: AsyncSession = Depends(get_db)) -> Movie:
+    result = await db.execute(
+        select(Movie)
+        .options(
+            selectinload(Movie.certification),
+            selectinload(Movie.genres),
+            selectinload(Movie.directors),
+            selectinload(Movie.stars),
+        )
+        .where(Movie.id == movie_id)
+    )
+    movie = result.scalar_one_or_none()
+    if not movie:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    return movie
+
+
+@router.api_route(
+    "/{movie_id}/stream",
+    methods=["GET", "HEAD"],
+    summary="Stream a movie",
+    description="Serves the movie's video file with `Range` / `If-Range` support (`206 Partial Content`), "
+                "so players can seek without downloading the file from the start.",
+    response_class=MediaFileResponse,
+    dependencies=[Depends(get_access_claims)],
+)
+async def stream_movie(movie_id: int, db: AsyncSession = Depends(get_db)) -> Response:
+    video_path = video_paths.get(movie_id)
+    if video_path is None:
+        result = await db.execute(select(Movie.video_path).where(Movie.id == movie_id))
+        video_path = result.scalar_one_or_none()
+        if video_path:
+            video_paths.set(movie_id, video_path)
+
+    path = resolve_media_path(video_path) if video_path else None
+    if path is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    headers = {"Cache-Control": "private, max-age=3600"}
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        # nginx serves the file from its internal location, with sendfile and its own Range handling
+        headers["X-Accel-Redirect"] = f"{settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{quote(video_path)}"
+        return Response(headers=headers, media_type=guess_type(path.name)[0])
+    return MediaFileResponse(path, headers=headers)
@@ -1,13 +1,68 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Any, Optional
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from core.cache import TTLCache
+from core.config import settings
+from core.invalidation import cache_invalidation
 from database.db import get_db
+from database.enums import UserGroupEnum
 from database.models.accounts import User, UserProfile
-from security.auth import get_current_user
+from security.auth import get_access_claims, AccessClaims
 from schemas.user import UserProfileResponse, UserProfileUpdate
 
 router = APIRouter(prefix="/users", tags=["User"])
 
+# user id -> (profile version, updated_at), so unchanged profiles are answered with 304 without a query;
+# only trusted when updates made through other workers evict it too (a shared cache_invalidation backend)
+profile_versions = cache_invalidation.register(
+    "profile_version",
+    TTLCache(maxsize=settings.PROFILE_VERSION_CACHE_SIZE, ttl=settings.PROFILE_VERSION_CACHE_TTL),
+)
+
+
+def profile_validators(
+        user_id: int, group: UserGroupEnum, version: int, updated_at: Optional[datetime]
+) -> dict[str, str]:
+    headers = {"ETag": f'"{user_id}-{version}-{group.value}"', "Cache-Control": "private, no-cache"}
+    if updated_at:
+        headers["Last-Modified"] = format_datetime(updated_at.replace(tzinfo=timezone.utc), usegmt=True)
+    return headers
+
+
+def profile_json(profile: Any, email: str, group: UserGroupEnum) -> str:
+    # values come straight from our own tables, so skip validation and serialize the attributes directly
+    date_of_birth = profile.date_of_birth
+    return UserProfileResponse.model_construct(
+        id=profile.id,
+        user_id=profile.user_id,
+        first_name=profile.first_name,
+        last_name=profile.last_name,
+        gender=profile.gender,
+        date_of_birth=date_of_birth.date() if isinstance(date_of_birth, datetime) else date_of_birth,
+        avatar=profile.avatar,
+        info=profile.info,
+        email=email,
+        group=group.value,
+    ).model_dump_json()
+
+
+def is_not_modified(request: Request, validators: dict[str, str]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or validators["ETag"] in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and "Last-Modified" in validators:
+        try:
+            return parsedate_to_datetime(validators["Last-Modified"]) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
 
 @router.get(
     "/me",
@@ -16,24 +71,32 @@ router = APIRouter(prefix="/users", tags=["User"])
     response_model=UserProfileResponse,
 )
 async def get_my_profile(
-        current_user: User = Depends(get_current_user),
+        request: Request,
+        claims: AccessClaims = Depends(get_access_claims),
         db: AsyncSession = Depends(get_db)
-) -> UserProfileResponse:
+) -> Response:
+    cached = profile_versions.get(claims.id) if cache_invalidation.shared else None
+    if cached:
+        validators = profile_validators(claims.id, claims.group, *cached)
+        if is_not_modified(request, validators):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
+
     result = await db.execute(
-        select(UserProfile).where(UserProfile.user_id == current_user.id)
+        select(*UserProfile.__table__.columns, User.email)
+        .join(UserProfile.user)
+        .where(UserProfile.user_id == claims.id)
     )
-    profile = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not profile:
+    if not row:
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    return UserProfileResponse.model_validate(
-        {
-            **profile.__dict__,
-            "email": current_user.email,
-            "group": current_user.group.name,
-        }
-    )
+    profile_versions.set(claims.id, (row.version, row.updated_at))
+    validators = profile_validators(claims.id, claims.group, row.version, row.updated_at)
+    if is_not_modified(request, validators):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
+
+    return Response(profile_json(row, row.email, claims.group), media_type="application/json", headers=validators)
 
 
 @router.put(
@@ -44,23 +107,31 @@ async def get_my_profile(
 )
 async def update_my_profile(
         data: UserProfileUpdate,
-        current_user: User = Depends(get_current_user),
+        claims: AccessClaims = Depends(get_access_claims),
         db: AsyncSession = Depends(get_db)
-) -> UserProfileResponse:
+) -> Response:
+    # the version is bumped by the UPDATE itself, so concurrent updates never end up sharing an ETag
     result = await db.execute(
-        select(UserProfile).where(UserProfile.user_id == current_user.id)
+        update(UserProfile)
+        .where(UserProfile.user_id == claims.id)
+        .values(
+            **data.model_dump(exclude_unset=True),
+            version=UserProfile.version + 1,
+            updated_at=datetime.now(timezone.utc),
+        )
+        .returning(
+            *UserProfile.__table__.columns,
+            select(User.email).where(User.id == UserProfile.user_id).scalar_subquery().label("email"),
+        )
+        .execution_options(synchronize_session=False)
     )
-    profile = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not profile:
+    if not row:
         raise HTTPException(status_code=404, detail="Profile not found")
-
-    for field, value in data.dict(exclude_unset=True).items():
-        setattr(profile, field, value)
-
     await db.commit()
-    await db.refresh(profile)
 
-    return UserProfileResponse.model_validate(
-        {**profile.__dict__, "email": current_user.email}
-    )
+    await cache_invalidation.invalidate("profile_version", claims.id)
+    profile_versions.set(claims.id, (row.version, row.updated_at))
+    validators = profile_validators(claims.id, claims.group, row.version, row.updated_at)
+    return Response(profile_json(row, row.email, claims.group), media_type="application/json", headers=validators)
@@ -0,0 +1,130 @@
+import uuid
+import anyio
+from pathlib import Path
+from mimetypes import guess_extension
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import ScalarSelect, func, select
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from database.db import get_db
+from database.enums import IngestStatusEnum
+from database.models.movies import Movie
+from database.models.videos import VideoIngest, VideoRendition
+from schemas.videos import IngestResponse
+from security.auth import AccessClaims, get_access_claims, require_admin
+from tasks.publish import queue_task
+from tasks.videos import package_hls
+
+router = APIRouter(prefix="/movies", tags=["Videos"])
+
+PLAYLIST_TYPE = "application/vnd.apple.mpegurl"
+
+
+def latest_ingest_id(movie_id: int) -> ScalarSelect:
+    return (
+        select(func.max(VideoIngest.id))
+        .where(VideoIngest.movie_id == movie_id, VideoIngest.status == IngestStatusEnum.COMPLETED)
+        .scalar_subquery()
+    )
+
+
+@router.post(
+    "/{movie_id}/ingests",
+    summary="Upload a source video for HLS packaging",
+    description="Send the video file as the raw request body (e.g. `Content-Type: video/mp4`). "
+                "It is streamed to disk and queued for packaging into multi-bitrate HLS; "
+                "poll the returned ingest for progress.",
+    response_model=IngestResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_ingest(
+        movie_id: int,
+        request: Request,
+        admin: AccessClaims = Depends(require_admin),
+        db: AsyncSession = Depends(get_db)
+) -> VideoIngest:
+    if not await db.get(Movie, movie_id):
+        raise HTTPException(status_code=404, detail="Movie not found")
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    source_path = f"uploads/{uuid.uuid4().hex}{guess_extension(content_type) or ''}"
+    path = Path(settings.MEDIA_ROOT) / source_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # chunk by chunk, so uploads of any size never sit in memory
+    size = 0
+    async with await anyio.open_file(path, "wb") as file:
+        async for chunk in request.stream():
+            size += len(chunk)
+            await file.write(chunk)
+    if not size:
+        path.unlink()
+        raise HTTPException(status_code=400, detail="Empty upload")
+
+    ingest = VideoIngest(movie_id=movie_id, source_path=source_path, renditions=[])
+    db.add(ingest)
+    await db.commit()
+
+    if not await queue_task(package_hls, ingest.id):
+        # no worker will ever see it: record the failure instead of leaving it PENDING forever
+        ingest.status = IngestStatusEnum.FAILED
+        ingest.error = "Could not queue packaging: the task broker is unreachable"
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Ingest {ingest.id} could not be queued, please try again later.",
+        )
+    return ingest
+
+
+@router.get(
+    "/{movie_id}/ingests/{ingest_id}",
+    summary="Get ingest progress",
+    description="Returns the packaging status, progress percentage and finished renditions of an ingest.",
+    response_model=IngestResponse,
+)
+async def get_ingest(
+        movie_id: int,
+        ingest_id: int,
+        admin: AccessClaims = Depends(require_admin),
+        db: AsyncSession = Depends(get_db)
+) -> VideoIngest:
+    ingest = await db.get(VideoIngest, ingest_id, options=[selectinload(VideoIngest.renditions)])
+    if not ingest or ingest.movie_id != movie_id:
+        raise HTTPException(status_code=404, detail="Ingest not found")
+    return ingest
+
+
+@router.get(
+    "/{movie_id}/hls/master.m3u8",
+    summary="Get the HLS master playlist",
+    description="Lists the renditions of the movie's latest packaged video.",
+    response_class=Response,
+    dependencies=[Depends(get_access_claims)],
+)
+async def get_master_playlist(movie_id: int, db: AsyncSession = Depends(get_db)) -> Response:
+    result = await db.execute(select(VideoIngest.master_manifest).where(VideoIngest.id == latest_ingest_id(movie_id)))
+    manifest = result.scalar_one_or_none()
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="Video not found")
+    return Response(manifest, media_type=PLAYLIST_TYPE, headers={"Cache-Control": "private, max-age=60"})
+
+
+@router.get(
+    "/{movie_id}/hls/{rendition}.m3u8",
+    summary="Get an HLS media playlist",
+    description="Lists the segments of one rendition of the movie's latest packaged video.",
+    response_class=Response,
+    dependencies=[Depends(get_access_claims)],
+)
+async def get_media_playlist(movie_id: int, rendition: str, db: AsyncSession = Depends(get_db)) -> Response:
+    result = await db.execute(
+        select(VideoRendition.manifest)
+        .where(VideoRendition.ingest_id == latest_ingest_id(movie_id), VideoRendition.name == rendition)
+    )
+    manifest = result.scalar_one_or_none()
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="Rendition not found")
+    return Response(manifest, media_type=PLAYLIST_TYPE, headers={"Cache-Control": "private, max-age=60"})
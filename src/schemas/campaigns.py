@@ -0,0 +1,35 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+from typing import Optional
+
+from database.enums import CampaignStatusEnum
+
+
+class CampaignCreate(BaseModel):
+    subject: str = Field(..., min_length=1)
+    body_template: str = Field(..., min_length=1)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "subject": "New releases this week",
+                "body_template": "Hi $first_name, check out the new movies on Online Cinema!"
+            }
+        }
+    )
+
+
+class CampaignResponse(BaseModel):
+    id: int
+    subject: str
+    status: CampaignStatusEnum
+    last_user_id: int
+    sent_count: int
+    failed_count: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
@@ -0,0 +1,66 @@
+from decimal import Decimal
+from enum import Enum
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class MovieSortField(str, Enum):
+    YEAR = "year"
+    IMDB = "imdb"
+    VOTES = "votes"
+    PRICE = "price"
+    NAME = "name"
+
+
+class SortOrder(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class NamedItem(BaseModel):
+    id: int
+    name: str
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+
+class MovieListItem(BaseModel):
+    id: int
+    uuid: str
+    name: str
+    year: int
+    time: int
+    imdb: float
+    votes: int
+    price: Decimal
+    genres: list[NamedItem]
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+
+class MovieSuggestion(BaseModel):
+    id: int
+    name: str
+    year: int
+
+
+class MovieSearchHit(MovieListItem):
+    score: float
+
+
+class MovieDetail(MovieListItem):
+    meta_score: Optional[float] = None
+    gross: Optional[float] = None
+    description: str
+    certification: NamedItem
+    directors: list[NamedItem]
+    stars: list[NamedItem]
+
+
+class MoviePage(BaseModel):
+    items: list[MovieListItem]
+    next_cursor: Optional[str] = None
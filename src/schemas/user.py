@@ -1,15 +1,16 @@
 from pydantic import BaseModel, EmailStr, ConfigDict
 from datetime import date
+from typing import Optional
 from database.enums import GenderEnum
 
 
 class UserProfileBase(BaseModel):
-    first_name: str = None
-    last_name: str = None
-    gender: GenderEnum = None
-    date_of_birth: date = None
-    avatar: str = None
-    info: str = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    gender: Optional[GenderEnum] = None
+    date_of_birth: Optional[date] = None
+    avatar: Optional[str] = None
+    info: Optional[str] = None
 
 
 class UserProfileResponse(UserProfileBase):
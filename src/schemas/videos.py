@@ -0,0 +1,34 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Optional
+
+from database.enums import IngestStatusEnum
+
+
+class RenditionResponse(BaseModel):
+    name: str
+    width: int
+    height: int
+    bandwidth: int
+    segment_count: int
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
+
+
+class IngestResponse(BaseModel):
+    id: int
+    movie_id: int
+    status: IngestStatusEnum
+    progress: float
+    duration: Optional[float] = None
+    error: Optional[str] = None
+    renditions: list[RenditionResponse] = []
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(
+        from_attributes=True
+    )
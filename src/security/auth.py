@@ -1,32 +1,44 @@
-import uuid
+import time
 from typing import Type
+from dataclasses import dataclass
 from jose import JWTError, jwt
 from typing import Any, Optional
-from sqlalchemy import select, delete
-from sqlalchemy.orm import selectinload
-from passlib.context import CryptContext
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from datetime import datetime, timedelta, timezone
 
 from database.db import get_db
+from core.cache import TTLCache
+from core.invalidation import cache_invalidation
 from core.config import settings
-from database.models.accounts import RefreshToken, User
+from core.metrics import timed
+from database.enums import UserGroupEnum
+from database.models.accounts import BaseToken, RefreshToken, User, UserGroup
+from security.hashing import pwd_context, hash_password, verify_password, password_hasher
+from security.jwt_keys import get_jwt_keys
+from security.token_store import StoredToken, token_store
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/api/v1/auth/login",
 )
 
 
-# PASSWORD UTILS
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+@dataclass(frozen=True, slots=True)
+class AccessClaims:
+    id: int
+    group: UserGroupEnum
+    token_version: int
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# user id -> current token_version, the only server-side state needed to authorize an access token;
+# revocations evict it in every worker through cache_invalidation
+token_versions = cache_invalidation.register(
+    "token_version", TTLCache(maxsize=settings.TOKEN_VERSION_CACHE_SIZE, ttl=settings.TOKEN_VERSION_CACHE_TTL)
+)
+# verified token -> payload, each entry expires together with the token's own "exp"
+decoded_tokens = TTLCache(maxsize=settings.JWT_CACHE_SIZE, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
 
 
 # JWT ACCESS TOKEN
@@ -34,43 +46,52 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    keys = get_jwt_keys()
+    if keys.signing_key is None:
+        raise RuntimeError("JWT_PRIVATE_KEY_FILE is required to issue tokens")
+    with timed("jwt"):
+        encoded_jwt = jwt.encode(to_encode, keys.signing_key, algorithm=keys.algorithm)
     return encoded_jwt
 
 
+def create_user_access_token(user_id: int, group: UserGroupEnum, token_version: int) -> str:
+    return create_access_token({"sub": str(user_id), "group": group.value, "ver": token_version})
+
+
 def decode_token(token: str) -> Optional[dict[str, Any]]:
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    payload = decoded_tokens.get(token)
+    if payload is not None:
         return payload
+
+    keys = get_jwt_keys()
+    try:
+        with timed("jwt"):
+            payload = jwt.decode(token, keys.verification_key, algorithms=[keys.algorithm])
     except JWTError:
         return None
 
+    # only tokens that passed verification are cached, so garbage can't evict real entries
+    ttl = payload["exp"] - time.time() if isinstance(payload.get("exp"), (int, float)) else None
+    if ttl is None or ttl > 0:
+        decoded_tokens.set(token, payload, ttl)
+    return payload
+
 
 # REFRESH / PASSWORD RESET TOKENS SYSTEM
-async def create_token(model: Type[RefreshToken], user_id: int, lifetime_hours: int, db: AsyncSession) -> str:
-    token_value = str(uuid.uuid4())
-    expires_at = datetime.now(timezone.utc) + timedelta(hours=lifetime_hours)
-    token_obj = model(user_id=user_id, token=token_value, expires_at=expires_at)
-    db.add(token_obj)
-    await db.commit()
-    return token_value
+async def create_token(model: Type[BaseToken], user_id: int, lifetime_hours: int, db: AsyncSession) -> str:
+    return await token_store.create(model, user_id, lifetime_hours, db)
 
 
-async def delete_token(model: Type[RefreshToken], token: str, db: AsyncSession) -> None:
-    await db.execute(delete(model).where(model.token == token))
-    await db.commit()
+async def delete_token(model: Type[BaseToken], token: str, db: AsyncSession) -> None:
+    await token_store.delete(model, token, db)
 
 
-async def verify_token(model: Type[RefreshToken], token: str, db: AsyncSession) -> Optional[RefreshToken]:
-    result = await db.execute(select(model).where(model.token == token))
-    token_obj = result.scalars().first()
-    if not token_obj or token_obj.expires_at.replace(tzinfo=timezone.utc) < datetime.now(timezone.utc):
-        return None
-    return token_obj
+async def verify_token(model: Type[BaseToken], token: str, db: AsyncSession) -> Optional[StoredToken]:
+    return await token_store.verify(model, token, db)
 
 
-async def create_token_pair(user_id: int, db: AsyncSession) -> dict:
-    access_token = create_access_token({"sub": str(user_id)})
+async def create_token_pair(user_id: int, group: UserGroupEnum, token_version: int, db: AsyncSession) -> dict:
+    access_token = create_user_access_token(user_id, group, token_version)
     refresh_token = await create_token(RefreshToken, user_id, settings.REFRESH_TOKEN_EXPIRE_HOURS, db)
     return {
         "access_token": access_token,
@@ -79,27 +100,76 @@ async def create_token_pair(user_id: int, db: AsyncSession) -> dict:
     }
 
 
+async def rotate_refresh_token(token: str, db: AsyncSession) -> Optional[dict]:
+    rotated = await token_store.rotate(token, settings.REFRESH_TOKEN_EXPIRE_HOURS, db)
+    if not rotated:
+        return None
+
+    result = await db.execute(
+        select(User.token_version, UserGroup.name).join(User.group).where(User.id == rotated.user_id)
+    )
+    user = result.one_or_none()
+    if not user:
+        return None
+    token_versions.set(rotated.user_id, user.token_version)
+    return {
+        "access_token": create_user_access_token(rotated.user_id, user.name, user.token_version),
+        "refresh_token": rotated.token,
+        "token_type": "bearer"
+    }
+
+
+async def revoke_token_family(token: str, db: AsyncSession) -> None:
+    await token_store.revoke_family(token, db)
+
+
+async def revoke_user_sessions(user: User, db: AsyncSession) -> None:
+    """Invalidate every access and refresh token issued to the user so far."""
+    user.token_version += 1
+    await db.commit()
+    await token_store.revoke_user(user.id, db)
+    await cache_invalidation.invalidate("token_version", user.id)
+    token_versions.set(user.id, user.token_version)
+
+
 # GET CURRENT USER FROM ACCESS TOKEN
-async def get_current_user(
+def _credentials_error(detail: str = "Invalid or expired token") -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+async def get_token_version(user_id: int, db: AsyncSession) -> Optional[int]:
+    version = token_versions.get(user_id)
+    if version is None:
+        result = await db.execute(select(User.token_version).where(User.id == user_id))
+        version = result.scalar_one_or_none()
+        if version is not None:
+            token_versions.set(user_id, version)
+    return version
+
+
+async def get_access_claims(
         token: str = Depends(oauth2_scheme),
         db: AsyncSession = Depends(get_db)
-) -> User:
+) -> AccessClaims:
+    """Authorize from the JWT claims alone; only the token version is checked server-side."""
     payload = decode_token(token)
-    if not payload or "sub" not in payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-        )
+    if not payload or not all(payload.get(claim) is not None for claim in ("sub", "group", "ver")):
+        raise _credentials_error()
 
-    user_id = int(payload.get("sub"))
-    result = await db.execute(
-        select(User)
-        .options(selectinload(User.group))
-        .where(User.id == user_id)
-    )
-    user = result.scalar_one_or_none()
+    try:
+        claims = AccessClaims(
+            id=int(payload["sub"]),
+            group=UserGroupEnum(payload["group"]),
+            token_version=payload["ver"],
+        )
+    except ValueError:
+        raise _credentials_error()
+    if claims.token_version != await get_token_version(claims.id, db):
+        raise _credentials_error("Token has been revoked")
+    return claims
 
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
 
-    return user
+def require_admin(claims: AccessClaims = Depends(get_access_claims)) -> AccessClaims:
+    if claims.group != UserGroupEnum.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return claims
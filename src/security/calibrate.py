@@ -0,0 +1,66 @@
+"""Pick the bcrypt cost that fits a latency budget on this host.
+
+Times a hash at increasing rounds and prints the highest cost whose median hash
+time stays within ``--target-ms`` (``PASSWORD_HASH_TARGET_MS`` by default). Put
+the result in ``.env`` as ``PASSWORD_HASH_ROUNDS``; existing hashes are upgraded
+on their owners' next login. Run from the ``src`` directory::
+
+    python -m security.calibrate --target-ms 250
+"""
+import argparse
+import statistics
+import time
+
+from passlib.hash import bcrypt
+
+from core.config import settings
+
+MIN_ROUNDS = 4
+MAX_ROUNDS = 31
+PASSWORD = "CalibrationPass123!"
+
+
+def measure_rounds(rounds: int, samples: int) -> float:
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.hash(PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_rounds(target_ms: float, samples: int = 3) -> tuple[int, dict[int, float]]:
+    measure_rounds(MIN_ROUNDS, 1)  # the first hash also loads the bcrypt backend
+    timings: dict[int, float] = {}
+    chosen = MIN_ROUNDS
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        timings[rounds] = measure_rounds(rounds, samples)
+        # each extra round doubles the cost, so the first one over budget is at most ~2x the target
+        if timings[rounds] > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target-ms", type=float, default=settings.PASSWORD_HASH_TARGET_MS)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    chosen, timings = calibrate_rounds(args.target_ms, args.samples)
+
+    print(f"{'rounds':<8}{'median ms':>12}")
+    for rounds, elapsed in timings.items():
+        marker = "  <- chosen" if rounds == chosen else ""
+        print(f"{rounds:<8}{elapsed:>12.1f}{marker}")
+
+    print(
+        f"\n✅ PASSWORD_HASH_ROUNDS={chosen} "
+        f"(target {args.target_ms:.0f} ms, current {settings.PASSWORD_HASH_ROUNDS})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import asyncio
+import multiprocessing
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from core.config import settings
+from core.metrics import timed
+
+# hashes made with any other cost are reported by needs_update() and upgraded on the next login
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS)
+
+
+# PASSWORD UTILS
+def hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+@lru_cache(maxsize=1)
+def get_dummy_hash() -> str:
+    """A real hash to verify against for unknown emails, so they cost as much as wrong passwords."""
+    return hash_password("dummy-password-for-timing")
+
+
+def warm_up() -> None:
+    """No-op submitted once per worker so the pool's processes start before the first login."""
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+# ASYNC HASHING SERVICE
+class PasswordHasher:
+    """Runs bcrypt in a bounded process pool so it never blocks the event loop."""
+
+    def __init__(self, max_workers: int, max_queue_size: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue_size
+
+    def start(self) -> None:
+        if self._executor is None and self.max_workers > 0:
+            # forking a process that already runs aiosqlite / anyio threads can deadlock on their locks;
+            # forkserver children are forked from a clean single-threaded server instead
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("forkserver")
+            )
+            # workers are otherwise started lazily by the first submits, i.e. by the first logins
+            for _ in range(self.max_workers):
+                self._executor.submit(warm_up)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(self, plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """Verify a password and, if its hash uses outdated parameters, return a fresh hash to store."""
+        return await self._submit(verify_and_update_password, plain_password, hashed_password)
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again later.",
+            )
+
+        self.start()
+        self.in_flight += 1
+        try:
+            # max_workers=0 falls back to the loop's default thread pool
+            with timed("bcrypt"):
+                return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.in_flight -= 1
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
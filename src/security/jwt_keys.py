@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from jose import jwk
+from jose.backends.base import Key
+
+from core.config import settings
+
+ASYMMETRIC_PREFIXES = ("RS", "ES")
+
+
+@dataclass(frozen=True, slots=True)
+class JWTKeys:
+    algorithm: str
+    signing_key: Optional[Key]
+    verification_key: Key
+
+    @property
+    def is_asymmetric(self) -> bool:
+        return self.algorithm.startswith(ASYMMETRIC_PREFIXES)
+
+    def public_jwks(self) -> dict[str, list[dict[str, Any]]]:
+        """Public keys in JWKS form, so other services can verify our tokens without the secret."""
+        if not self.is_asymmetric:
+            return {"keys": []}
+        return {"keys": [{**self.verification_key.to_dict(), "use": "sig"}]}
+
+
+def build_jwt_keys(
+        algorithm: str,
+        secret: str,
+        private_key_pem: Optional[str] = None,
+        public_key_pem: Optional[str] = None,
+) -> JWTKeys:
+    # jose parses a raw secret or PEM on every encode/decode call; constructing the key objects once avoids that
+    if not algorithm.startswith(ASYMMETRIC_PREFIXES):
+        key = jwk.construct(secret, algorithm)
+        return JWTKeys(algorithm=algorithm, signing_key=key, verification_key=key)
+
+    if not private_key_pem and not public_key_pem:
+        raise ValueError(f"{algorithm} requires JWT_PRIVATE_KEY_FILE or JWT_PUBLIC_KEY_FILE")
+
+    signing_key = jwk.construct(private_key_pem, algorithm) if private_key_pem else None
+    verification_key = (
+        jwk.construct(public_key_pem, algorithm) if public_key_pem else signing_key.public_key()
+    )
+    return JWTKeys(algorithm=algorithm, signing_key=signing_key, verification_key=verification_key)
+
+
+@lru_cache(maxsize=1)
+def get_jwt_keys() -> JWTKeys:
+    def read(path: Optional[str]) -> Optional[str]:
+        return Path(path).read_text() if path else None
+
+    return build_jwt_keys(
+        settings.ALGORITHM,
+        settings.SECRET_KEY,
+        private_key_pem=read(settings.JWT_PRIVATE_KEY_FILE),
+        public_key_pem=read(settings.JWT_PUBLIC_KEY_FILE),
+    )
@@ -0,0 +1,106 @@
+import math
+import time
+from abc import ABC, abstractmethod
+
+from fastapi import HTTPException, status
+
+from core.config import settings
+
+
+class RateLimitBackend(ABC):
+    """Fixed-window counters that the sliding-window estimate is built from."""
+
+    @abstractmethod
+    async def hit(self, key: str, window: int, window_seconds: int) -> tuple[int, int]:
+        """Count a hit in ``window`` and return the counts of that window and the one before it."""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, purge_every: int = 1000) -> None:
+        # key -> [window, count in that window, count in the window before]
+        self._counters: dict[str, list[int]] = {}
+        self._purge_every = purge_every
+        self._hits = 0
+
+    async def hit(self, key: str, window: int, window_seconds: int) -> tuple[int, int]:
+        counter = self._counters.get(key)
+        if counter is None or counter[0] < window - 1:
+            counter = self._counters[key] = [window, 0, 0]
+        elif counter[0] == window - 1:
+            counter[:] = [window, 0, counter[1]]
+
+        counter[1] += 1
+        self._hits += 1
+        if self._hits % self._purge_every == 0:
+            self._purge_stale(window)
+        return counter[1], counter[2]
+
+    def _purge_stale(self, window: int) -> None:
+        for key in [key for key, counter in self._counters.items() if counter[0] < window - 1]:
+            del self._counters[key]
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    def __init__(self, url: str, prefix: str = "throttle") -> None:
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    async def hit(self, key: str, window: int, window_seconds: int) -> tuple[int, int]:
+        current_key = f"{self.prefix}:{key}:{window}"
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.incr(current_key)
+            pipe.expire(current_key, window_seconds * 2)
+            pipe.get(f"{self.prefix}:{key}:{window - 1}")
+            current, _, previous = await pipe.execute()
+        return int(current), int(previous or 0)
+
+
+class LoginThrottle:
+    """Sliding-window limit on login attempts per client IP and per email."""
+
+    def __init__(self, backend: RateLimitBackend, ip_limit: int, email_limit: int, window_seconds: int) -> None:
+        self.backend = backend
+        self.ip_limit = ip_limit
+        self.email_limit = email_limit
+        self.window_seconds = window_seconds
+        self.rejected = 0
+
+    async def check(self, ip: str, email: str) -> None:
+        await self._hit(f"ip:{ip}", self.ip_limit)
+        await self._hit(f"email:{email.strip().lower()}", self.email_limit)
+
+    async def _hit(self, key: str, limit: int) -> None:
+        now = time.time()
+        window, offset = divmod(now, self.window_seconds)
+        current, previous = await self.backend.hit(key, int(window), self.window_seconds)
+
+        # weight the previous window by how much of it still overlaps the sliding window
+        estimated = previous * (1 - offset / self.window_seconds) + current
+        if estimated > limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts. Try again later.",
+                headers={"Retry-After": str(math.ceil(self.window_seconds - offset))},
+            )
+
+
+def build_login_throttle(backend: str) -> LoginThrottle:
+    if backend == "memory":
+        rate_limit_backend = InMemoryRateLimitBackend()
+    elif backend == "redis":
+        rate_limit_backend = RedisRateLimitBackend(settings.REDIS_URL)
+    else:
+        raise ValueError(f"Unknown LOGIN_THROTTLE_BACKEND: {backend!r}")
+
+    return LoginThrottle(
+        rate_limit_backend,
+        ip_limit=settings.LOGIN_RATE_LIMIT_PER_IP,
+        email_limit=settings.LOGIN_RATE_LIMIT_PER_EMAIL,
+        window_seconds=settings.LOGIN_RATE_LIMIT_WINDOW,
+    )
+
+
+login_throttle = build_login_throttle(settings.LOGIN_THROTTLE_BACKEND)
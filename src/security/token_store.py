@@ -0,0 +1,305 @@
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional, Type
+from sqlalchemy import select, delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from database.models.accounts import BaseToken, RefreshToken
+
+
+@dataclass(frozen=True, slots=True)
+class StoredToken:
+    token: str
+    user_id: int
+    family_id: Optional[str] = None
+
+
+class TokenStore(ABC):
+    """Storage for opaque refresh and password reset tokens."""
+
+    @abstractmethod
+    async def create(
+            self, model: Type[BaseToken], user_id: int, lifetime_hours: int, db: AsyncSession,
+            family_id: Optional[str] = None,
+    ) -> str:
+        ...
+
+    @abstractmethod
+    async def verify(self, model: Type[BaseToken], token: str, db: AsyncSession) -> Optional[StoredToken]:
+        ...
+
+    @abstractmethod
+    async def delete(self, model: Type[BaseToken], token: str, db: AsyncSession) -> None:
+        ...
+
+    @abstractmethod
+    async def rotate(self, token: str, lifetime_hours: int, db: AsyncSession) -> Optional[StoredToken]:
+        """Swap a refresh token for a new one of the same family; replaying a rotated token revokes the family."""
+
+    @abstractmethod
+    async def revoke_family(self, token: str, db: AsyncSession) -> None:
+        ...
+
+    @abstractmethod
+    async def revoke_user(self, user_id: int, db: AsyncSession) -> None:
+        """Revoke every refresh token of the user."""
+
+
+# SQL BACKEND
+class SQLTokenStore(TokenStore):
+    async def create(
+            self, model: Type[BaseToken], user_id: int, lifetime_hours: int, db: AsyncSession,
+            family_id: Optional[str] = None,
+    ) -> str:
+        token = self._add(model, user_id, lifetime_hours, db, family_id)
+        await db.commit()
+        return token.token
+
+    async def verify(self, model: Type[BaseToken], token: str, db: AsyncSession) -> Optional[StoredToken]:
+        result = await db.execute(select(model).where(model.token == token))
+        token_obj = result.scalars().first()
+        if not token_obj or token_obj.expires_at.replace(tzinfo=timezone.utc) < datetime.now(timezone.utc):
+            return None
+        if model is RefreshToken and token_obj.rotated_at is not None:
+            return None
+        return StoredToken(
+            token=token_obj.token, user_id=token_obj.user_id, family_id=getattr(token_obj, "family_id", None)
+        )
+
+    async def delete(self, model: Type[BaseToken], token: str, db: AsyncSession) -> None:
+        await db.execute(delete(model).where(model.token == token))
+        await db.commit()
+
+    async def rotate(self, token: str, lifetime_hours: int, db: AsyncSession) -> Optional[StoredToken]:
+        now = datetime.now(timezone.utc)
+        # claim the token in one statement, so only one of two concurrent refreshes can win
+        result = await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.token == token, RefreshToken.rotated_at.is_(None), RefreshToken.expires_at > now)
+            .values(rotated_at=now)
+            .returning(RefreshToken.user_id, RefreshToken.family_id)
+        )
+        claimed = result.one_or_none()
+
+        if not claimed:
+            # a token that was already rotated is being replayed: revoke every token of its family
+            await db.execute(
+                delete(RefreshToken).where(
+                    RefreshToken.family_id == self._family_of(token),
+                    select(RefreshToken.id).where(
+                        RefreshToken.token == token, RefreshToken.rotated_at.is_not(None)
+                    ).exists(),
+                )
+            )
+            await db.commit()
+            return None
+
+        new_token = self._add(RefreshToken, claimed.user_id, lifetime_hours, db, claimed.family_id)
+        await db.commit()
+        return StoredToken(token=new_token.token, user_id=claimed.user_id, family_id=claimed.family_id)
+
+    async def revoke_family(self, token: str, db: AsyncSession) -> None:
+        await db.execute(delete(RefreshToken).where(RefreshToken.family_id == self._family_of(token)))
+        await db.commit()
+
+    async def revoke_user(self, user_id: int, db: AsyncSession) -> None:
+        await db.execute(delete(RefreshToken).where(RefreshToken.user_id == user_id))
+        await db.commit()
+
+    @staticmethod
+    def _add(
+            model: Type[BaseToken], user_id: int, lifetime_hours: int, db: AsyncSession, family_id: Optional[str]
+    ) -> BaseToken:
+        fields = {"family_id": family_id or str(uuid.uuid4())} if model is RefreshToken else {}
+        token_obj = model(
+            user_id=user_id,
+            token=str(uuid.uuid4()),
+            expires_at=datetime.now(timezone.utc) + timedelta(hours=lifetime_hours),
+            **fields,
+        )
+        db.add(token_obj)
+        return token_obj
+
+    @staticmethod
+    def _family_of(token: str) -> Any:
+        return select(RefreshToken.family_id).where(RefreshToken.token == token).scalar_subquery()
+
+
+# KEY-VALUE BACKENDS
+class KeyValueBackend(ABC):
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        ...
+
+    @abstractmethod
+    async def pop(self, key: str) -> Optional[str]:
+        """Atomically read and delete a key."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+
+class InMemoryBackend(KeyValueBackend):
+    """Process-local stand-in for Redis, with the same lazy TTL semantics."""
+
+    def __init__(self, purge_every: int = 1000) -> None:
+        self._data: dict[str, tuple[float, str]] = {}
+        self._purge_every = purge_every
+        self._writes = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._writes += 1
+        if self._writes % self._purge_every == 0:
+            self._purge_expired()
+
+    async def pop(self, key: str) -> Optional[str]:
+        value = await self.get(key)
+        self._data.pop(key, None)
+        return value
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        for key in [key for key, (expires_at, _) in self._data.items() if expires_at <= now]:
+            del self._data[key]
+
+
+class RedisBackend(KeyValueBackend):
+    def __init__(self, url: str) -> None:
+        from redis.asyncio import Redis
+
+        self._redis = Redis.from_url(url, decode_responses=True)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self._redis.set(key, value, ex=ttl)
+
+    async def pop(self, key: str) -> Optional[str]:
+        return await self._redis.getdel(key)
+
+    async def delete(self, key: str) -> None:
+        await self._redis.delete(key)
+
+
+class KeyValueTokenStore(TokenStore):
+    """Keeps tokens in a key-value backend and lets its TTL expire them, so no sweeps are needed."""
+
+    def __init__(self, backend: KeyValueBackend, prefix: str = "tokens") -> None:
+        self.backend = backend
+        self.prefix = prefix
+
+    async def create(
+            self, model: Type[BaseToken], user_id: int, lifetime_hours: int, db: AsyncSession,
+            family_id: Optional[str] = None,
+    ) -> str:
+        token = str(uuid.uuid4())
+        payload = {"user_id": user_id, "issued_at": time.time()}
+        if model is RefreshToken:
+            payload["family_id"] = family_id or str(uuid.uuid4())
+        await self.backend.set(self._key(model, token), json.dumps(payload), lifetime_hours * 3600)
+        return token
+
+    async def verify(self, model: Type[BaseToken], token: str, db: AsyncSession) -> Optional[StoredToken]:
+        value = await self.backend.get(self._key(model, token))
+        if value is None:
+            return None
+        stored = self._load(token, value)
+        if await self._is_revoked(stored, json.loads(value)["issued_at"]):
+            return None
+        return stored
+
+    async def delete(self, model: Type[BaseToken], token: str, db: AsyncSession) -> None:
+        await self.backend.delete(self._key(model, token))
+
+    async def rotate(self, token: str, lifetime_hours: int, db: AsyncSession) -> Optional[StoredToken]:
+        ttl = lifetime_hours * 3600
+        value = await self.backend.pop(self._key(RefreshToken, token))
+
+        if value is None:
+            # a token that was already rotated is being replayed: revoke every token of its family
+            family_id = await self.backend.get(self._rotated_key(token))
+            if family_id:
+                await self.backend.set(self._revoked_family_key(family_id), "1", ttl)
+            return None
+
+        stored = self._load(token, value)
+        if await self._is_revoked(stored, json.loads(value)["issued_at"]):
+            return None
+
+        await self.backend.set(self._rotated_key(token), stored.family_id, ttl)
+        new_token = await self.create(RefreshToken, stored.user_id, lifetime_hours, db, family_id=stored.family_id)
+        return StoredToken(token=new_token, user_id=stored.user_id, family_id=stored.family_id)
+
+    async def revoke_family(self, token: str, db: AsyncSession) -> None:
+        value = await self.backend.pop(self._key(RefreshToken, token))
+        family_id = self._load(token, value).family_id if value else await self.backend.get(self._rotated_key(token))
+        if family_id:
+            await self.backend.set(
+                self._revoked_family_key(family_id), "1", settings.REFRESH_TOKEN_EXPIRE_HOURS * 3600
+            )
+
+    async def revoke_user(self, user_id: int, db: AsyncSession) -> None:
+        # tokens can't be listed by user in a plain key-value store, so remember when the user was revoked
+        await self.backend.set(
+            self._revoked_user_key(user_id), str(time.time()), settings.REFRESH_TOKEN_EXPIRE_HOURS * 3600
+        )
+
+    async def _is_revoked(self, stored: StoredToken, issued_at: float) -> bool:
+        if stored.family_id and await self.backend.get(self._revoked_family_key(stored.family_id)):
+            return True
+        revoked_at = await self.backend.get(self._revoked_user_key(stored.user_id))
+        return revoked_at is not None and issued_at <= float(revoked_at)
+
+    def _key(self, model: Type[BaseToken], token: str) -> str:
+        return f"{self.prefix}:{model.__tablename__}:{token}"
+
+    def _rotated_key(self, token: str) -> str:
+        return f"{self.prefix}:{RefreshToken.__tablename__}:rotated:{token}"
+
+    def _revoked_family_key(self, family_id: str) -> str:
+        return f"{self.prefix}:{RefreshToken.__tablename__}:revoked-family:{family_id}"
+
+    def _revoked_user_key(self, user_id: int) -> str:
+        return f"{self.prefix}:revoked-user:{user_id}"
+
+    @staticmethod
+    def _load(token: str, value: str) -> StoredToken:
+        payload = json.loads(value)
+        return StoredToken(token=token, user_id=payload["user_id"], family_id=payload.get("family_id"))
+
+
+def build_token_store(backend: str) -> TokenStore:
+    if backend == "sql":
+        return SQLTokenStore()
+    if backend == "memory":
+        return KeyValueTokenStore(InMemoryBackend())
+    if backend == "redis":
+        return KeyValueTokenStore(RedisBackend(settings.REDIS_URL))
+    raise ValueError(f"Unknown TOKEN_STORE_BACKEND: {backend!r}")
+
+
+token_store = build_token_store(settings.TOKEN_STORE_BACKEND)
@@ -1,28 +1,188 @@
+import time
+import asyncio
+import weakref
 import aiosmtplib
+from typing import Optional
+from email.message import Message
 from email.mime.text import MIMEText
 
 from core.config import settings
+from core.metrics import timed
 
 
-async def send_email(user_email: str, subject: str, body: str) -> None:
-    msg = MIMEText(body)
-    msg["From"] = settings.EMAIL_HOST_USER
-    msg["To"] = user_email
-    msg["Subject"] = subject
+def is_refusal(error: BaseException) -> bool:
+    """The server turned this message down but the session is still usable: aiosmtplib sends RSET
+    after an error reply, and invalid addresses are rejected before anything is sent."""
+    if isinstance(error, (aiosmtplib.SMTPRecipientsRefused, ValueError)):
+        return True
+    # 421 means the server is closing the channel
+    return isinstance(error, aiosmtplib.SMTPResponseException) and error.code != 421
 
-    try:
-        await aiosmtplib.send(
-            msg,
+
+class SMTPConnectionPool:
+    """Keeps authenticated SMTP connections open and reuses them across messages."""
+
+    def __init__(
+            self,
+            hostname: str,
+            port: int,
+            username: Optional[str] = None,
+            password: Optional[str] = None,
+            start_tls: Optional[bool] = None,
+            max_connections: int = 5,
+            idle_timeout: float = 60,
+            timeout: float = 10,
+    ) -> None:
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+
+        self.sent = 0
+        self.failed = 0
+        self.connections_opened = 0
+        self._first_send_at: Optional[float] = None
+        self._idle: list[tuple[aiosmtplib.SMTP, float]] = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    @property
+    def messages_per_second(self) -> float:
+        if self._first_send_at is None:
+            return 0.0
+        elapsed = time.perf_counter() - self._first_send_at
+        return self.sent / elapsed if elapsed > 0 else 0.0
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "connections_opened": self.connections_opened,
+            "idle_connections": len(self._idle),
+            "messages_per_second": round(self.messages_per_second, 2),
+        }
+
+    async def send_message(self, message: Message) -> None:
+        async with self._slots:
+            if self._first_send_at is None:
+                self._first_send_at = time.perf_counter()
+            # timed once a slot is held, so the metric is SMTP latency rather than queueing for the pool
+            with timed("smtp"):
+                await self._send_message(message)
+
+    async def _send_message(self, message: Message) -> None:
+        client = None
+        try:
+            client = await self._acquire()
+            try:
+                await client.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                # The server dropped a connection we thought was alive, retry once on a fresh one
+                client.close()
+                client = await self._connect()
+                await client.send_message(message)
+        except Exception as exc:
+            self.failed += 1
+            if client is not None:
+                if is_refusal(exc) and client.is_connected:
+                    # one bad address must not cost the next message a reconnect
+                    self._idle.append((client, time.monotonic()))
+                else:
+                    client.close()
+            raise
+
+        self.sent += 1
+        self._idle.append((client, time.monotonic()))
+
+    async def send_many(self, messages: list[Message]) -> list[Optional[BaseException]]:
+        results = await asyncio.gather(*(self.send_message(msg) for msg in messages), return_exceptions=True)
+        return [result if isinstance(result, BaseException) else None for result in results]
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for client, _ in idle:
+            await self._quit(client)
+
+    async def _acquire(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            client, last_used = self._idle.pop()
+            if client.is_connected and time.monotonic() - last_used < self.idle_timeout:
+                return client
+            await self._quit(client)
+        return await self._connect()
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await client.connect()
+        self.connections_opened += 1
+        return client
+
+    @staticmethod
+    async def _quit(client: aiosmtplib.SMTP) -> None:
+        if not client.is_connected:
+            return
+        try:
+            await client.quit()
+        except aiosmtplib.SMTPException:
+            client.close()
+
+
+# Connections belong to the event loop that opened them, so keep one pool per loop
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, SMTPConnectionPool]" = weakref.WeakKeyDictionary()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = SMTPConnectionPool(
             hostname=settings.EMAIL_HOST,
             port=settings.EMAIL_PORT,
             username=settings.EMAIL_HOST_USER,
             password=settings.EMAIL_HOST_PASSWORD,
             start_tls=settings.EMAIL_USE_TLS,
-            timeout=10,
+            max_connections=settings.EMAIL_POOL_SIZE,
+            idle_timeout=settings.EMAIL_POOL_IDLE_TIMEOUT,
+            timeout=settings.EMAIL_TIMEOUT,
         )
+        _pools[loop] = pool
+    return pool
+
+
+def build_message(user_email: str, subject: str, body: str) -> MIMEText:
+    msg = MIMEText(body)
+    msg["From"] = settings.EMAIL_HOST_USER
+    msg["To"] = user_email
+    msg["Subject"] = subject
+    return msg
+
+
+async def send_email(user_email: str, subject: str, body: str) -> None:
+    msg = build_message(user_email, subject, body)
+
+    try:
+        await get_smtp_pool().send_message(msg)
         print(f"📨 Email sent successfully to {user_email}")
     except Exception as e:
         print(f"❌ Failed to send email: {e}")
+        raise
+
+
+async def send_emails(messages: list[tuple[str, str, str]]) -> list[Optional[BaseException]]:
+    pool = get_smtp_pool()
+    errors = await pool.send_many([build_message(*message) for message in messages])
+    print(f"📨 Sent {errors.count(None)}/{len(messages)} emails ({pool.messages_per_second:.1f} msg/s)")
+    return errors
 
 
 async def send_activation_email(user_email: str, token: str) -> None:
@@ -0,0 +1,23 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.enums import UserGroupEnum
+from database.models.accounts import UserGroup
+
+# Group rows are seeded once and never change, so the id is resolved once per process
+_default_group_id: Optional[int] = None
+
+
+async def get_default_group_id(db: AsyncSession) -> Optional[int]:
+    global _default_group_id
+    if _default_group_id is None:
+        result = await db.execute(select(UserGroup.id).where(UserGroup.name == UserGroupEnum.USER))
+        _default_group_id = result.scalar_one_or_none()
+    return _default_group_id
+
+
+def forget_default_group_id() -> None:
+    """Drops the cached id, e.g. after the groups were reseeded and inserts fail the foreign key."""
+    global _default_group_id
+    _default_group_id = None
@@ -0,0 +1,161 @@
+import os
+import json
+import asyncio
+import hashlib
+from pathlib import Path
+from dataclasses import dataclass
+from collections.abc import Callable
+
+from core.config import HLSRendition, settings
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# ffmpeg is asked for peak bitrate this much above the average, and the playlist advertises the peak
+MAXRATE_FACTOR = 1.07
+
+
+class PackagingError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class SourceInfo:
+    duration: float
+    width: int
+    height: int
+
+
+def hls_root() -> Path:
+    return Path(settings.MEDIA_ROOT) / "hls"
+
+
+def objects_dir() -> Path:
+    return hls_root() / "objects"
+
+
+def work_dir(ingest_id: int, rendition: str) -> Path:
+    return hls_root() / "work" / str(ingest_id) / rendition
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def probe_source(source: Path) -> SourceInfo:
+    process = await asyncio.create_subprocess_exec(
+        settings.FFPROBE_BINARY, "-v", "error", "-select_streams", "v:0",
+        "-show_entries", "stream=width,height:format=duration", "-of", "json", str(source),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise PackagingError(f"ffprobe failed: {stderr.decode(errors='replace').strip()[-500:]}")
+    data = json.loads(stdout)
+    if not data.get("streams"):
+        raise PackagingError("Source has no video stream")
+    stream = data["streams"][0]
+    return SourceInfo(float(data["format"]["duration"]), int(stream["width"]), int(stream["height"]))
+
+
+def select_renditions(source: SourceInfo) -> list[HLSRendition]:
+    """The configured ladder without the rungs that would upscale; the smallest one is always kept."""
+    renditions = [rendition for rendition in settings.HLS_RENDITIONS if rendition.height <= source.height]
+    return renditions or [min(settings.HLS_RENDITIONS, key=lambda rendition: rendition.height)]
+
+
+def scaled_width(source: SourceInfo, height: int) -> int:
+    # keep the aspect ratio, rounded to the even width x264 requires
+    return max(2, round(source.width * height / source.height / 2) * 2)
+
+
+def bandwidth(rendition: HLSRendition) -> int:
+    return int((rendition.video_bitrate * MAXRATE_FACTOR + rendition.audio_bitrate) * 1000)
+
+
+def ffmpeg_command(source: Path, info: SourceInfo, rendition: HLSRendition, output_dir: Path) -> list[str]:
+    segment = settings.HLS_SEGMENT_SECONDS
+    return [
+        settings.FFMPEG_BINARY, "-hide_banner", "-nostdin", "-nostats", "-loglevel", "error", "-y",
+        "-i", str(source),
+        "-map", "0:v:0", "-map", "0:a:0?",
+        "-vf", f"scale={scaled_width(info, rendition.height)}:{rendition.height}",
+        "-c:v", "libx264", "-preset", "veryfast", "-profile:v", "main",
+        "-b:v", f"{rendition.video_bitrate}k",
+        "-maxrate", f"{int(rendition.video_bitrate * MAXRATE_FACTOR)}k",
+        "-bufsize", f"{rendition.video_bitrate * 3 // 2}k",
+        # a keyframe at every segment boundary, so all renditions split at the same timestamps
+        "-force_key_frames", f"expr:gte(t,n_forced*{segment})", "-sc_threshold", "0",
+        "-c:a", "aac", "-b:a", f"{rendition.audio_bitrate}k", "-ac", "2",
+        "-threads", str(settings.HLS_FFMPEG_THREADS),
+        "-f", "hls", "-hls_time", str(segment), "-hls_playlist_type", "vod",
+        "-hls_flags", "independent_segments",
+        "-hls_segment_filename", str(output_dir / "segment_%05d.ts"),
+        "-progress", "pipe:1",
+        str(output_dir / "index.m3u8"),
+    ]
+
+
+async def run_ffmpeg(command: list[str], duration: float, on_progress: Callable[[float], None]) -> None:
+    """Runs ffmpeg, turning its ``-progress`` output into completed fractions of ``duration``."""
+    process = await asyncio.create_subprocess_exec(
+        *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    # drained concurrently, so a chatty stderr cannot fill its pipe and stall ffmpeg
+    stderr = asyncio.ensure_future(process.stderr.read())
+    try:
+        async for line in process.stdout:
+            key, _, value = line.decode(errors="replace").strip().partition("=")
+            if key == "out_time_us" and value.isdigit() and duration > 0:
+                on_progress(min(int(value) / 1_000_000 / duration, 1.0))
+        returncode = await process.wait()
+    except BaseException:
+        # cancelled because a sibling rendition failed, or the worker is shutting down
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    finally:
+        errors = await stderr
+    if returncode != 0:
+        raise PackagingError(f"ffmpeg exited with {returncode}: {errors.decode(errors='replace').strip()[-500:]}")
+
+
+def store_object(path: Path) -> str:
+    """Moves a file into content-addressed storage and returns its path relative to ``objects_dir()``.
+
+    Objects are named by their SHA-256, so an identical segment is stored once, a re-run after a
+    crash overwrites nothing, and the files can be cached forever.
+    """
+    digest = file_sha256(path)
+    relative = f"{digest[:2]}/{digest}{path.suffix}"
+    target = objects_dir() / relative
+    if target.exists():
+        path.unlink()
+    else:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, target)
+    return relative
+
+
+def publish_rendition(output_dir: Path) -> tuple[str, int]:
+    """Stores the segments ffmpeg wrote and returns the playlist rewritten to their object URLs."""
+    base_url = settings.HLS_SEGMENT_URL.rstrip("/")
+    lines, segments = [], 0
+    for line in (output_dir / "index.m3u8").read_text().splitlines():
+        if line and not line.startswith("#"):
+            line = f"{base_url}/{store_object(output_dir / Path(line).name)}"
+            segments += 1
+        lines.append(line)
+    return "\n".join(lines) + "\n", segments
+
+
+def master_playlist(renditions: list[tuple[str, int, int, int]]) -> str:
+    """Builds the master playlist from (name, width, height, bandwidth), highest bandwidth first."""
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3", "#EXT-X-INDEPENDENT-SEGMENTS"]
+    for name, width, height, peak in sorted(renditions, key=lambda rendition: rendition[3], reverse=True):
+        lines.append(f"#EXT-X-STREAM-INF:BANDWIDTH={peak},RESOLUTION={width}x{height},NAME=\"{name}\"")
+        lines.append(f"{name}.m3u8")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,236 @@
+import re
+import sys
+import heapq
+import asyncio
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from typing import Any, Optional
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from database.models.movies import Movie
+
+NON_WORD = re.compile(r"[\W_]+")
+LAST_CHAR = "\U0010ffff"
+# a title is also found by its later words ("wars" -> "Star Wars"), up to this many word starts
+MAX_WORD_STARTS = 4
+# prefixes matching more keys than this get a cached top-k; narrower ranges are cheap enough to scan
+SCAN_LIMIT = 64
+
+
+def normalize(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return NON_WORD.sub(" ", stripped.casefold()).strip()
+
+
+def popularity(movie_id: int, votes: int) -> int:
+    # more votes first, then the older (lower) id
+    return (votes << 32) - movie_id
+
+
+def title_keys(name: str) -> set[str]:
+    words = normalize(name).split()
+    return {" ".join(words[start:]) for start in range(min(len(words), MAX_WORD_STARTS))}
+
+
+class SuggestionIndex:
+    """Typeahead over movie titles: a sorted array of normalized title keys with a parallel id array.
+
+    A prefix maps to the range of keys starting with it. Every prefix whose range holds more than
+    ``SCAN_LIMIT`` keys has its top-k (by votes) cached, computed bottom-up from its one-character-longer
+    children, so a lookup is a dict hit or a scan of at most ``SCAN_LIMIT`` keys, and a change only
+    recomputes the prefixes of the keys it touched. Everything runs on the event loop thread.
+    """
+
+    def __init__(self, top_k: int) -> None:
+        self.top_k = top_k
+        self.keys: list[str] = []
+        self.ids = array("q")
+        # movie id -> (name, year, votes), and -> a sortable int so ranking needs no Python-level key function
+        self.movies: dict[int, tuple[str, int, int]] = {}
+        self.rank: dict[int, int] = {}
+        self.top: dict[str, list[int]] = {}
+        self.size_bytes = 0
+        self.building = False
+        self.pending: list[tuple[int, Optional[tuple[str, int, int]]]] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def build(cls, rows: Iterable[tuple[int, str, int, int]], top_k: int) -> "SuggestionIndex":
+        index = cls(top_k)
+        entries = []
+        for movie_id, name, year, votes in rows:
+            index.movies[movie_id] = (name, year, votes)
+            index.rank[movie_id] = popularity(movie_id, votes)
+            entries.extend((key, movie_id) for key in title_keys(name))
+        entries.sort()
+        index.keys = [key for key, _ in entries]
+        index.ids = array("q", (movie_id for _, movie_id in entries))
+        index.children_top("", 0, len(index.keys))
+        index.size_bytes = index.measure()
+        return index
+
+    def measure(self) -> int:
+        return (
+            sys.getsizeof(self.keys) + sum(sys.getsizeof(key) for key in self.keys)
+            + sys.getsizeof(self.ids)
+            + sys.getsizeof(self.movies) + sum(sys.getsizeof(movie) for movie in self.movies.values())
+            + sys.getsizeof(self.rank) + sum(sys.getsizeof(rank) for rank in self.rank.values())
+            + sys.getsizeof(self.top) + sum(sys.getsizeof(key) + sys.getsizeof(ids) for key, ids in self.top.items())
+        )
+
+    def key_range(self, prefix: str) -> tuple[int, int]:
+        start = bisect_left(self.keys, prefix)
+        return start, bisect_left(self.keys, prefix + LAST_CHAR, start)
+
+    def range_top(self, prefix: str, start: int, end: int) -> list[int]:
+        if prefix in self.top:
+            return self.top[prefix]
+        if end - start <= SCAN_LIMIT:
+            return heapq.nlargest(self.top_k, set(self.ids[start:end]), key=self.rank.__getitem__)
+        top = self.top[prefix] = self.children_top(prefix, start, end)
+        return top
+
+    def children_top(self, prefix: str, start: int, end: int) -> list[int]:
+        candidates, depth, position = set(), len(prefix), start
+        while position < end and len(self.keys[position]) == depth:
+            candidates.add(self.ids[position])
+            position += 1
+        while position < end:
+            child = self.keys[position][:depth + 1]
+            child_end = bisect_left(self.keys, child + LAST_CHAR, position, end)
+            candidates.update(self.range_top(child, position, child_end))
+            position = child_end
+        return heapq.nlargest(self.top_k, candidates, key=self.rank.__getitem__)
+
+    def lookup(self, query: str, limit: int) -> list[tuple[int, str, int]]:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        movie_ids = self.top.get(prefix)
+        if movie_ids is None:
+            movie_ids = self.range_top(prefix, *self.key_range(prefix))
+        return [(movie_id, *self.movies[movie_id][:2]) for movie_id in movie_ids[:limit]]
+
+    def upsert(self, movie_id: int, name: str, year: int, votes: int) -> None:
+        previous = self.unlink(movie_id)
+        self.movies[movie_id] = (name, year, votes)
+        self.rank[movie_id] = popularity(movie_id, votes)
+        for key in title_keys(name):
+            position = bisect_right(self.keys, key)
+            self.keys.insert(position, key)
+            self.ids.insert(position, movie_id)
+            self.size_bytes += sys.getsizeof(key) + self.ids.itemsize
+        self.refresh_top(title_keys(name) | (title_keys(previous[0]) if previous else set()))
+
+    def remove(self, movie_id: int) -> None:
+        previous = self.unlink(movie_id)
+        if previous:
+            self.refresh_top(title_keys(previous[0]))
+
+    def unlink(self, movie_id: int) -> Optional[tuple[str, int, int]]:
+        movie = self.movies.pop(movie_id, None)
+        if movie is None:
+            return None
+        for key in title_keys(movie[0]):
+            start, end = bisect_left(self.keys, key), bisect_right(self.keys, key)
+            for position in range(start, end):
+                if self.ids[position] == movie_id:
+                    del self.keys[position]
+                    del self.ids[position]
+                    self.size_bytes -= sys.getsizeof(key) + self.ids.itemsize
+                    break
+        del self.rank[movie_id]
+        return movie
+
+    def refresh_top(self, keys: set[str]) -> None:
+        prefixes = {key[:length] for key in keys for length in range(1, len(key) + 1)}
+        # longest first, so every prefix is rebuilt from children that are already up to date
+        for prefix in sorted(prefixes, key=len, reverse=True):
+            self.top.pop(prefix, None)
+            start, end = self.key_range(prefix)
+            if end - start > SCAN_LIMIT:
+                self.range_top(prefix, start, end)
+
+    def apply(self, changes: dict[int, Optional[tuple[str, int, int]]]) -> None:
+        for movie_id, movie in changes.items():
+            if self.building:
+                # replayed on the index being built, which may have read the rows before this commit
+                self.pending.append((movie_id, movie))
+            if movie is None:
+                self.remove(movie_id)
+            else:
+                self.upsert(movie_id, *movie)
+
+    def replace(self, other: "SuggestionIndex") -> None:
+        self.keys, self.ids, self.movies = other.keys, other.ids, other.movies
+        self.rank, self.top, self.size_bytes = other.rank, other.top, other.size_bytes
+
+    def stats(self) -> dict[str, int]:
+        return {"movies": len(self.movies), "keys": len(self.keys), "bytes": self.size_bytes}
+
+
+suggestion_index = SuggestionIndex(settings.SUGGEST_TOP_K)
+
+
+async def rebuild_suggestion_index(db: AsyncSession) -> None:
+    suggestion_index.building = True
+    suggestion_index.pending = []
+    try:
+        result = await db.execute(select(Movie.id, Movie.name, Movie.year, Movie.votes))
+        rows = result.tuples().all()
+        fresh = await asyncio.to_thread(SuggestionIndex.build, rows, suggestion_index.top_k)
+        for movie_id, movie in suggestion_index.pending:
+            if movie is None:
+                fresh.remove(movie_id)
+            else:
+                fresh.upsert(movie_id, *movie)
+        suggestion_index.replace(fresh)
+    finally:
+        suggestion_index.building = False
+        suggestion_index.pending = []
+    print(f"🔤 Suggestion index built: {len(rows)} movies, {suggestion_index.size_bytes / 2 ** 20:.1f} MiB")
+
+
+async def refresh_suggestion_index_periodically(session_factory: Any) -> None:
+    """Picks up catalog changes made by other workers, bulk loads and raw SQL."""
+    while True:
+        await asyncio.sleep(settings.SUGGEST_REFRESH_INTERVAL)
+        try:
+            async with session_factory() as db:
+                await rebuild_suggestion_index(db)
+        except Exception as exc:
+            print(f"❌ Suggestion index refresh failed: {exc}")
+
+
+# ORM writes in this process are applied as soon as they commit; rolled back changes are dropped
+def collect_movie_changes(session: Session, flush_context: Any) -> None:
+    changes = session.info.setdefault("movie_suggestions", {})
+    for movie in (*session.new, *session.dirty):
+        if isinstance(movie, Movie):
+            changes[movie.id] = (movie.name, movie.year, movie.votes)
+    for movie in session.deleted:
+        if isinstance(movie, Movie):
+            changes[movie.id] = None
+
+
+def apply_movie_changes(session: Session) -> None:
+    changes = session.info.pop("movie_suggestions", None)
+    if changes:
+        suggestion_index.apply(changes)
+
+
+def discard_movie_changes(session: Session) -> None:
+    session.info.pop("movie_suggestions", None)
+
+
+event.listen(Session, "after_flush", collect_movie_changes)
+event.listen(Session, "after_commit", apply_movie_changes)
+event.listen(Session, "after_rollback", discard_movie_changes)
@@ -1,23 +1,39 @@
+import time
 import asyncio
 from datetime import datetime, timezone
-from sqlalchemy import delete
+from sqlalchemy import delete, select
+from core.config import settings
 from database.db import SessionLocal
 from database.models.accounts import RefreshToken, PasswordResetToken
 from celery_app.auth import celery_app
+from tasks.runner import run_async
 
 
 @celery_app.task
-def cleanup_expired_tokens() -> None:
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    loop.run_until_complete(_cleanup_expired_tokens())
-    loop.close()
+def cleanup_expired_tokens() -> dict:
+    return run_async(_cleanup_expired_tokens())
 
 
-async def _cleanup_expired_tokens() -> None:
+async def _cleanup_expired_tokens() -> dict:
+    started = time.perf_counter()
     now = datetime.now(timezone.utc)
+    batch_size = settings.TOKEN_CLEANUP_BATCH_SIZE
+    deleted = {}
+
     async with SessionLocal() as db:
-        await db.execute(delete(RefreshToken).where(RefreshToken.expires_at < now))
-        await db.execute(delete(PasswordResetToken).where(PasswordResetToken.expires_at < now))
-        await db.commit()
-        print("✅ Expired tokens cleaned up.")
+        for model in (RefreshToken, PasswordResetToken):
+            deleted[model.__tablename__] = 0
+            while True:
+                # short transactions over the expires_at index, so logins never wait long for the write lock
+                expired_ids = select(model.id).where(model.expires_at < now).limit(batch_size)
+                result = await db.execute(delete(model).where(model.id.in_(expired_ids)))
+                await db.commit()
+
+                deleted[model.__tablename__] += result.rowcount
+                if result.rowcount < batch_size:
+                    break
+                await asyncio.sleep(settings.TOKEN_CLEANUP_BATCH_PAUSE)
+
+    duration = round(time.perf_counter() - started, 3)
+    print(f"✅ Expired tokens cleaned up: {deleted} in {duration}s.")
+    return {"deleted": deleted, "duration_seconds": duration}
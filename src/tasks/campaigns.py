@@ -0,0 +1,147 @@
+import time
+import asyncio
+from string import Template
+from typing import Callable, Optional
+from datetime import datetime, timezone
+from aiosmtplib import SMTPRecipientRefused, SMTPRecipientsRefused
+from sqlalchemy import select
+
+from core.config import settings
+from celery_app.auth import celery_app
+from tasks.runner import run_async
+from tasks.leases import LeaseHeldError, LeaseLostError, claim_lease, renew_lease
+from database.db import SessionLocal
+from database.enums import CampaignStatusEnum
+from database.models.accounts import User, UserProfile
+from database.models.campaigns import EmailCampaign
+from services.email import send_emails
+
+
+class CampaignDeliveryError(Exception):
+    """Emails still undelivered after CAMPAIGN_SEND_RETRIES, e.g. during an SMTP outage."""
+
+
+def is_refused(error: Optional[BaseException]) -> bool:
+    # a 5xx refusal of the recipient itself is final; anything else may succeed on a later attempt
+    if isinstance(error, SMTPRecipientRefused):
+        return error.code >= 500
+    if isinstance(error, SMTPRecipientsRefused):
+        return all(recipient.code >= 500 for recipient in error.recipients)
+    return False
+
+
+@celery_app.task(bind=True, acks_late=True, reject_on_worker_lost=True)
+def send_campaign(self: celery_app.Task, campaign_id: int) -> dict:
+    def report(progress: dict) -> None:
+        self.update_state(state="PROGRESS", meta=progress)
+
+    try:
+        return run_async(_send_campaign(campaign_id, report))
+    except LeaseHeldError as exc:
+        # a duplicate delivery: check back once the owner's lease could have run out
+        raise self.retry(exc=exc, countdown=settings.TASK_LEASE_SECONDS, max_retries=None)
+    except CampaignDeliveryError as exc:
+        countdown = min(settings.EMAIL_RETRY_BACKOFF * 2 ** self.request.retries, settings.EMAIL_RETRY_BACKOFF_MAX)
+        raise self.retry(exc=exc, countdown=countdown, max_retries=settings.EMAIL_MAX_RETRIES)
+
+
+async def send_batch(messages: list[tuple[str, str, str]]) -> list[Optional[BaseException]]:
+    """Sends a batch, resending undelivered messages with exponential backoff."""
+    errors = await send_emails(messages)
+    for attempt in range(settings.CAMPAIGN_SEND_RETRIES):
+        pending = [index for index, error in enumerate(errors) if error is not None and not is_refused(error)]
+        if not pending:
+            break
+        await asyncio.sleep(settings.CAMPAIGN_RETRY_BACKOFF * 2 ** attempt)
+        for index, error in zip(pending, await send_emails([messages[index] for index in pending])):
+            errors[index] = error
+    return errors
+
+
+async def _send_campaign(campaign_id: int, report: Optional[Callable[[dict], None]] = None) -> dict:
+    async with SessionLocal() as db:
+        lease = await claim_lease(db, EmailCampaign, campaign_id)
+        if lease is None:
+            return {}
+        campaign = await db.get(EmailCampaign, campaign_id)
+        campaign.started_at = campaign.started_at or datetime.now(timezone.utc)
+        await db.commit()
+
+        body = Template(campaign.body_template)
+        sent_this_run = 0
+        started = time.perf_counter()
+        progress = {}
+
+        try:
+            while True:
+                # keyset pagination: never OFFSET, never more than one page in memory
+                result = await db.execute(
+                    select(User.id, User.email, UserProfile.first_name)
+                    .outerjoin(User.profile)
+                    .where(User.is_active.is_(True), User.id > campaign.last_user_id)
+                    .order_by(User.id)
+                    .limit(settings.CAMPAIGN_BATCH_SIZE)
+                )
+                recipients = result.all()
+                if not recipients:
+                    break
+
+                errors = await send_batch([
+                    (
+                        recipient.email,
+                        campaign.subject,
+                        body.safe_substitute(email=recipient.email, first_name=recipient.first_name or ""),
+                    )
+                    for recipient in recipients
+                ])
+
+                # the checkpoint only moves past recipients that got the email or were refused for good;
+                # from the first one still undelivered on, the batch is sent again when the task is retried
+                done = next(
+                    (index for index, error in enumerate(errors) if error is not None and not is_refused(error)),
+                    len(errors),
+                )
+                delivered = errors[:done].count(None)
+                sent_this_run += delivered
+                campaign.sent_count += delivered
+                campaign.failed_count += done - delivered
+                if done:
+                    campaign.last_user_id = recipients[done - 1].id
+                await renew_lease(db, EmailCampaign, campaign.id, lease)
+                await db.commit()
+
+                if done < len(errors):
+                    raise CampaignDeliveryError(
+                        f"{len(errors) - done} emails undelivered after {settings.CAMPAIGN_SEND_RETRIES} retries, "
+                        f"stopping at user {recipients[done].id}: {errors[done]!r}"
+                    )
+
+                elapsed = time.perf_counter() - started
+                progress = {
+                    "campaign_id": campaign.id,
+                    "sent": campaign.sent_count,
+                    "failed": campaign.failed_count,
+                    "last_user_id": campaign.last_user_id,
+                    "messages_per_second": round(sent_this_run / elapsed, 2) if elapsed > 0 else 0.0,
+                }
+                if report:
+                    report(progress)
+        except LeaseLostError:
+            print(f"⚠️ Campaign {campaign_id} was taken over by another worker, stopping.")
+            return progress
+        except Exception:
+            await db.rollback()
+            await renew_lease(db, EmailCampaign, campaign_id, lease)
+            campaign.status = CampaignStatusEnum.FAILED
+            campaign.lease_token = None
+            await db.commit()
+            raise
+
+        await renew_lease(db, EmailCampaign, campaign.id, lease)
+        campaign.status = CampaignStatusEnum.COMPLETED
+        campaign.lease_token = None
+        campaign.finished_at = datetime.now(timezone.utc)
+        await db.commit()
+
+        print(f"✅ Campaign {campaign.id} finished: {campaign.sent_count} sent, {campaign.failed_count} failed.")
+        return progress
@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any, Coroutine
+from aiosmtplib import SMTPException, SMTPRecipientsRefused, SMTPResponseException
+
+from core.config import settings
+from celery_app.auth import celery_app
+from tasks.runner import run_async
+from tasks.publish import queue_task
+from services.email import send_activation_email, send_password_reset_email
+
+
+class PermanentEmailError(Exception):
+    """The server refused the message for good (a 5xx reply): not retried, dead-lettered right away."""
+
+
+def is_permanent(error: SMTPException) -> bool:
+    if isinstance(error, SMTPRecipientsRefused):
+        return all(recipient.code >= 500 for recipient in error.recipients)
+    return isinstance(error, SMTPResponseException) and error.code >= 500
+
+
+def send_or_give_up(coroutine: Coroutine) -> None:
+    try:
+        run_async(coroutine)
+    except SMTPException as exc:
+        if is_permanent(exc):
+            raise PermanentEmailError(repr(exc)) from exc
+        raise
+
+
+class EmailTask(celery_app.Task):
+    # PermanentEmailError is deliberately not listed: an invalid address fails the same way every time
+    autoretry_for = (SMTPException, OSError, asyncio.TimeoutError)
+    max_retries = settings.EMAIL_MAX_RETRIES
+    retry_backoff = settings.EMAIL_RETRY_BACKOFF
+    retry_backoff_max = settings.EMAIL_RETRY_BACKOFF_MAX
+    retry_jitter = True
+    acks_late = True
+    reject_on_worker_lost = True
+    ignore_result = True
+
+    def on_failure(self, exc: Exception, task_id: str, args: tuple, kwargs: dict, einfo: Any) -> None:
+        dead_letter_email.apply_async(
+            args=(self.name, list(args), repr(exc)),
+            queue=settings.EMAIL_DEAD_LETTER_QUEUE,
+        )
+
+
+@celery_app.task(base=EmailTask)
+def send_activation_email_task(user_email: str, token: str) -> None:
+    send_or_give_up(send_activation_email(user_email, token))
+
+
+@celery_app.task(base=EmailTask)
+def send_password_reset_email_task(user_email: str, token: str) -> None:
+    send_or_give_up(send_password_reset_email(user_email, token))
+
+
+@celery_app.task(ignore_result=True)
+def dead_letter_email(task_name: str, args: list, error: str) -> None:
+    print(f"☠️ Email task {task_name}{tuple(args)} gave up: {error}")
+
+
+async def queue_email(task: celery_app.Task, *args: Any) -> bool:
+    """Publishes an email task off the event loop. Callers have already committed the user or token,
+    so a broker error is logged and the request still succeeds; the resend endpoints cover the gap."""
+    return await queue_task(task, *args)
@@ -0,0 +1,66 @@
+import uuid
+from typing import Any, Optional
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+
+# Long-running tasks are acks_late, so the broker may deliver the same job twice: after a worker dies,
+# or when a run outlives the Redis visibility timeout. A job row is only worked on under a lease: a
+# token plus an expiry the owner pushes forward with every checkpoint. A second delivery cannot claim
+# a live lease, and takes over once the owner has stopped renewing it.
+
+
+class LeaseHeldError(Exception):
+    """Another worker holds a live lease on the row; try again once it may have expired."""
+
+
+class LeaseLostError(Exception):
+    """The lease expired and another worker claimed the row; this run must stop writing to it."""
+
+
+def lease_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=settings.TASK_LEASE_SECONDS)
+
+
+async def claim_lease(db: AsyncSession, model: Any, row_id: int) -> Optional[str]:
+    """Atomically moves a PENDING / FAILED row (or one whose lease ran out) to RUNNING.
+
+    Returns the lease token, None if the row is gone or already COMPLETED, and raises
+    ``LeaseHeldError`` while another worker owns it.
+    """
+    statuses = model.status.type.enum_class
+    token = uuid.uuid4().hex
+    result = await db.execute(
+        update(model)
+        .where(
+            model.id == row_id,
+            or_(
+                model.status.in_([statuses.PENDING, statuses.FAILED]),
+                and_(model.status == statuses.RUNNING, model.lease_expires_at < datetime.now(timezone.utc)),
+            ),
+        )
+        .values(status=statuses.RUNNING, lease_token=token, lease_expires_at=lease_expiry())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if result.rowcount:
+        return token
+
+    status = (await db.execute(select(model.status).where(model.id == row_id))).scalar_one_or_none()
+    if status in (None, statuses.COMPLETED):
+        return None
+    raise LeaseHeldError(f"{model.__tablename__} {row_id} is being processed by another worker")
+
+
+async def renew_lease(db: AsyncSession, model: Any, row_id: int, token: str) -> None:
+    """Extends the lease inside the caller's transaction, so a checkpoint commits only while it is owned."""
+    result = await db.execute(
+        update(model)
+        .where(model.id == row_id, model.lease_token == token)
+        .values(lease_expires_at=lease_expiry())
+        .execution_options(synchronize_session=False)
+    )
+    if not result.rowcount:
+        raise LeaseLostError(f"{model.__tablename__} {row_id} was claimed by another worker")
@@ -0,0 +1,17 @@
+from typing import Any
+from celery import Task
+from starlette.concurrency import run_in_threadpool
+
+# publishing gives up after about a second, so a broker outage cannot hold a request open
+PUBLISH_RETRY_POLICY = {"max_retries": 3, "interval_start": 0, "interval_step": 0.2, "interval_max": 0.5}
+
+
+async def queue_task(task: Task, *args: Any) -> bool:
+    """Publishes a task off the event loop with a bounded retry. Returns False, after logging, when
+    the broker cannot be reached: the caller's rows are already committed and it decides what to do."""
+    try:
+        await run_in_threadpool(task.apply_async, args=args, retry=True, retry_policy=PUBLISH_RETRY_POLICY)
+    except Exception as exc:
+        print(f"❌ Could not queue {task.name}{args}: {exc!r}")
+        return False
+    return True
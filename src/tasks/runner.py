@@ -0,0 +1,26 @@
+import asyncio
+from typing import Any, Coroutine, Optional, TypeVar
+from celery.signals import worker_process_shutdown
+
+from database.db import engine
+
+T = TypeVar("T")
+
+# One event loop per worker process: pooled DB and SMTP connections are bound to the loop
+# that opened them, so reusing it keeps them alive between tasks
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
+
+@worker_process_shutdown.connect
+def close_loop(**kwargs) -> None:
+    if _loop is not None and not _loop.is_closed():
+        _loop.run_until_complete(engine.dispose())
+        _loop.close()
@@ -0,0 +1,145 @@
+import shutil
+import asyncio
+from typing import Callable, Optional
+from datetime import datetime, timezone
+from sqlalchemy.orm import selectinload
+
+from core.config import HLSRendition, settings
+from core.media import resolve_media_path
+from celery_app.auth import celery_app
+from tasks.runner import run_async
+from tasks.leases import LeaseHeldError, LeaseLostError, claim_lease, renew_lease
+from database.db import SessionLocal
+from database.enums import IngestStatusEnum
+from database.models.videos import VideoIngest, VideoRendition
+from services import hls
+
+# seconds between progress updates written to the ingest row and the task state
+PROGRESS_INTERVAL = 2.0
+
+
+@celery_app.task(bind=True, acks_late=True, reject_on_worker_lost=True)
+def package_hls(self: celery_app.Task, ingest_id: int) -> dict:
+    def report(progress: dict) -> None:
+        self.update_state(state="PROGRESS", meta=progress)
+
+    try:
+        return run_async(_package_hls(ingest_id, report))
+    except LeaseHeldError as exc:
+        # a duplicate delivery: check back once the owner's lease could have run out
+        raise self.retry(exc=exc, countdown=settings.TASK_LEASE_SECONDS, max_retries=None)
+
+
+async def cancel_all(tasks: set[asyncio.Task]) -> None:
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _package_hls(ingest_id: int, report: Optional[Callable[[dict], None]] = None) -> dict:
+    async with SessionLocal() as db:
+        lease = await claim_lease(db, VideoIngest, ingest_id)
+        if lease is None:
+            return {}
+        ingest = await db.get(VideoIngest, ingest_id, options=[selectinload(VideoIngest.renditions)])
+        ingest.started_at = ingest.started_at or datetime.now(timezone.utc)
+        ingest.error = None
+        await db.commit()
+
+        fractions: dict[str, float] = {}
+
+        def progress() -> dict:
+            return {
+                "ingest_id": ingest.id,
+                "progress": round(100 * sum(fractions.values()) / len(fractions), 1) if fractions else 0.0,
+                "renditions": {name: round(100 * fraction, 1) for name, fraction in fractions.items()},
+            }
+
+        async def package(rendition: HLSRendition) -> VideoRendition:
+            async with semaphore:
+                # per lease, so a run that lost its lease can never touch the files of the one that took over;
+                # whatever a crashed run left behind is incomplete and removed once the ingest completes
+                output_dir = hls.work_dir(ingest.id, f"{lease}/{rendition.name}")
+                output_dir.mkdir(parents=True)
+
+                def on_progress(fraction: float) -> None:
+                    fractions[rendition.name] = fraction
+
+                await hls.run_ffmpeg(
+                    hls.ffmpeg_command(source, info, rendition, output_dir), info.duration, on_progress
+                )
+                manifest, segment_count = await asyncio.to_thread(hls.publish_rendition, output_dir)
+                shutil.rmtree(output_dir, ignore_errors=True)
+                fractions[rendition.name] = 1.0
+                return VideoRendition(
+                    name=rendition.name,
+                    width=hls.scaled_width(info, rendition.height),
+                    height=rendition.height,
+                    bandwidth=hls.bandwidth(rendition),
+                    segment_count=segment_count,
+                    manifest=manifest,
+                )
+
+        running: set[asyncio.Task] = set()
+        try:
+            source = resolve_media_path(ingest.source_path)
+            if source is None:
+                raise hls.PackagingError("Source file not found")
+            if ingest.source_sha256 is None:
+                ingest.source_sha256 = await asyncio.to_thread(hls.file_sha256, source)
+            info = await hls.probe_source(source)
+            ingest.duration = info.duration
+            await renew_lease(db, VideoIngest, ingest.id, lease)
+            await db.commit()
+
+            # renditions already in the DB were fully stored by an earlier run and are not encoded again
+            done = {rendition.name for rendition in ingest.renditions}
+            renditions = hls.select_renditions(info)
+            fractions.update({rendition.name: float(rendition.name in done) for rendition in renditions})
+            semaphore = asyncio.Semaphore(settings.HLS_PARALLELISM_PER_TASK)
+            running = {
+                asyncio.create_task(package(rendition)) for rendition in renditions if rendition.name not in done
+            }
+
+            while running:
+                finished, running = await asyncio.wait(
+                    running, timeout=PROGRESS_INTERVAL, return_when=asyncio.FIRST_COMPLETED
+                )
+                failed = [task for task in finished if task.exception()]
+                # checkpoint each rendition as soon as it is stored, even when a sibling failed
+                ingest.renditions.extend(task.result() for task in finished if task not in failed)
+                ingest.progress = progress()["progress"]
+                await renew_lease(db, VideoIngest, ingest.id, lease)
+                await db.commit()
+                if failed:
+                    raise failed[0].exception()
+                if report:
+                    report(progress())
+        except LeaseLostError:
+            await cancel_all(running)
+            print(f"⚠️ Ingest {ingest_id} was taken over by another worker, stopping.")
+            return {}
+        except Exception as exc:
+            await cancel_all(running)
+            await db.rollback()
+            await renew_lease(db, VideoIngest, ingest_id, lease)
+            ingest.status = IngestStatusEnum.FAILED
+            ingest.lease_token = None
+            ingest.error = str(exc)
+            await db.commit()
+            raise
+
+        ingest.master_manifest = hls.master_playlist([
+            (rendition.name, rendition.width, rendition.height, rendition.bandwidth)
+            for rendition in ingest.renditions
+        ])
+        await renew_lease(db, VideoIngest, ingest.id, lease)
+        ingest.status = IngestStatusEnum.COMPLETED
+        ingest.lease_token = None
+        ingest.progress = 100.0
+        ingest.finished_at = datetime.now(timezone.utc)
+        await db.commit()
+        shutil.rmtree(hls.work_dir(ingest.id, ""), ignore_errors=True)
+
+        print(f"✅ Ingest {ingest.id} packaged: {len(ingest.renditions)} renditions, {info.duration:.0f} s of video.")
+        return progress()
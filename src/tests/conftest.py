@@ -1,8 +1,77 @@
+import os
+import uuid
+import shutil
+import asyncio
+import tempfile
 import pytest
-from typing import Any, AsyncGenerator
+from typing import Any, AsyncGenerator, Iterator
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select
 
-from main import app
+TEST_DB_DIR = tempfile.mkdtemp(prefix="online_cinema_tests_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{TEST_DB_DIR}/test.db"
+
+from main import app  # noqa: E402
+from celery_app.auth import celery_app  # noqa: E402
+from database.db import Base, SessionLocal, engine  # noqa: E402
+from database.enums import UserGroupEnum  # noqa: E402
+from database.models.accounts import User, UserGroup, UserProfile  # noqa: E402
+from database.models.movies import Certification, Director, Genre, Movie, Star  # noqa: E402
+from security.hashing import hash_password  # noqa: E402
+from security.throttle import InMemoryRateLimitBackend, login_throttle  # noqa: E402
+
+TEST_PASSWORD = "StrongPass123!"
+TEST_PASSWORD_HASH = hash_password(TEST_PASSWORD)
+
+
+async def create_test_database() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with SessionLocal() as db:
+        db.add_all([UserGroup(name=group) for group in UserGroupEnum])
+        await db.commit()
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True, scope="session")
+def test_database() -> Iterator[None]:
+    asyncio.run(create_test_database())
+    yield
+    asyncio.run(engine.dispose())
+    shutil.rmtree(TEST_DB_DIR, ignore_errors=True)
+
+
+async def create_movie_catalog() -> list[int]:
+    async with SessionLocal() as db:
+        genres = [Genre(name=name) for name in ("Drama", "Comedy", "Sci-Fi")]
+        certification = Certification(name="PG-13")
+        director = Director(name="Test Director")
+        star = Star(name="Test Star")
+        movies = [
+            Movie(
+                name=f"Test Movie {index}", year=2000 + index % 10, time=90 + index,
+                imdb=round(5 + index % 7 * 0.5, 1), votes=1000 * index, description="A test movie.",
+                price=f"{4 + index % 5}.99",
+                certification=certification, genres=[genres[index % 3]], directors=[director], stars=[star],
+            )
+            for index in range(30)
+        ]
+        db.add_all(movies)
+        await db.commit()
+        movie_ids = [movie.id for movie in movies]
+    await engine.dispose()
+    return movie_ids
+
+
+@pytest.fixture(scope="session")
+def movie_catalog() -> list[int]:
+    """30 movies, three per year from 2000 to 2009, split evenly across Drama, Comedy and Sci-Fi."""
+    return asyncio.run(create_movie_catalog())
+
+
+@pytest.fixture(autouse=True, scope="session")
+def in_memory_celery() -> None:
+    celery_app.conf.update(broker_url="memory://", result_backend="cache+memory://")
 
 
 @pytest.fixture(autouse=True)
@@ -11,8 +80,12 @@ def mock_email_send(monkeypatch: pytest.MonkeyPatch) -> None:
         print("📨 Fake email sent")
         return None
 
-    monkeypatch.setattr("services.email.send_activation_email", fake_send_email)
-    monkeypatch.setattr("services.email.send_password_reset_email", fake_send_email)
+    monkeypatch.setattr("services.email.send_email", fake_send_email)
+
+
+@pytest.fixture(autouse=True)
+def fresh_login_throttle(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(login_throttle, "backend", InMemoryRateLimitBackend())
 
 
 @pytest.fixture
@@ -20,3 +93,36 @@ async def async_client() -> AsyncGenerator[AsyncClient, Any]:
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
         yield client
+
+
+@pytest.fixture
+async def active_user() -> dict[str, Any]:
+    email = f"user-{uuid.uuid4().hex[:8]}@example.com"
+    async with SessionLocal() as db:
+        group_id = (await db.execute(select(UserGroup.id).where(UserGroup.name == UserGroupEnum.USER))).scalar_one()
+        user = User(
+            email=email, hashed_password=TEST_PASSWORD_HASH, is_active=True, group_id=group_id, profile=UserProfile()
+        )
+        db.add(user)
+        await db.commit()
+    return {"id": user.id, "email": email, "password": TEST_PASSWORD}
+
+
+@pytest.fixture
+async def auth_tokens(async_client: AsyncClient, active_user: dict[str, Any]) -> dict[str, str]:
+    response = await async_client.post(
+        "/api/v1/auth/login", json={"email": active_user["email"], "password": active_user["password"]}
+    )
+    return response.json()
+
+
+@pytest.fixture
+async def admin_tokens(async_client: AsyncClient) -> dict[str, str]:
+    email = f"admin-{uuid.uuid4().hex[:8]}@example.com"
+    async with SessionLocal() as db:
+        group_id = (await db.execute(select(UserGroup.id).where(UserGroup.name == UserGroupEnum.ADMIN))).scalar_one()
+        db.add(User(email=email, hashed_password=TEST_PASSWORD_HASH, is_active=True, group_id=group_id,
+                    profile=UserProfile()))
+        await db.commit()
+    response = await async_client.post("/api/v1/auth/login", json={"email": email, "password": TEST_PASSWORD})
+    return response.json()
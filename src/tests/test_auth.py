@@ -1,5 +1,18 @@
+import sqlite3
+from typing import Any
+
 import pytest
 from httpx import AsyncClient
+from passlib.hash import bcrypt
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+
+from database.db import SessionLocal
+from database.models.accounts import User
+from routes.auth import is_duplicate_email
+from security.auth import create_access_token
+from security.hashing import pwd_context
 
 
 @pytest.mark.asyncio
@@ -40,3 +53,122 @@ async def test_request_password_reset(async_client: AsyncClient) -> None:
         json={"email": "unknown@example.com"}
     )
     assert response.status_code in (404, 403)
+
+
+@pytest.mark.asyncio
+async def test_register_creates_user_with_profile_once(async_client: AsyncClient) -> None:
+    payload = {"email": "single-tx@example.com", "password": "StrongPass123!"}
+
+    first = await async_client.post("/api/v1/auth/register", json=payload)
+    second = await async_client.post("/api/v1/auth/register", json=payload)
+
+    assert first.status_code == 200
+    assert second.status_code == 400
+    assert second.json()["detail"] == "Email already registered"
+
+    async with SessionLocal() as db:
+        user = (await db.execute(
+            select(User).options(selectinload(User.profile)).where(User.email == payload["email"])
+        )).scalar_one()
+        assert user.profile is not None
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_token(async_client: AsyncClient, auth_tokens: dict[str, str]) -> None:
+    response = await async_client.post("/api/v1/auth/refresh", json={"refresh_token": auth_tokens["refresh_token"]})
+
+    assert response.status_code == 200
+    assert response.json()["refresh_token"] != auth_tokens["refresh_token"]
+
+
+@pytest.mark.asyncio
+async def test_reused_refresh_token_revokes_family(async_client: AsyncClient, auth_tokens: dict[str, str]) -> None:
+    rotated = await async_client.post("/api/v1/auth/refresh", json={"refresh_token": auth_tokens["refresh_token"]})
+    replayed = await async_client.post("/api/v1/auth/refresh", json={"refresh_token": auth_tokens["refresh_token"]})
+    latest = await async_client.post("/api/v1/auth/refresh", json={"refresh_token": rotated.json()["refresh_token"]})
+
+    assert replayed.status_code == 401
+    assert latest.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_change_password_revokes_access_tokens(
+        async_client: AsyncClient, active_user: dict[str, Any], auth_tokens: dict[str, str]
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    assert (await async_client.get("/api/v1/users/me", headers=headers)).status_code == 200
+
+    response = await async_client.post(
+        "/api/v1/auth/change-password",
+        json={"old_password": active_user["password"], "new_password": "NewStrongPass123!"},
+        headers=headers,
+    )
+
+    assert response.status_code == 200
+    assert (await async_client.get("/api/v1/users/me", headers=headers)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_logout_all_revokes_every_token(async_client: AsyncClient, auth_tokens: dict[str, str]) -> None:
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    response = await async_client.post("/api/v1/auth/logout-all", headers=headers)
+    refreshed = await async_client.post("/api/v1/auth/refresh", json={"refresh_token": auth_tokens["refresh_token"]})
+
+    assert response.status_code == 200
+    assert refreshed.status_code == 401
+    assert (await async_client.get("/api/v1/users/me", headers=headers)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_outdated_password_hash(async_client: AsyncClient, active_user: dict[str, Any]) -> None:
+    async with SessionLocal() as db:
+        user = await db.get(User, active_user["id"])
+        user.hashed_password = bcrypt.using(rounds=4).hash(active_user["password"])
+        await db.commit()
+
+    response = await async_client.post(
+        "/api/v1/auth/login", json={"email": active_user["email"], "password": active_user["password"]}
+    )
+
+    assert response.status_code == 200
+    async with SessionLocal() as db:
+        user = await db.get(User, active_user["id"])
+        assert not pwd_context.needs_update(user.hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_register_succeeds_when_broker_is_down(
+        async_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def broker_down(*args, **kwargs) -> None:
+        raise ConnectionRefusedError("broker unreachable")
+
+    monkeypatch.setattr("tasks.email.send_activation_email_task.apply_async", broker_down)
+    payload = {"email": "broker-down@example.com", "password": "StrongPass123!"}
+
+    response = await async_client.post("/api/v1/auth/register", json=payload)
+
+    assert response.status_code == 200
+    async with SessionLocal() as db:
+        assert (await db.execute(select(User).where(User.email == payload["email"]))).scalar_one()
+
+
+def test_only_the_email_unique_violation_counts_as_duplicate() -> None:
+    def integrity_error(message: str) -> IntegrityError:
+        return IntegrityError("INSERT INTO users ...", {}, sqlite3.IntegrityError(message))
+
+    assert is_duplicate_email(integrity_error("UNIQUE constraint failed: users.email"))
+    assert is_duplicate_email(integrity_error('duplicate key value violates unique constraint "ix_users_email"'))
+    assert not is_duplicate_email(integrity_error("FOREIGN KEY constraint failed"))
+    assert not is_duplicate_email(integrity_error("NOT NULL constraint failed: users.group_id"))
+
+
+@pytest.mark.asyncio
+async def test_access_token_without_group_claim_is_rejected(
+        async_client: AsyncClient, active_user: dict[str, Any]
+) -> None:
+    token = create_access_token({"sub": str(active_user["id"]), "ver": 0})
+
+    response = await async_client.get("/api/v1/users/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 401
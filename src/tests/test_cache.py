@@ -0,0 +1,98 @@
+import time
+import asyncio
+import pytest
+
+from core.cache import TTLCache
+from core.invalidation import RedisCacheInvalidationBus
+
+
+def test_counts_hits_and_misses() -> None:
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "a")
+
+    assert cache.get(1) == "a"
+    assert cache.get(2) is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+
+def test_evicts_least_recently_used() -> None:
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+
+
+def test_expires_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set(1, "a")
+    cache.set(2, "b", ttl=100)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 50)
+
+    assert cache.get(1) is None
+    assert cache.get(2) == "b"
+    assert len(cache) == 1
+
+
+class FakeRedis:
+    """The slice of redis.asyncio pub/sub the invalidation bus uses, shared by several "workers"."""
+
+    def __init__(self) -> None:
+        self.subscribers: list[asyncio.Queue] = []
+
+    async def publish(self, channel: str, data: str) -> None:
+        for queue in self.subscribers:
+            queue.put_nowait({"type": "message", "channel": channel, "data": data})
+
+    def pubsub(self) -> "FakePubSub":
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, redis: FakeRedis) -> None:
+        self.redis = redis
+        self.queue = asyncio.Queue()
+
+    async def __aenter__(self) -> "FakePubSub":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.redis.subscribers.remove(self.queue)
+
+    async def subscribe(self, channel: str) -> None:
+        self.redis.subscribers.append(self.queue)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+
+@pytest.mark.asyncio
+async def test_redis_bus_evicts_keys_in_every_worker() -> None:
+    redis = FakeRedis()
+    workers = [RedisCacheInvalidationBus("redis://unused") for _ in range(2)]
+    caches = []
+    for bus in workers:
+        bus._redis = redis
+        caches.append(bus.register("token_version", TTLCache(maxsize=10, ttl=60)))
+    listener = asyncio.create_task(workers[1].listen())
+    while len(redis.subscribers) < 1:
+        await asyncio.sleep(0)
+    for cache in caches:
+        cache.set(1, 0)
+        cache.set(2, 0)
+
+    await workers[0].invalidate("token_version", 1)
+    await asyncio.sleep(0.01)
+    listener.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listener
+
+    assert [cache.get(1) for cache in caches] == [None, None]
+    assert [cache.get(2) for cache in caches] == [0, 0]
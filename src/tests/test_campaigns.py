@@ -0,0 +1,175 @@
+import uuid
+import pytest
+from datetime import datetime, timedelta, timezone
+from aiosmtplib import SMTPRecipientRefused
+from httpx import AsyncClient
+from sqlalchemy import select, update
+
+from database.db import SessionLocal
+from database.enums import CampaignStatusEnum
+from database.models.accounts import User, UserGroup
+from database.models.campaigns import EmailCampaign
+from tasks.campaigns import CampaignDeliveryError, _send_campaign
+from tasks.leases import LeaseHeldError
+
+
+@pytest.mark.asyncio
+async def test_campaign_streams_active_users_and_checkpoints(monkeypatch: pytest.MonkeyPatch) -> None:
+    batches = []
+
+    async def fake_send_emails(messages: list[tuple[str, str, str]]) -> list[None]:
+        batches.append(messages)
+        return [None] * len(messages)
+
+    monkeypatch.setattr("tasks.campaigns.send_emails", fake_send_emails)
+    monkeypatch.setattr("tasks.campaigns.settings.CAMPAIGN_BATCH_SIZE", 2)
+
+    suffix = uuid.uuid4().hex[:8]
+    async with SessionLocal() as db:
+        group_id = (await db.execute(select(UserGroup.id))).scalars().first()
+        users = [
+            User(email=f"campaign{i}-{suffix}@example.com", hashed_password="x", group_id=group_id, is_active=i != 1)
+            for i in range(4)
+        ]
+        campaign = EmailCampaign(subject="News", body_template="Hello $email")
+        db.add_all([*users, campaign])
+        await db.commit()
+        campaign.last_user_id = users[0].id - 1
+        await db.commit()
+
+    progress = await _send_campaign(campaign.id)
+
+    recipients = [message[0] for batch in batches for message in batch]
+    assert recipients == [users[0].email, users[2].email, users[3].email]
+    assert all(len(batch) <= 2 for batch in batches)
+    assert batches[0][0][2] == f"Hello {users[0].email}"
+    assert progress["last_user_id"] == users[3].id
+
+    async with SessionLocal() as db:
+        campaign = await db.get(EmailCampaign, campaign.id)
+        assert campaign.status == CampaignStatusEnum.COMPLETED
+        assert campaign.sent_count == 3
+
+
+async def create_campaign(user_count: int) -> tuple[list[User], EmailCampaign]:
+    """Active users plus a campaign whose checkpoint sits just before them, so only they are recipients."""
+    suffix = uuid.uuid4().hex[:8]
+    async with SessionLocal() as db:
+        group_id = (await db.execute(select(UserGroup.id))).scalars().first()
+        users = [
+            User(email=f"resume{i}-{suffix}@example.com", hashed_password="x", group_id=group_id, is_active=True)
+            for i in range(user_count)
+        ]
+        campaign = EmailCampaign(subject="News", body_template="Hello $email")
+        db.add_all([*users, campaign])
+        await db.commit()
+        campaign.last_user_id = users[0].id - 1
+        await db.commit()
+    return users, campaign
+
+
+class WorkerCrash(BaseException):
+    """Stands in for the worker process dying: no except Exception handler gets to run."""
+
+
+@pytest.mark.asyncio
+async def test_campaign_resumes_after_worker_crash_without_resending(monkeypatch: pytest.MonkeyPatch) -> None:
+    recipients = []
+
+    async def crashing_send_emails(messages: list[tuple[str, str, str]]) -> list[None]:
+        if recipients:
+            raise WorkerCrash()
+        recipients.extend(message[0] for message in messages)
+        return [None] * len(messages)
+
+    monkeypatch.setattr("tasks.campaigns.send_emails", crashing_send_emails)
+    monkeypatch.setattr("tasks.campaigns.settings.CAMPAIGN_BATCH_SIZE", 2)
+    users, campaign = await create_campaign(4)
+
+    with pytest.raises(WorkerCrash):
+        await _send_campaign(campaign.id)
+
+    # the redelivered task finds the crashed worker's lease still live
+    with pytest.raises(LeaseHeldError):
+        await _send_campaign(campaign.id)
+
+    async with SessionLocal() as db:
+        await db.execute(
+            update(EmailCampaign).where(EmailCampaign.id == campaign.id)
+            .values(lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+        )
+        await db.commit()
+
+    async def fake_send_emails(messages: list[tuple[str, str, str]]) -> list[None]:
+        recipients.extend(message[0] for message in messages)
+        return [None] * len(messages)
+
+    monkeypatch.setattr("tasks.campaigns.send_emails", fake_send_emails)
+    await _send_campaign(campaign.id)
+
+    assert recipients == [user.email for user in users]
+    async with SessionLocal() as db:
+        campaign = await db.get(EmailCampaign, campaign.id)
+        assert campaign.status == CampaignStatusEnum.COMPLETED
+        assert campaign.sent_count == 4
+        assert campaign.lease_token is None
+
+
+@pytest.mark.asyncio
+async def test_campaign_checkpoint_stops_at_first_undelivered_recipient(monkeypatch: pytest.MonkeyPatch) -> None:
+    users, campaign = await create_campaign(4)
+    outage = {users[1].email}
+    attempts = []
+
+    async def flaky_send_emails(messages: list[tuple[str, str, str]]) -> list[BaseException | None]:
+        attempts.extend(message[0] for message in messages)
+        return [
+            ConnectionRefusedError() if message[0] in outage
+            else SMTPRecipientRefused(550, "No such user", message[0]) if message[0] == users[2].email
+            else None
+            for message in messages
+        ]
+
+    monkeypatch.setattr("tasks.campaigns.send_emails", flaky_send_emails)
+    monkeypatch.setattr("tasks.campaigns.settings.CAMPAIGN_RETRY_BACKOFF", 0)
+
+    with pytest.raises(CampaignDeliveryError):
+        await _send_campaign(campaign.id)
+
+    # the undelivered recipient was retried, and the checkpoint stayed before it
+    assert attempts.count(users[1].email) == 1 + 3
+    async with SessionLocal() as db:
+        stored = await db.get(EmailCampaign, campaign.id)
+        assert stored.status == CampaignStatusEnum.FAILED
+        assert (stored.last_user_id, stored.sent_count, stored.failed_count) == (users[0].id, 1, 0)
+
+    outage.clear()
+    attempts.clear()
+    await _send_campaign(campaign.id)
+
+    assert attempts == [user.email for user in users[1:]]
+    async with SessionLocal() as db:
+        stored = await db.get(EmailCampaign, campaign.id)
+        assert stored.status == CampaignStatusEnum.COMPLETED
+        assert (stored.sent_count, stored.failed_count) == (3, 1)
+
+
+@pytest.mark.asyncio
+async def test_campaign_is_marked_failed_when_broker_is_down(
+        async_client: AsyncClient, admin_tokens: dict[str, str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def broker_down(*args, **kwargs) -> None:
+        raise ConnectionRefusedError("broker unreachable")
+
+    monkeypatch.setattr("routes.campaigns.send_campaign.apply_async", broker_down)
+    subject = f"News {uuid.uuid4().hex[:8]}"
+
+    response = await async_client.post(
+        "/api/v1/campaigns", json={"subject": subject, "body_template": "Hello $email"},
+        headers={"Authorization": f"Bearer {admin_tokens['access_token']}"},
+    )
+
+    assert response.status_code == 503
+    async with SessionLocal() as db:
+        campaign = (await db.execute(select(EmailCampaign).where(EmailCampaign.subject == subject))).scalar_one()
+        assert campaign.status == CampaignStatusEnum.FAILED
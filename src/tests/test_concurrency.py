@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from httpx import AsyncClient, ASGITransport
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from core.concurrency import ConcurrencyLimitExceeded, ConcurrencyLimiter, ConcurrencyLimitMiddleware
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_then_rejects() -> None:
+    limiter = ConcurrencyLimiter(limit=1, max_waiting=1, wait_timeout=0.05)
+    await limiter.acquire()
+
+    with pytest.raises(ConcurrencyLimitExceeded):
+        await limiter.acquire()  # waits in the queue, then times out
+
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    with pytest.raises(ConcurrencyLimitExceeded):
+        await limiter.acquire()  # queue is full, rejected without waiting
+
+    limiter.release()
+    await waiter
+    assert limiter.stats() == {"limit": 1, "in_flight": 1, "waiting": 0, "admitted": 2, "rejected": 2}
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_only_limited_routes() -> None:
+    release = asyncio.Event()
+
+    async def slow(request: Request) -> PlainTextResponse:
+        await release.wait()
+        return PlainTextResponse("slow")
+
+    async def cheap(request: Request) -> PlainTextResponse:
+        return PlainTextResponse("cheap")
+
+    app = Starlette(routes=[Route("/slow", slow), Route("/cheap", cheap)])
+    limiter = ConcurrencyLimiter(limit=1, max_waiting=0, wait_timeout=1)
+    app.add_middleware(ConcurrencyLimitMiddleware, limiters={"/slow": limiter}, retry_after=3)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        busy = asyncio.create_task(client.get("/slow"))
+        while limiter.in_flight == 0:
+            await asyncio.sleep(0)
+
+        rejected = await client.get("/slow")
+        assert rejected.status_code == 503
+        assert rejected.headers["Retry-After"] == "3"
+        assert (await client.get("/cheap")).status_code == 200
+
+        release.set()
+        assert (await busy).status_code == 200
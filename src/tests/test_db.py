@@ -0,0 +1,16 @@
+import pytest
+from sqlalchemy import text
+
+from database.db import engine
+
+
+@pytest.mark.asyncio
+async def test_sqlite_connections_use_wal_and_normal_sync() -> None:
+    async with engine.connect() as conn:
+        journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+        synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+        busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+
+    assert journal_mode == "wal"
+    assert synchronous == 1
+    assert busy_timeout > 0
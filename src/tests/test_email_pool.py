@@ -0,0 +1,79 @@
+import socket
+import pytest
+from collections.abc import Iterator
+
+from aiosmtplib import SMTPRecipientsRefused
+
+from services.email import SMTPConnectionPool, build_message
+
+controller_module = pytest.importorskip("aiosmtpd.controller")
+
+
+class RecordingHandler:
+    def __init__(self, port: int) -> None:
+        self.port = port
+        self.recipients: list[str] = []
+
+    async def handle_RCPT(  # noqa: N802
+            self, server: object, session: object, envelope: object, address: str, rcpt_options: list
+    ) -> str:
+        if address.startswith("unknown"):
+            return "550 No such user"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server: object, session: object, envelope: object) -> str:  # noqa: N802
+        self.recipients.extend(envelope.rcpt_tos)
+        return "250 OK"
+
+
+@pytest.fixture
+def smtp_server() -> Iterator[RecordingHandler]:
+    # the OS picks a free port; aiosmtpd's readiness check cannot start on port 0 itself
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    handler = RecordingHandler(port)
+    controller = controller_module.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    yield handler
+    controller.stop()
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_connections(smtp_server: RecordingHandler) -> None:
+    pool = SMTPConnectionPool(hostname="127.0.0.1", port=smtp_server.port, start_tls=False, max_connections=2)
+    messages = [build_message(f"user{i}@example.com", "Hello", "Body") for i in range(10)]
+
+    errors = await pool.send_many(messages)
+    await pool.close()
+
+    assert errors == [None] * 10
+    assert len(smtp_server.recipients) == 10
+    assert pool.sent == 10
+    assert pool.connections_opened <= 2
+
+
+@pytest.mark.asyncio
+async def test_pool_reconnects_after_idle_timeout(smtp_server: RecordingHandler) -> None:
+    pool = SMTPConnectionPool(hostname="127.0.0.1", port=smtp_server.port, start_tls=False, idle_timeout=0)
+
+    await pool.send_message(build_message("first@example.com", "Hello", "Body"))
+    await pool.send_message(build_message("second@example.com", "Hello", "Body"))
+    await pool.close()
+
+    assert pool.connections_opened == 2
+    assert smtp_server.recipients == ["first@example.com", "second@example.com"]
+
+
+@pytest.mark.asyncio
+async def test_pool_keeps_connection_after_recipient_refusal(smtp_server: RecordingHandler) -> None:
+    pool = SMTPConnectionPool(hostname="127.0.0.1", port=smtp_server.port, start_tls=False, max_connections=1)
+
+    with pytest.raises(SMTPRecipientsRefused):
+        await pool.send_message(build_message("unknown@example.com", "Hello", "Body"))
+    await pool.send_message(build_message("known@example.com", "Hello", "Body"))
+    await pool.close()
+
+    assert (pool.sent, pool.failed, pool.connections_opened) == (1, 1, 1)
+    assert smtp_server.recipients == ["known@example.com"]
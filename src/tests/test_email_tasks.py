@@ -0,0 +1,55 @@
+import pytest
+from aiosmtplib import SMTPException, SMTPRecipientRefused
+
+from tasks.email import send_activation_email_task, dead_letter_email
+
+
+def test_activation_email_task_sends(monkeypatch: pytest.MonkeyPatch) -> None:
+    sent = []
+
+    async def fake_send_email(user_email: str, subject: str, body: str) -> None:
+        sent.append((user_email, subject))
+
+    monkeypatch.setattr("services.email.send_email", fake_send_email)
+
+    result = send_activation_email_task.apply(args=("user@example.com", "token"))
+
+    assert result.successful()
+    assert sent == [("user@example.com", "Account Activation")]
+
+
+def test_failed_email_is_retried_then_dead_lettered(monkeypatch: pytest.MonkeyPatch) -> None:
+    attempts = []
+    dead_letters = []
+
+    async def failing_send_email(*args, **kwargs) -> None:
+        attempts.append(args)
+        raise SMTPException("connection refused")
+
+    monkeypatch.setattr("services.email.send_email", failing_send_email)
+    monkeypatch.setattr(send_activation_email_task, "max_retries", 2)
+    monkeypatch.setattr(dead_letter_email, "apply_async", lambda *args, **kwargs: dead_letters.append(kwargs))
+
+    result = send_activation_email_task.apply(args=("user@example.com", "token"))
+
+    assert result.failed()
+    assert len(attempts) == 3
+    assert dead_letters[0]["args"][1] == ["user@example.com", "token"]
+
+
+def test_permanently_refused_email_is_dead_lettered_without_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    attempts = []
+    dead_letters = []
+
+    async def refusing_send_email(*args, **kwargs) -> None:
+        attempts.append(args)
+        raise SMTPRecipientRefused(550, "No such user", "user@example.com")
+
+    monkeypatch.setattr("services.email.send_email", refusing_send_email)
+    monkeypatch.setattr(dead_letter_email, "apply_async", lambda *args, **kwargs: dead_letters.append(kwargs))
+
+    result = send_activation_email_task.apply(args=("user@example.com", "token"))
+
+    assert result.failed()
+    assert len(attempts) == 1
+    assert "No such user" in dead_letters[0]["args"][2]
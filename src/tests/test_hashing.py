@@ -0,0 +1,51 @@
+import pytest
+from fastapi import HTTPException
+from passlib.hash import bcrypt
+
+from security.hashing import PasswordHasher, pwd_context
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_in_pool() -> None:
+    hasher = PasswordHasher(max_workers=1, max_queue_size=1)
+    try:
+        hashed = await hasher.hash("StrongPass123!")
+        assert await hasher.verify("StrongPass123!", hashed)
+        assert not await hasher.verify("WrongPass123!", hashed)
+    finally:
+        hasher.shutdown()
+
+
+def test_start_spawns_every_worker_from_the_forkserver() -> None:
+    hasher = PasswordHasher(max_workers=2, max_queue_size=0)
+    hasher.start()
+    try:
+        assert hasher._executor._mp_context.get_start_method() == "forkserver"
+        assert len(hasher._executor._processes) == 2
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full() -> None:
+    hasher = PasswordHasher(max_workers=1, max_queue_size=0)
+    hasher.in_flight = 1
+
+    with pytest.raises(HTTPException) as exc_info:
+        await hasher.hash("StrongPass123!")
+
+    assert exc_info.value.status_code == 503
+    assert hasher.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_verify_and_update_rehashes_outdated_cost() -> None:
+    hasher = PasswordHasher(max_workers=0, max_queue_size=1)
+    stale_hash = bcrypt.using(rounds=4).hash("StrongPass123!")
+
+    is_valid, new_hash = await hasher.verify_and_update("StrongPass123!", stale_hash)
+    assert is_valid
+    assert new_hash and not pwd_context.needs_update(new_hash)
+
+    assert await hasher.verify_and_update("StrongPass123!", new_hash) == (True, None)
+    assert await hasher.verify_and_update("WrongPass123!", stale_hash) == (False, None)
@@ -0,0 +1,242 @@
+import sys
+import asyncio
+import pytest
+from pathlib import Path
+from typing import Any
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from core.config import HLSRendition, settings
+from database.db import SessionLocal
+from database.enums import IngestStatusEnum
+from database.models.videos import VideoIngest
+from services import hls
+from tasks.leases import LeaseHeldError
+from tasks.videos import _package_hls
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> dict[str, Any]:
+    """Points MEDIA_ROOT at a temporary directory and replaces ffprobe / ffmpeg with fakes."""
+    monkeypatch.setattr(settings, "MEDIA_ROOT", str(tmp_path))
+    monkeypatch.setattr(settings, "HLS_RENDITIONS", [
+        HLSRendition(name="1440p", height=1440, video_bitrate=9000),
+        HLSRendition(name="720p", height=720, video_bitrate=2800),
+        HLSRendition(name="360p", height=360, video_bitrate=800),
+    ])
+    state = {"calls": [], "fail": set()}
+
+    async def fake_probe_source(source: Path) -> hls.SourceInfo:
+        return hls.SourceInfo(duration=12.0, width=1920, height=1080)
+
+    async def fake_run_ffmpeg(command: list[str], duration: float, on_progress: Any) -> None:
+        output_dir = Path(command[-1]).parent
+        state["calls"].append(output_dir.name)
+        (output_dir / "segment_00000.ts").write_bytes(b"identical in every rendition")
+        on_progress(0.5)
+        if output_dir.name in state["fail"]:
+            raise hls.PackagingError("ffmpeg exited with 1")
+        (output_dir / "segment_00001.ts").write_bytes(output_dir.name.encode())
+        (output_dir / "index.m3u8").write_text(
+            "#EXTM3U\n#EXT-X-TARGETDURATION:6\n#EXTINF:6.0,\nsegment_00000.ts\n#EXTINF:6.0,\nsegment_00001.ts\n"
+            "#EXT-X-ENDLIST\n"
+        )
+
+    monkeypatch.setattr("services.hls.probe_source", fake_probe_source)
+    monkeypatch.setattr("services.hls.run_ffmpeg", fake_run_ffmpeg)
+    return state
+
+
+async def create_ingest(movie_id: int) -> int:
+    source = Path(settings.MEDIA_ROOT) / "uploads" / "source.mp4"
+    source.parent.mkdir(parents=True, exist_ok=True)
+    source.write_bytes(b"not really a video")
+    async with SessionLocal() as db:
+        ingest = VideoIngest(movie_id=movie_id, source_path="uploads/source.mp4")
+        db.add(ingest)
+        await db.commit()
+    return ingest.id
+
+
+@pytest.mark.asyncio
+async def test_package_hls_stores_segments_by_content_and_records_manifests(
+        fake_ffmpeg: dict[str, Any], movie_catalog: list[int]
+) -> None:
+    ingest_id = await create_ingest(movie_catalog[0])
+    reports = []
+
+    progress = await _package_hls(ingest_id, reports.append)
+
+    # 1440p would upscale the 1080p source
+    assert sorted(fake_ffmpeg["calls"]) == ["360p", "720p"]
+    assert progress["progress"] == 100.0
+    assert reports
+
+    objects = sorted(path for path in hls.objects_dir().rglob("*.ts"))
+    # the shared first segment is stored once
+    assert len(objects) == 3
+    assert all(path.stem == hls.file_sha256(path) for path in objects)
+    assert not (hls.hls_root() / "work" / str(ingest_id)).exists()
+
+    async with SessionLocal() as db:
+        ingest = await db.get(VideoIngest, ingest_id, options=[selectinload(VideoIngest.renditions)])
+        renditions = {rendition.name: rendition for rendition in ingest.renditions}
+        assert ingest.status == IngestStatusEnum.COMPLETED
+        assert ingest.source_sha256 == hls.file_sha256(Path(settings.MEDIA_ROOT) / "uploads" / "source.mp4")
+        assert ingest.master_manifest.index("720p.m3u8") < ingest.master_manifest.index("360p.m3u8")
+        assert "RESOLUTION=1280x720" in ingest.master_manifest
+        assert renditions["720p"].segment_count == 2
+        assert f"{settings.HLS_SEGMENT_URL}/{objects[0].parent.name}/{objects[0].name}" in "".join(
+            rendition.manifest for rendition in renditions.values()
+        )
+
+
+@pytest.mark.asyncio
+async def test_package_hls_resumes_without_redoing_stored_renditions(
+        fake_ffmpeg: dict[str, Any], movie_catalog: list[int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "HLS_PARALLELISM_PER_TASK", 1)
+    ingest_id = await create_ingest(movie_catalog[0])
+    fake_ffmpeg["fail"].add("360p")
+
+    with pytest.raises(hls.PackagingError):
+        await _package_hls(ingest_id)
+
+    async with SessionLocal() as db:
+        ingest = await db.get(VideoIngest, ingest_id, options=[selectinload(VideoIngest.renditions)])
+        assert ingest.status == IngestStatusEnum.FAILED
+        assert [rendition.name for rendition in ingest.renditions] == ["720p"]
+
+    fake_ffmpeg["fail"].clear()
+    fake_ffmpeg["calls"].clear()
+    await _package_hls(ingest_id)
+
+    assert fake_ffmpeg["calls"] == ["360p"]
+    async with SessionLocal() as db:
+        ingest = await db.get(VideoIngest, ingest_id, options=[selectinload(VideoIngest.renditions)])
+        assert ingest.status == IngestStatusEnum.COMPLETED
+        assert len(ingest.renditions) == 2
+
+
+@pytest.mark.asyncio
+async def test_duplicate_delivery_waits_for_the_running_ingest(
+        fake_ffmpeg: dict[str, Any], movie_catalog: list[int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    ingest_id = await create_ingest(movie_catalog[0])
+    encoding, release = asyncio.Event(), asyncio.Event()
+    run_ffmpeg = hls.run_ffmpeg
+
+    async def slow_run_ffmpeg(*args: Any) -> None:
+        encoding.set()
+        await release.wait()
+        await run_ffmpeg(*args)
+
+    monkeypatch.setattr("services.hls.run_ffmpeg", slow_run_ffmpeg)
+    first = asyncio.create_task(_package_hls(ingest_id))
+    await encoding.wait()
+
+    with pytest.raises(LeaseHeldError):
+        await _package_hls(ingest_id)
+
+    release.set()
+    await first
+    assert sorted(fake_ffmpeg["calls"]) == ["360p", "720p"]
+    async with SessionLocal() as db:
+        ingest = await db.get(VideoIngest, ingest_id, options=[selectinload(VideoIngest.renditions)])
+        assert ingest.status == IngestStatusEnum.COMPLETED
+        assert ingest.lease_token is None
+        assert len(ingest.renditions) == 2
+
+
+@pytest.mark.asyncio
+async def test_run_ffmpeg_reports_progress_and_surfaces_errors() -> None:
+    fractions = []
+    script = "import sys; print('out_time_us=3000000'); print('out_time_us=N/A'); print('progress=end')"
+
+    await hls.run_ffmpeg([sys.executable, "-c", script], 12.0, fractions.append)
+    assert fractions == [0.25]
+
+    with pytest.raises(hls.PackagingError, match="Invalid data found"):
+        await hls.run_ffmpeg(
+            [sys.executable, "-c", "import sys; sys.exit('Invalid data found when processing input')"], 12.0, print
+        )
+
+
+@pytest.mark.asyncio
+async def test_upload_queues_ingest_and_playlists_are_served(
+        async_client: AsyncClient, admin_tokens: dict[str, str], auth_tokens: dict[str, str],
+        fake_ffmpeg: dict[str, Any], movie_catalog: list[int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    queued = []
+    monkeypatch.setattr("routes.videos.package_hls.apply_async", lambda args, **options: queued.extend(args))
+    movie_id = movie_catalog[1]
+    admin = {"Authorization": f"Bearer {admin_tokens['access_token']}"}
+    user = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+
+    response = await async_client.post(
+        f"/api/v1/movies/{movie_id}/ingests", content=b"x" * 100_000, headers={**user, "Content-Type": "video/mp4"}
+    )
+    assert response.status_code == 403
+
+    response = await async_client.post(
+        f"/api/v1/movies/{movie_id}/ingests", content=b"x" * 100_000, headers={**admin, "Content-Type": "video/mp4"}
+    )
+    assert response.status_code == 202
+    ingest = response.json()
+    assert ingest["status"] == "PENDING"
+    assert queued == [ingest["id"]]
+    async with SessionLocal() as db:
+        source_path = (await db.get(VideoIngest, ingest["id"])).source_path
+    assert source_path.endswith(".mp4")
+    assert (Path(settings.MEDIA_ROOT) / source_path).stat().st_size == 100_000
+
+    response = await async_client.get(f"/api/v1/movies/{movie_id}/hls/master.m3u8", headers=user)
+    assert response.status_code == 404
+
+    await _package_hls(ingest["id"])
+
+    response = await async_client.get(f"/api/v1/movies/{movie_id}/ingests/{ingest['id']}", headers=admin)
+    assert response.json()["status"] == "COMPLETED"
+    assert {rendition["name"] for rendition in response.json()["renditions"]} == {"720p", "360p"}
+
+    response = await async_client.get(f"/api/v1/movies/{movie_id}/hls/master.m3u8", headers=user)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apple.mpegurl"
+    assert response.text.startswith("#EXTM3U")
+
+    response = await async_client.get(f"/api/v1/movies/{movie_id}/hls/720p.m3u8", headers=user)
+    assert response.status_code == 200
+    assert f"{settings.HLS_SEGMENT_URL}/" in response.text
+
+    response = await async_client.get(f"/api/v1/movies/{movie_id}/hls/1440p.m3u8", headers=user)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_upload_is_marked_failed_when_broker_is_down(
+        async_client: AsyncClient, admin_tokens: dict[str, str], fake_ffmpeg: dict[str, Any],
+        movie_catalog: list[int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def broker_down(*args, **kwargs) -> None:
+        raise ConnectionRefusedError("broker unreachable")
+
+    monkeypatch.setattr("routes.videos.package_hls.apply_async", broker_down)
+
+    response = await async_client.post(
+        f"/api/v1/movies/{movie_catalog[2]}/ingests", content=b"x" * 1000,
+        headers={"Authorization": f"Bearer {admin_tokens['access_token']}", "Content-Type": "video/mp4"},
+    )
+
+    assert response.status_code == 503
+    async with SessionLocal() as db:
+        ingest = (await db.execute(
+            select(VideoIngest).where(VideoIngest.movie_id == movie_catalog[2]).order_by(VideoIngest.id.desc())
+        )).scalars().first()
+        assert ingest.status == IngestStatusEnum.FAILED
+        assert "broker" in ingest.error
+
+    # a FAILED ingest can still be claimed, so packaging it later needs no new upload
+    await _package_hls(ingest.id)
+    async with SessionLocal() as db:
+        assert (await db.get(VideoIngest, ingest.id)).status == IngestStatusEnum.COMPLETED
@@ -0,0 +1,52 @@
+import time
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwt
+
+from security import auth
+from security.jwt_keys import build_jwt_keys
+
+
+def generate_es256_pems() -> tuple[str, str]:
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+
+def test_public_key_verifies_tokens_without_secret() -> None:
+    private_pem, public_pem = generate_es256_pems()
+    issuer = build_jwt_keys("ES256", "unused", private_key_pem=private_pem)
+    verifier = build_jwt_keys("ES256", "unused", public_key_pem=public_pem)
+
+    token = jwt.encode({"sub": "1"}, issuer.signing_key, algorithm="ES256")
+
+    assert verifier.signing_key is None
+    assert jwt.decode(token, verifier.verification_key, algorithms=["ES256"])["sub"] == "1"
+    assert issuer.public_jwks()["keys"][0]["kty"] == "EC"
+
+
+def test_decoded_token_cache_respects_exp(monkeypatch: pytest.MonkeyPatch) -> None:
+    token = auth.create_access_token({"sub": "1"})
+
+    assert auth.decode_token(token)["sub"] == "1"
+    hits = auth.decoded_tokens.hits
+    assert auth.decode_token(token)["sub"] == "1"
+    assert auth.decoded_tokens.hits == hits + 1
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + auth.settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 + 1)
+    assert auth.decoded_tokens.get(token) is None
+
+
+def test_tampered_token_is_not_cached() -> None:
+    token = auth.create_access_token({"sub": "1"})
+    tampered = token[:-2] + ("AA" if token[-2:] != "AA" else "BB")
+
+    assert auth.decode_token(tampered) is None
+    assert auth.decoded_tokens.get(tampered) is None
@@ -0,0 +1,40 @@
+import pytest
+from httpx import AsyncClient
+
+from core.metrics import Histogram, http_request_component_duration, http_requests
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = Histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+
+    assert histogram.render() == [
+        "# HELP demo_seconds Demo.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{route="/a",le="0.1"} 1',
+        'demo_seconds_bucket{route="/a",le="1"} 2',
+        'demo_seconds_bucket{route="/a",le="+Inf"} 3',
+        'demo_seconds_sum{route="/a"} 5.55',
+        'demo_seconds_count{route="/a"} 3',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_requests_are_recorded_per_route_and_component(
+        async_client: AsyncClient, auth_tokens: dict[str, str]
+) -> None:
+    login_route, profile_route = "/api/v1/auth/login", "/api/v1/users/me"
+    failed_before = http_requests.value("POST", login_route, "400")
+    bcrypt_before = http_request_component_duration.count(login_route, "bcrypt")
+
+    await async_client.post(login_route, json={"email": "nobody@example.com", "password": "WrongPass123!"})
+    await async_client.get(profile_route, headers={"Authorization": f"Bearer {auth_tokens['access_token']}"})
+    metrics = await async_client.get("/metrics")
+
+    assert http_requests.value("POST", login_route, "400") == failed_before + 1
+    assert http_request_component_duration.count(login_route, "bcrypt") == bcrypt_before + 1
+    assert http_request_component_duration.count(profile_route, "db") >= 1
+    assert f'http_requests_total{{method="GET",route="{profile_route}",status="200"}}' in metrics.text
+    assert "password_hash_in_flight 0" in metrics.text
@@ -0,0 +1,110 @@
+import pytest
+from typing import Any
+from httpx import AsyncClient
+from sqlalchemy import delete, select, update
+
+from database.db import SessionLocal
+from database.models.movies import Certification, Director, Movie
+from database.search import match_expression
+
+
+async def fetch_all_pages(async_client: AsyncClient, **params: Any) -> list[dict[str, Any]]:
+    items, cursor = [], None
+    while True:
+        page_params = {**params, "cursor": cursor} if cursor else params
+        response = await async_client.get("/api/v1/movies", params=page_params)
+        assert response.status_code == 200
+        page = response.json()
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by", ["year", "imdb", "price", "name"])
+@pytest.mark.parametrize("order", ["asc", "desc"])
+async def test_keyset_pages_cover_catalog_in_order(
+        async_client: AsyncClient, movie_catalog: list[int], sort_by: str, order: str
+) -> None:
+    items = await fetch_all_pages(async_client, sort_by=sort_by, order=order, limit=7)
+
+    ids = [item["id"] for item in items]
+    assert sorted(ids) == sorted(movie_catalog)
+    keys = [(float(item[sort_by]) if sort_by == "price" else item[sort_by], item["id"]) for item in items]
+    assert keys == sorted(keys, reverse=order == "desc")
+
+
+@pytest.mark.asyncio
+async def test_list_movies_filters(async_client: AsyncClient, movie_catalog: list[int]) -> None:
+    items = await fetch_all_pages(
+        async_client, genre="Drama", year_from=2002, year_to=2007, min_rating=6, limit=2
+    )
+
+    assert items
+    for item in items:
+        assert [genre["name"] for genre in item["genres"]] == ["Drama"]
+        assert 2002 <= item["year"] <= 2007
+        assert item["imdb"] >= 6
+
+
+@pytest.mark.asyncio
+async def test_list_movies_rejects_invalid_cursor(async_client: AsyncClient) -> None:
+    response = await async_client.get("/api/v1/movies", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+async def test_get_movie_details(async_client: AsyncClient, movie_catalog: list[int]) -> None:
+    response = await async_client.get(f"/api/v1/movies/{movie_catalog[0]}")
+
+    assert response.status_code == 200
+    movie = response.json()
+    assert movie["certification"]["name"] == "PG-13"
+    assert [director["name"] for director in movie["directors"]] == ["Test Director"]
+    assert [star["name"] for star in movie["stars"]] == ["Test Star"]
+
+    response = await async_client.get("/api/v1/movies/999999")
+    assert response.status_code == 404
+
+
+def test_match_expression_quotes_terms_and_prefixes_the_last_one() -> None:
+    assert match_expression('Star "wars" OR') == '"star" AND "wars" AND ("or" OR "or"*)'
+    assert match_expression("  -*  ") is None
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_title_matches_and_follows_catalog_changes(
+        async_client: AsyncClient, movie_catalog: list[int]
+) -> None:
+    async with SessionLocal() as db:
+        certification = (await db.execute(select(Certification))).scalars().first()
+        movie = Movie(
+            name="Zephyrine Running Chronicles", year=2011, time=100, imdb=7.0, votes=10, price="3.99",
+            description="A test movie.", certification=certification, directors=[Director(name="Zephyrine Jones")],
+        )
+        other = Movie(
+            name="Test Movie Extra", year=2011, time=101, imdb=7.0, votes=10, price="3.99",
+            description="A story about Zephyrine.", certification=certification,
+        )
+        db.add_all([movie, other])
+        await db.commit()
+
+    response = await async_client.get("/api/v1/movies/search", params={"q": "zephyr"})
+    assert [hit["id"] for hit in response.json()] == [movie.id, other.id]
+
+    # stemmed match on the last word ("run" is indexed for "Running"), director name via trigger
+    response = await async_client.get("/api/v1/movies/search", params={"q": "jones run"})
+    assert [hit["id"] for hit in response.json()] == [movie.id]
+
+    async with SessionLocal() as db:
+        await db.execute(update(Movie).where(Movie.id == movie.id).values(name="Renamed Feature"))
+        await db.execute(delete(Movie).where(Movie.id == other.id))
+        await db.commit()
+
+    response = await async_client.get("/api/v1/movies/search", params={"q": "zephyrine"})
+    assert [hit["id"] for hit in response.json()] == [movie.id]
+    response = await async_client.get("/api/v1/movies/search", params={"q": "renamed"})
+    assert [hit["id"] for hit in response.json()] == [movie.id]
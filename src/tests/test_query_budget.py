@@ -0,0 +1,65 @@
+import uuid
+import logging
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from core.config import settings
+from database.db import SessionLocal
+from database.instrumentation import QueryStats, query_stats
+
+
+@pytest.fixture(autouse=True)
+def debug_mode(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "DEBUG", True)
+
+
+@pytest.mark.asyncio
+async def test_register_query_budget(async_client: AsyncClient) -> None:
+    response = await async_client.post(
+        "/api/v1/auth/register", json={"email": f"{uuid.uuid4().hex[:8]}@example.com", "password": "StrongPass123!"}
+    )
+
+    assert response.status_code == 200
+    assert int(response.headers["X-Query-Count"]) <= 3
+
+
+@pytest.mark.asyncio
+async def test_get_my_profile_query_budget(async_client: AsyncClient, auth_tokens: dict[str, str]) -> None:
+    response = await async_client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    )
+
+    assert response.status_code == 200
+    assert int(response.headers["X-Query-Count"]) <= 1
+
+
+@pytest.mark.asyncio
+async def test_repeated_statement_is_reported_as_n_plus_one(
+        monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+) -> None:
+    monkeypatch.setattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 2)
+    stats = QueryStats()
+    token = query_stats.set(stats)
+    try:
+        with caplog.at_level(logging.WARNING, logger="database.queries"):
+            async with SessionLocal() as db:
+                for user_id in range(4):
+                    await db.execute(text("SELECT email FROM users WHERE id = :id"), {"id": user_id})
+    finally:
+        query_stats.reset(token)
+
+    assert stats.count == 4
+    assert len([record for record in caplog.records if "N+1" in record.getMessage()]) == 1
+
+
+@pytest.mark.asyncio
+async def test_update_my_profile_query_budget(async_client: AsyncClient, auth_tokens: dict[str, str]) -> None:
+    response = await async_client.put(
+        "/api/v1/users/me/update",
+        json={"first_name": "John"},
+        headers={"Authorization": f"Bearer {auth_tokens['access_token']}"},
+    )
+
+    assert response.status_code == 200
+    assert int(response.headers["X-Query-Count"]) <= 2
@@ -0,0 +1,93 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+import main
+
+from database.db import SessionLocal
+from database.models.movies import Certification, Movie
+from services.suggestions import SuggestionIndex, normalize, rebuild_suggestion_index, suggestion_index
+
+
+def test_normalize_folds_case_accents_and_punctuation() -> None:
+    assert normalize("  Amélie: Le Fabuleux—Destin! ") == "amelie le fabuleux destin"
+
+
+@pytest.fixture(params=[256, 1], ids=["scanned", "cached"])
+def scan_limit(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> None:
+    # a limit of 1 caches the top-k of every prefix, exercising the bottom-up path on tiny indexes
+    monkeypatch.setattr("services.suggestions.SCAN_LIMIT", request.param)
+
+
+def test_lookup_ranks_by_votes_and_matches_later_words(scan_limit: None) -> None:
+    index = SuggestionIndex.build(
+        [(1, "Star Wars", 1977, 900), (2, "Starship Troopers", 1997, 300), (3, "A Star Is Born", 2018, 500)], top_k=10
+    )
+
+    assert [movie_id for movie_id, *_ in index.lookup("sta", 10)] == [1, 3, 2]
+    assert [movie_id for movie_id, *_ in index.lookup("STAR w", 10)] == [1]
+    assert [movie_id for movie_id, *_ in index.lookup("wars", 10)] == [1]
+    assert index.lookup("born", 1) == [(3, "A Star Is Born", 2018)]
+    assert index.lookup("xyz", 10) == []
+
+
+def test_incremental_updates_keep_index_consistent(scan_limit: None) -> None:
+    index = SuggestionIndex.build([(1, "Star Wars", 1977, 900), (2, "Starship Troopers", 1997, 300)], top_k=10)
+
+    index.upsert(3, "Stardust", 2007, 1000)
+    index.upsert(1, "Space Wars", 1977, 900)
+    index.remove(2)
+
+    assert [movie_id for movie_id, *_ in index.lookup("st", 10)] == [3]
+    assert [movie_id for movie_id, *_ in index.lookup("wars", 10)] == [1]
+    rebuilt = SuggestionIndex.build([(1, "Space Wars", 1977, 900), (3, "Stardust", 2007, 1000)], top_k=10)
+    assert (index.keys, list(index.ids), index.top) == (rebuilt.keys, list(rebuilt.ids), rebuilt.top)
+
+
+@pytest.mark.asyncio
+async def test_suggest_endpoint_follows_committed_changes(async_client: AsyncClient, movie_catalog: list[int]) -> None:
+    async with SessionLocal() as db:
+        await rebuild_suggestion_index(db)
+
+    response = await async_client.get("/api/v1/movies/suggest", params={"q": "test mov", "limit": 3})
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+    async with SessionLocal() as db:
+        certification = (await db.execute(select(Certification))).scalars().first()
+        movie = Movie(
+            name="Quokka Quest", year=2020, time=95, imdb=6.5, votes=10, price="2.99",
+            description="A test movie.", certification=certification,
+        )
+        db.add(movie)
+        await db.commit()
+        movie_id = movie.id
+
+        db.add(Movie(
+            name="Quokka Rollback", year=2020, time=95, imdb=6.5, votes=10, price="2.99",
+            description="A test movie.", certification=certification,
+        ))
+        await db.flush()
+        await db.rollback()
+
+    response = await async_client.get("/api/v1/movies/suggest", params={"q": "quok"})
+    assert response.json() == [{"id": movie_id, "name": "Quokka Quest", "year": 2020}]
+
+    async with SessionLocal() as db:
+        await db.delete(await db.get(Movie, movie_id))
+        await db.commit()
+
+    response = await async_client.get("/api/v1/movies/suggest", params={"q": "quok"})
+    assert response.json() == []
+    assert suggestion_index.stats()["movies"] >= len(movie_catalog)
+
+
+@pytest.mark.asyncio
+async def test_app_starts_when_the_suggestion_index_cannot_be_built(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def missing_table(db: object) -> None:
+        raise OperationalError("SELECT", {}, Exception("no such table: movies"))
+
+    monkeypatch.setattr(main, "rebuild_suggestion_index", missing_table)
+    async with main.lifespan(main.app):
+        pass
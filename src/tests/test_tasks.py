@@ -0,0 +1,36 @@
+import uuid
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+
+from database.db import SessionLocal
+from database.models.accounts import RefreshToken
+from tasks.auth import _cleanup_expired_tokens
+
+
+@pytest.mark.asyncio
+async def test_cleanup_deletes_expired_tokens_in_batches(
+        active_user: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("tasks.auth.settings.TOKEN_CLEANUP_BATCH_SIZE", 2)
+    monkeypatch.setattr("tasks.auth.settings.TOKEN_CLEANUP_BATCH_PAUSE", 0)
+
+    now = datetime.now(timezone.utc)
+    family_id = str(uuid.uuid4())
+    async with SessionLocal() as db:
+        db.add_all([
+            RefreshToken(
+                user_id=active_user["id"], token=str(uuid.uuid4()), family_id=family_id,
+                expires_at=now + timedelta(hours=-1 if i < 5 else 1),
+            )
+            for i in range(6)
+        ])
+        await db.commit()
+
+    stats = await _cleanup_expired_tokens()
+
+    assert stats["deleted"]["refresh_tokens"] >= 5
+    assert stats["duration_seconds"] >= 0
+    async with SessionLocal() as db:
+        remaining = (await db.execute(select(RefreshToken).where(RefreshToken.family_id == family_id))).scalars().all()
+        assert len(remaining) == 1
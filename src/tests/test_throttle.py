@@ -0,0 +1,34 @@
+import time
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+
+from security.throttle import InMemoryRateLimitBackend, LoginThrottle, login_throttle
+
+
+@pytest.mark.asyncio
+async def test_sliding_window_weights_previous_window(monkeypatch: pytest.MonkeyPatch) -> None:
+    throttle = LoginThrottle(InMemoryRateLimitBackend(), ip_limit=100, email_limit=4, window_seconds=60)
+    monkeypatch.setattr(time, "time", lambda: 600.0)
+    for _ in range(4):
+        await throttle.check("10.0.0.1", "user@example.com")
+
+    # halfway through the next window the 4 earlier attempts still count as 2
+    monkeypatch.setattr(time, "time", lambda: 690.0)
+    await throttle.check("10.0.0.1", "User@Example.com")
+    await throttle.check("10.0.0.1", "user@example.com")
+    with pytest.raises(HTTPException) as exc_info:
+        await throttle.check("10.0.0.1", "user@example.com")
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == "30"
+    await throttle.check("10.0.0.1", "other@example.com")
+
+
+@pytest.mark.asyncio
+async def test_login_is_throttled_per_email(async_client: AsyncClient) -> None:
+    payload = {"email": "nobody@example.com", "password": "WrongPass123!"}
+    limit = login_throttle.email_limit
+    statuses = [(await async_client.post("/api/v1/auth/login", json=payload)).status_code for _ in range(limit + 1)]
+
+    assert statuses == [400] * limit + [429]
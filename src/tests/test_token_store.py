@@ -0,0 +1,54 @@
+import time
+import pytest
+
+from database.models.accounts import PasswordResetToken, RefreshToken
+from security.token_store import InMemoryBackend, KeyValueTokenStore
+
+
+@pytest.fixture
+def store() -> KeyValueTokenStore:
+    return KeyValueTokenStore(InMemoryBackend())
+
+
+@pytest.mark.asyncio
+async def test_create_verify_delete(store: KeyValueTokenStore) -> None:
+    token = await store.create(PasswordResetToken, 7, 1, db=None)
+
+    assert (await store.verify(PasswordResetToken, token, db=None)).user_id == 7
+    assert await store.verify(RefreshToken, token, db=None) is None
+
+    await store.delete(PasswordResetToken, token, db=None)
+    assert await store.verify(PasswordResetToken, token, db=None) is None
+
+
+@pytest.mark.asyncio
+async def test_tokens_expire_without_sweeps(store: KeyValueTokenStore, monkeypatch: pytest.MonkeyPatch) -> None:
+    token = await store.create(RefreshToken, 7, 1, db=None)
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 3601)
+
+    assert await store.verify(RefreshToken, token, db=None) is None
+
+
+@pytest.mark.asyncio
+async def test_rotation_reuse_revokes_family(store: KeyValueTokenStore) -> None:
+    first = await store.create(RefreshToken, 7, 1, db=None)
+    second = await store.rotate(first, 1, db=None)
+
+    assert second.user_id == 7
+    assert await store.rotate(first, 1, db=None) is None
+    assert await store.verify(RefreshToken, second.token, db=None) is None
+    assert await store.rotate(second.token, 1, db=None) is None
+
+
+@pytest.mark.asyncio
+async def test_revoke_user_only_affects_earlier_tokens(store: KeyValueTokenStore) -> None:
+    old = await store.create(RefreshToken, 7, 1, db=None)
+    other = await store.create(RefreshToken, 8, 1, db=None)
+    await store.revoke_user(7, db=None)
+    new = await store.create(RefreshToken, 7, 1, db=None)
+
+    assert await store.verify(RefreshToken, old, db=None) is None
+    assert await store.verify(RefreshToken, other, db=None) is not None
+    assert await store.verify(RefreshToken, new, db=None) is not None
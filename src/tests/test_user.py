@@ -1,5 +1,12 @@
+import asyncio
+import contextlib
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db import SessionLocal
+from database.models.accounts import UserProfile
 
 
 @pytest.mark.asyncio
@@ -15,3 +22,92 @@ async def test_update_profile_unauthorized(async_client: AsyncClient) -> None:
         json={"first_name": "John"}
     )
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_profile_conditional_get(async_client: AsyncClient, auth_tokens: dict[str, str]) -> None:
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    first = await async_client.get("/api/v1/users/me", headers=headers)
+    etag = first.headers["ETag"]
+
+    unchanged = await async_client.get("/api/v1/users/me", headers={**headers, "If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.headers["ETag"] == etag
+
+    since = await async_client.get(
+        "/api/v1/users/me", headers={**headers, "If-Modified-Since": first.headers["Last-Modified"]}
+    )
+    assert since.status_code == 304
+
+    updated = await async_client.put("/api/v1/users/me/update", json={"first_name": "John"}, headers=headers)
+    changed = await async_client.get("/api/v1/users/me", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] == updated.headers["ETag"] != etag
+    assert changed.json()["first_name"] == "John"
+
+
+@pytest.mark.asyncio
+async def test_profile_update_round_trip(async_client: AsyncClient, auth_tokens: dict[str, str]) -> None:
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    payload = {"first_name": "Jane", "gender": "WOMAN", "date_of_birth": "2000-01-02"}
+
+    updated = await async_client.put("/api/v1/users/me/update", json=payload, headers=headers)
+    fetched = await async_client.get("/api/v1/users/me", headers=headers)
+
+    assert updated.status_code == fetched.status_code == 200
+    assert updated.json() == fetched.json()
+    assert {key: fetched.json()[key] for key in payload} == payload
+    assert fetched.json()["group"] == "USER"
+
+
+@pytest.mark.asyncio
+async def test_profile_conditional_get_sees_updates_from_other_workers(
+        async_client: AsyncClient, auth_tokens: dict[str, str]
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    first = await async_client.get("/api/v1/users/me", headers=headers)
+
+    # another worker updates the row; this process's version cache never hears about it
+    async with SessionLocal() as db:
+        await db.execute(
+            update(UserProfile)
+            .where(UserProfile.user_id == first.json()["user_id"])
+            .values(first_name="Changed elsewhere", version=UserProfile.version + 1)
+        )
+        await db.commit()
+
+    response = await async_client.get("/api/v1/users/me", headers={**headers, "If-None-Match": first.headers["ETag"]})
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "Changed elsewhere"
+
+
+@pytest.mark.asyncio
+async def test_interleaved_profile_updates_get_distinct_versions(
+        async_client: AsyncClient, auth_tokens: dict[str, str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    headers = {"Authorization": f"Bearer {auth_tokens['access_token']}"}
+    before = await async_client.get("/api/v1/users/me", headers=headers)
+    committing, both = [], asyncio.Event()
+    commit = AsyncSession.commit
+
+    async def interleaved_commit(self: AsyncSession) -> None:
+        # hold each update back until the other one has done its work too (or is blocked on the write lock)
+        committing.append(self)
+        if len(committing) == 2:
+            both.set()
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(both.wait(), 0.5)
+        await commit(self)
+
+    monkeypatch.setattr(AsyncSession, "commit", interleaved_commit)
+    first, second = await asyncio.gather(*(
+        async_client.put("/api/v1/users/me/update", json={"first_name": name}, headers=headers)
+        for name in ("First", "Second")
+    ))
+    monkeypatch.setattr(AsyncSession, "commit", commit)
+
+    assert len({before.headers["ETag"], first.headers["ETag"], second.headers["ETag"]}) == 3
+    latest = await async_client.get("/api/v1/users/me", headers=headers)
+    winner = first if latest.headers["ETag"] == first.headers["ETag"] else second
+    assert latest.headers["ETag"] == winner.headers["ETag"]
+    assert latest.json()["first_name"] == winner.json()["first_name"]